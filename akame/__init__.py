@@ -1,15 +1,29 @@
+import asyncio
 import logging
 from typing import Optional, Sequence
 
 from akame.comparison import BasicComparer
 from akame.comparison.core import ComparerBase
+from akame.comparison.normalization import Normalizer
 from akame.extraction import BasicExtractor
 from akame.extraction.core import ExtractorBase
 from akame.notification import BasicNotifier
 from akame.notification.core import NotifierBase
-from akame.utility.caching import TaskCacheManager, reset_cached_folder
+from akame.utility.caching import (
+    CacheManagerBase,
+    TaskCacheManager,
+    WriteBehindCacheManager,
+    reset_cached_folder,
+)
 from akame.utility.core import MonitoredContent
-from akame.utility.tasking import get_random_task_name, loop_task
+from akame.utility.scheduling import ScheduledTask, Scheduler
+from akame.utility.tasking import (
+    get_random_task_name,
+    loop_task,
+    loop_task_async,
+    run_in_executor,
+    run_tasks_asynchronously,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -45,9 +59,18 @@ class Monitor:
         notifiers (Optional[Sequence[NotifierBase]], optional):
             List of notifiers that push notifications on comparison results.
             Defaults to None; BasicNotifier will be initiated.
-        cache_manager (Optional[TaskCacheManager], optional):
-            Cache manager that archives and loads all monitored content.
+        cache_manager (Optional[CacheManagerBase], optional):
+            Cache manager that archives and loads all monitored content,
+            e.g. SQLiteCacheManager for large fleets of tasks.
             Defaults to None; TaskCacheManager will be initiated.
+        normalizer (Optional[Normalizer], optional):
+            Normalizer that strips volatile regions (e.g. timestamps, CSRF
+            tokens) from the content before comparison.
+            Defaults to None; content is compared as extracted.
+        write_behind (bool, optional):
+            Whether to cache content in the background, so rounds do not
+            wait on disk. Pending caches are flushed on exit.
+            Defaults to False.
     """
 
     def __init__(
@@ -59,7 +82,9 @@ class Monitor:
         extractor: Optional[ExtractorBase] = None,
         comparer: Optional[ComparerBase] = None,
         notifiers: Optional[Sequence[NotifierBase]] = None,
-        cache_manager: Optional[TaskCacheManager] = None,
+        cache_manager: Optional[CacheManagerBase] = None,
+        normalizer: Optional[Normalizer] = None,
+        write_behind: bool = False,
     ) -> None:
 
         self.target_url = target_url
@@ -73,12 +98,15 @@ class Monitor:
         self.extractor = extractor if extractor else BasicExtractor()
         self.comparer = comparer if comparer else BasicComparer()
         self.notifiers = notifiers if notifiers else [BasicNotifier()]
+        self.normalizer = normalizer
 
         self.cache_manager = (
             cache_manager
             if cache_manager
             else TaskCacheManager(task_name=self.task_name)
         )
+        if write_behind:
+            self.cache_manager = WriteBehindCacheManager(self.cache_manager)
 
     def update_extractor(self, extractor: ExtractorBase) -> None:
         self.extractor = extractor
@@ -92,27 +120,56 @@ class Monitor:
     def update_notifiers(self, notifiers: Sequence[NotifierBase]) -> None:
         self.notifiers = notifiers
 
-    def _extract_monitored_content(self) -> MonitoredContent:
+    def _extract_monitored_content(self) -> Optional[MonitoredContent]:
         """Function that extracts monitored content
 
         Returns:
-            MonitoredContent: Monitored content
+            Optional[MonitoredContent]: Monitored content;
+                None if the target reported no modification
         """
+        self._load_cached_validators()
         content = self.extractor.main(target_url=self.target_url)
-        return MonitoredContent(
+        return self._get_monitored_content(content)
+
+    def _load_cached_validators(self) -> None:
+        """Function that hands cached validators to conditional extractors"""
+        if self.extractor.check_uses_cached_validators():
+            mc_0 = self.cache_manager.get_newest_cache()
+            self.extractor.load_cached_validators(
+                getattr(mc_0, "validators", None)
+            )
+
+    def _get_monitored_content(
+        self, content: object
+    ) -> Optional[MonitoredContent]:
+        """Function that wraps the extracted content
+
+        Args:
+            content (object): Content returned by the extractor
+
+        Returns:
+            Optional[MonitoredContent]: Monitored content;
+                None if the target reported no modification
+        """
+        if self.extractor.not_modified:
+            return None
+
+        mc = MonitoredContent(
             task_name=self.task_name,
             target_url=self.target_url,
             content=content,
+            validators=self.extractor.validators,
         )
+        return self.normalizer.main(mc) if self.normalizer else mc
 
     def _compare_monitored_content(self, mc_1: MonitoredContent) -> None:
-        """Function that compares monitored content
+        """Function that compares monitored content against the newest cache;
+        it is cached by `_cache_monitored_content` once notified
 
         Args:
             mc_1 (MonitoredContent): Monitored content to compare
         """
         mc_0 = self.cache_manager.get_newest_cache()
-        self.cache_manager.cache_task_mc(mc_1)
         self.comparer.main(mc_0=mc_0, mc_1=mc_1)
 
     def _notify_comparison_results(self) -> None:
@@ -121,17 +178,179 @@ class Monitor:
         """
         for notifier in self.notifiers:
             notifier.main(self.comparer)
+        self._log_deltas_computed()
 
-    def main(self) -> None:
-        """Function that performs the monitoring tasks on a loop"""
+    def _cache_monitored_content(self, mc_1: MonitoredContent) -> None:
+        """Function that caches monitored content after notification, since
+        notifiers may still load the newest cache and comparers add
+        signatures to the content
+
+        Args:
+            mc_1 (MonitoredContent): Monitored content to cache
+        """
+        self.cache_manager.cache_task_mc(mc_1)
 
-        def task():
-            monitored_content = self._extract_monitored_content()
-            self._compare_monitored_content(monitored_content)
+    def _log_deltas_computed(self) -> None:
+        """Function that reports how many deltas the round computed"""
+        if self.comparer.n_deltas_computed:
+            logger.info(
+                f"Computed {self.comparer.n_deltas_computed} delta(s) "
+                f"for {len(self.notifiers)} notifier(s) this round"
+            )
+
+    def run_round(self) -> None:
+        """Function that performs one round of the monitoring tasks"""
+        monitored_content = self._extract_monitored_content()
+        if monitored_content is None:
+            logger.info(f"[NOT MODIFIED] {self.task_name}")
+            return
+        self._compare_monitored_content(monitored_content)
+        try:
             self._notify_comparison_results()
+        finally:
+            # cached even if a notifier fails, so the change is not
+            # reported again next round
+            self._cache_monitored_content(monitored_content)
+
+    def schedule(
+        self, scheduler: Scheduler, policy: str = "skip"
+    ) -> ScheduledTask:
+        """Function that hands the monitoring rounds to a shared scheduler
 
+        Args:
+            scheduler (Scheduler): Scheduler that runs the rounds
+            policy (str, optional): Missed-deadline policy,
+                'skip', 'catch_up' or 'coalesce'. Defaults to 'skip'.
+
+        Returns:
+            ScheduledTask: Scheduled task holding its lag metrics
+        """
+        return scheduler.add_task(
+            self.run_round,
+            seconds=self.loop_seconds,
+            max_rounds=self.loop_max_rounds,
+            task_name=self.task_name,
+            policy=policy,
+        )
+
+    def main(self) -> None:
+        """Function that performs the monitoring tasks on a loop"""
         looper = loop_task(
             seconds=self.loop_seconds,
             max_rounds=self.loop_max_rounds,
-        )(task)
+        )(self.run_round)
         looper()
+
+
+def run_monitors_scheduled(
+    monitors: Sequence[Monitor], max_workers: int = 10, policy: str = "skip"
+) -> Scheduler:
+    """Function that runs monitors on one shared scheduler until they finish
+
+    Args:
+        monitors (Sequence[Monitor]): Monitors to run
+        max_workers (int, optional):
+            Maximum number of rounds running at once. Defaults to 10.
+        policy (str, optional): Missed-deadline policy,
+            'skip', 'catch_up' or 'coalesce'. Defaults to 'skip'.
+
+    Returns:
+        Scheduler: Finished scheduler holding the lag metrics
+    """
+    scheduler = Scheduler(max_workers=max_workers)
+    for monitor in monitors:
+        monitor.schedule(scheduler, policy=policy)
+    scheduler.run()
+    logger.info(f"Scheduler lag metrics: {scheduler.get_lag_metrics()}")
+    return scheduler
+
+
+class AsyncMonitor(Monitor):
+    """Class that organizes the monitoring task on an asyncio event loop
+
+    Takes the same arguments as Monitor. Rounds wait with `asyncio.sleep`
+    instead of blocking a thread, so thousands of monitors can share one
+    event loop through `run_monitors_async`.
+    """
+
+    async def _extract_monitored_content_async(
+        self,
+    ) -> Optional[MonitoredContent]:
+        """Function that extracts monitored content asynchronously
+
+        Returns:
+            Optional[MonitoredContent]: Monitored content;
+                None if the target reported no modification
+        """
+        await run_in_executor(self._load_cached_validators)
+        content = await self.extractor.main_async(target_url=self.target_url)
+        return self._get_monitored_content(content)
+
+    async def _compare_monitored_content_async(
+        self, mc_1: MonitoredContent
+    ) -> None:
+        """Function that compares monitored content asynchronously against
+        the newest cache
+
+        Args:
+            mc_1 (MonitoredContent): Monitored content to compare
+        """
+        mc_0 = await run_in_executor(self.cache_manager.get_newest_cache)
+        await self.comparer.main_async(mc_0=mc_0, mc_1=mc_1)
+
+    async def _notify_comparison_results_async(self) -> None:
+        """Function that notifies of comparison results asynchronously"""
+        for notifier in self.notifiers:
+            await notifier.main_async(self.comparer)
+        self._log_deltas_computed()
+
+    async def main_async(
+        self, semaphore: Optional[asyncio.Semaphore] = None
+    ) -> None:
+        """Function that performs the monitoring tasks on an async loop
+
+        Args:
+            semaphore (Optional[asyncio.Semaphore], optional):
+                Semaphore shared across monitors that bounds in-flight
+                requests. Defaults to None; a private semaphore is used.
+        """
+        semaphore = semaphore if semaphore else asyncio.Semaphore(1)
+
+        async def task():
+            async with semaphore:
+                monitored_content = (
+                    await self._extract_monitored_content_async()
+                )
+            if monitored_content is None:
+                logger.info(f"[NOT MODIFIED] {self.task_name}")
+                return
+            await self._compare_monitored_content_async(monitored_content)
+            try:
+                await self._notify_comparison_results_async()
+            finally:
+                await run_in_executor(
+                    self._cache_monitored_content, monitored_content
+                )
+
+        looper = loop_task_async(
+            seconds=self.loop_seconds,
+            max_rounds=self.loop_max_rounds,
+        )(task)
+        await looper()
+
+
+def run_monitors_async(
+    monitors: Sequence[AsyncMonitor], max_in_flight: int = 100
+) -> None:
+    """Function that runs asynchronous monitors on one event loop
+
+    Args:
+        monitors (Sequence[AsyncMonitor]): Monitors to run
+        max_in_flight (int, optional):
+            Maximum number of concurrent requests across all monitors.
+            Defaults to 100.
+    """
+    run_tasks_asynchronously(
+        [monitor.main_async for monitor in monitors],
+        max_in_flight=max_in_flight,
+    )
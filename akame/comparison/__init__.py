@@ -1,24 +1,242 @@
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 from akame.comparison.core import ComparerBase
+from akame.comparison.delta import MISSING, JSONDelta, StringDelta
+from akame.comparison.matching import MultiPatternMatcher, Occurrence
+from akame.comparison.numeric import (
+    NumericFields,
+    align_numeric_fields,
+    apply_baselines,
+    find_crossed_indices,
+    get_kept_baselines,
+    get_numeric_fields,
+)
+from akame.comparison.similarity import (
+    get_minhash,
+    get_minhash_similarity,
+    get_shingle_hashes,
+    get_simhash,
+    get_simhash_similarity,
+)
+from akame.extraction.parser import (
+    convert_json_to_dict,
+    convert_jsonp_to_object,
+)
+from akame.utility.core import MonitoredContent
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
 class BasicComparer(ComparerBase):
-    """Class that defines the basic comparer"""
+    r"""Class that defines the basic comparer
 
-    def __init__(self, matches_expression: Optional[str] = None) -> None:
+    With `matches_expression`, the comparer watches for patterns instead of
+    any change: it reports changes only when patterns newly appear in or
+    disappear from the content.
+
+    Args:
+        matches_expression (Optional[Union[str, Sequence[str]]], optional):
+            Literal strings or regexes to watch for, e.g.
+            ['in stock', '加入購物車', r'NT\$\s*\d+']. Defaults to None.
+        context_chars (int, optional):
+            Characters around each changed hunk to rescan for regexes.
+            Defaults to 200.
+    """
+
+    def __init__(
+        self,
+        matches_expression: Optional[Union[str, Sequence[str]]] = None,
+        context_chars: int = 200,
+    ) -> None:
         super().__init__()
         self.matches_expression = matches_expression
+        self.matcher: Optional[MultiPatternMatcher] = None
+        if matches_expression:
+            self.matcher = MultiPatternMatcher(
+                [matches_expression]
+                if isinstance(matches_expression, str)
+                else matches_expression,
+                context_chars=context_chars,
+            )
+
+        self.occurrences: Dict[str, Set[Occurrence]] = {}
+        self.patterns_appeared: List[str] = []
+        self.patterns_disappeared: List[str] = []
+
+    def get_occurrences(self, mc: MonitoredContent) -> Set[Occurrence]:
+        """Function that finds the watched patterns in the monitored content,
+        scanning the whole content only if the other side is not known
+
+        Args:
+            mc (MonitoredContent): Monitored content
+
+        Returns:
+            Set[Occurrence]: Occurrences of the watched patterns
+        """
+        fingerprint = mc.get_fingerprint()
+        if fingerprint in self.occurrences:
+            return self.occurrences[fingerprint]
+
+        fingerprint_0 = self.mc_0.get_fingerprint()
+        delta = None
+        if mc is self.mc_1 and fingerprint_0 in self.occurrences:
+            delta = self.get_delta()
+
+        if isinstance(delta, StringDelta):
+            occurrences = self.matcher.update_occurrences(
+                self.occurrences[fingerprint_0], delta.b, delta.matches
+            )
+        else:
+            occurrences = self.matcher.find_occurrences(str(mc.content))
+
+        self.occurrences[fingerprint] = occurrences
+        return occurrences
+
+    def load_pattern_changes(self) -> None:
+        """Function that finds which patterns appeared and disappeared"""
+        patterns_0 = self.matcher.get_patterns(self.get_occurrences(self.mc_0))
+        patterns_1 = self.matcher.get_patterns(self.get_occurrences(self.mc_1))
+        self.patterns_appeared = sorted(patterns_1 - patterns_0)
+        self.patterns_disappeared = sorted(patterns_0 - patterns_1)
 
     def load_comparison_status(self) -> None:
-        if self.mc_0.content is None:
+        self.patterns_appeared = []
+        self.patterns_disappeared = []
+
+        if self.mc_0.get_fingerprint() is None:
             self.comparison_status = None
-        else:
+        elif self.mc_0.get_fingerprint() == self.mc_1.get_fingerprint():
+            self.comparison_status = False
+        elif self.matcher is None:
             self.comparison_status = self.mc_0.content != self.mc_1.content
+        else:
+            self.load_pattern_changes()
+            self.comparison_status = bool(
+                self.patterns_appeared or self.patterns_disappeared
+            )
+
+        if self.matcher is not None:
+            # only the current content is compared again, as the archived
+            # side; the first round scans it in full
+            fingerprint = self.mc_1.get_fingerprint()
+            occurrences = self.get_occurrences(self.mc_1)
+            self.occurrences = {fingerprint: occurrences}
+
+    def compose_comparison_results(self) -> None:
+        if self.comparison_status is None:
+            self.status_code = -1
+            self.message = "INITIATED"
+        elif not self.comparison_status:
+            self.status_code = 0
+            self.message = "UNCHANGED"
+        elif self.matcher is None:
+            self.status_code = 1
+            self.message = "CHANGES DETECTED"
+        else:
+            self.status_code = 1
+            self.message = (
+                f"PATTERNS APPEARED: {self.patterns_appeared}; "
+                f"PATTERNS DISAPPEARED: {self.patterns_disappeared}"
+            )
+
+
+class StructuredComparer(ComparerBase):
+    """Class that compares parsed JSON content by key path
+
+    String content is parsed as JSON (or JSONP); structured content is
+    compared as is. Content that is neither is compared as text. The
+    current content's tree and hashes are kept, so the archived side is
+    not parsed again in the next round.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        # fingerprint -> (tree, hash memo); no memo if it is not JSON
+        self.parsed_trees: Dict[str, Tuple[Any, Optional[Dict[int, int]]]]
+        self.parsed_trees = {}
+        self.compared_as_text = False
+
+    def parse_content(self, content: Any) -> Any:
+        """Function that parses JSON or JSONP strings into trees
+
+        Args:
+            content (Any): Monitored content
+
+        Returns:
+            Any: Parsed tree; the content itself if it is not a string
+
+        Raises:
+            ValueError: If the string is neither JSON nor JSONP
+        """
+        if not isinstance(content, (str, bytes)):
+            return content
+        try:
+            return convert_json_to_dict(content)
+        except ValueError:
+            text = content.decode() if isinstance(content, bytes) else content
+            return convert_jsonp_to_object(text)
+
+    def get_parsed_tree(
+        self, mc: MonitoredContent
+    ) -> Tuple[Any, Optional[Dict[int, int]]]:
+        """Function that parses the monitored content once across rounds
+
+        Args:
+            mc (MonitoredContent): Monitored content
+
+        Returns:
+            Tuple[Any, Optional[Dict[int, int]]]: Parsed tree and its hash
+                memo; the content and None if it is not JSON or JSONP
+        """
+        fingerprint = mc.get_fingerprint()
+        if fingerprint not in self.parsed_trees:
+            try:
+                self.parsed_trees[fingerprint] = (
+                    self.parse_content(mc.content),
+                    {},
+                )
+            except ValueError:
+                logger.warning(
+                    f"Comparing '{mc.task_name}' as text: "
+                    "the content is neither JSON nor JSONP"
+                )
+                self.parsed_trees[fingerprint] = (mc.content, None)
+        return self.parsed_trees[fingerprint]
+
+    def load_comparison_status(self) -> None:
+        self.compared_as_text = False
+        if self.mc_0.get_fingerprint() is None:
+            self.comparison_status = None
+        elif self.mc_0.get_fingerprint() == self.mc_1.get_fingerprint():
+            self.comparison_status = False
+        elif (
+            self.get_parsed_tree(self.mc_0)[1] is None
+            or self.get_parsed_tree(self.mc_1)[1] is None
+        ):
+            self.compared_as_text = True
+            self.comparison_status = True
+        else:
+            self.comparison_status = bool(self.get_delta().changes)
+
+        # only the current content is compared again, as the archived side
+        fingerprint = self.mc_1.get_fingerprint()
+        self.parsed_trees = {
+            key: value
+            for key, value in self.parsed_trees.items()
+            if key == fingerprint
+        }
+
+    def load_delta(self) -> None:
+        parsed_0, hashes_0 = self.get_parsed_tree(self.mc_0)
+        parsed_1, hashes_1 = self.get_parsed_tree(self.mc_1)
+        if hashes_0 is None or hashes_1 is None:
+            super().load_delta()
+            return
+        self.delta = JSONDelta(
+            parsed_0, parsed_1, hashes_a=hashes_0, hashes_b=hashes_1
+        )
 
     def compose_comparison_results(self) -> None:
         if self.comparison_status is None:
@@ -27,6 +245,271 @@ class BasicComparer(ComparerBase):
         elif not self.comparison_status:
             self.status_code = 0
             self.message = "UNCHANGED"
+        elif self.compared_as_text:
+            self.status_code = 1
+            self.message = "CHANGES DETECTED"
+        else:
+            self.status_code = 1
+            n_changes = len(self.get_delta().changes)
+            self.message = f"CHANGES DETECTED AT {n_changes} KEY PATH(S)"
+
+
+class NumericThresholdComparer(StructuredComparer):
+    """Class that compares the numeric fields of parsed JSON content and
+    reports only the fields whose change crossed a threshold
+
+    A field crosses when its absolute change exceeds `abs_threshold`, or
+    its change relative to its baseline exceeds `rel_threshold`. The
+    baseline is the value last reported, so slow drifts are reported once
+    they add up; it is cached with the content as a signature. Numeric
+    fields that appear or disappear always count as crossed.
+
+    Args:
+        abs_threshold (Optional[float], optional):
+            Absolute change to exceed. Defaults to None.
+        rel_threshold (Optional[float], optional):
+            Relative change to exceed, e.g. 0.01 for 1%. Defaults to None;
+            without either threshold any change is reported.
+    """
+
+    # signature kind holding the baselines that differ from the content
+    baseline_kind: str = "numeric_baselines"
+
+    def __init__(
+        self,
+        abs_threshold: Optional[float] = None,
+        rel_threshold: Optional[float] = None,
+    ) -> None:
+        super().__init__()
+        self.abs_threshold = abs_threshold
+        self.rel_threshold = rel_threshold
+        self.numeric_fields: Dict[str, Optional[NumericFields]] = {}
+        self.crossed_fields: List[Tuple[str, Any, Any]] = []
+
+    def get_numeric_fields(
+        self, mc: MonitoredContent
+    ) -> Optional[NumericFields]:
+        """Function that flattens the monitored content once across rounds
+
+        Args:
+            mc (MonitoredContent): Monitored content
+
+        Returns:
+            Optional[NumericFields]: Key paths and values of the numeric
+                fields; None if the content is not JSON or JSONP
+        """
+        fingerprint = mc.get_fingerprint()
+        if fingerprint not in self.numeric_fields:
+            try:
+                tree = self.parse_content(mc.content)
+            except ValueError:
+                logger.warning(
+                    f"Comparing '{mc.task_name}' as text: "
+                    "the content is neither JSON nor JSONP"
+                )
+                self.numeric_fields[fingerprint] = None
+            else:
+                self.numeric_fields[fingerprint] = get_numeric_fields(tree)
+        return self.numeric_fields[fingerprint]
+
+    def load_crossed_fields(
+        self, fields_0: NumericFields, fields_1: NumericFields
+    ) -> None:
+        """Function that finds the fields that crossed a threshold
+
+        Args:
+            fields_0 (NumericFields): Fields of the archived content
+            fields_1 (NumericFields): Fields of the current content
+        """
+        key_paths, values_0, values_1, unmatched = align_numeric_fields(
+            fields_0, fields_1
+        )
+        baselines_0 = self.mc_0.get_signatures().get(self.baseline_kind, {})
+        baselines = apply_baselines(key_paths, values_0, baselines_0)
+        crossed = find_crossed_indices(
+            baselines,
+            values_1,
+            abs_threshold=self.abs_threshold,
+            rel_threshold=self.rel_threshold,
+        )
+        self.crossed_fields = [
+            (key_paths[i], float(baselines[i]), float(values_1[i]))
+            for i in crossed
+        ]
+        # crossed fields are reported, so their value is the new baseline
+        self.mc_1.get_signatures()[self.baseline_kind] = get_kept_baselines(
+            key_paths, baselines, values_1, crossed
+        )
+
+        indices_0 = fields_0.get_indices() if unmatched else {}
+        indices_1 = fields_1.get_indices() if unmatched else {}
+        for key_path in unmatched:
+            self.crossed_fields.append(
+                (
+                    key_path,
+                    baselines_0.get(
+                        key_path, float(fields_0.values[indices_0[key_path]])
+                    )
+                    if key_path in indices_0
+                    else MISSING,
+                    float(fields_1.values[indices_1[key_path]])
+                    if key_path in indices_1
+                    else MISSING,
+                )
+            )
+
+    def load_comparison_status(self) -> None:
+        self.crossed_fields = []
+        self.compared_as_text = False
+        if self.mc_0.get_fingerprint() is None:
+            self.comparison_status = None
+        elif self.mc_0.get_fingerprint() == self.mc_1.get_fingerprint():
+            self.comparison_status = False
+            baselines_0 = self.mc_0.get_signatures().get(self.baseline_kind)
+            if baselines_0:
+                self.mc_1.get_signatures()[self.baseline_kind] = baselines_0
         else:
+            fields_0 = self.get_numeric_fields(self.mc_0)
+            fields_1 = self.get_numeric_fields(self.mc_1)
+            if fields_0 is None or fields_1 is None:
+                self.compared_as_text = True
+                self.comparison_status = True
+            else:
+                self.load_crossed_fields(fields_0, fields_1)
+                self.comparison_status = bool(self.crossed_fields)
+
+        # only the current content is compared again, as the archived side
+        fingerprint = self.mc_1.get_fingerprint()
+        self.numeric_fields = {
+            key: value
+            for key, value in self.numeric_fields.items()
+            if key == fingerprint
+        }
+
+    def load_delta(self) -> None:
+        if self.compared_as_text:
+            ComparerBase.load_delta(self)
+            return
+        self.delta = JSONDelta(
+            self.content_0, self.content_1, changes=self.crossed_fields
+        )
+
+    def compose_comparison_results(self) -> None:
+        if self.comparison_status is None:
+            self.status_code = -1
+            self.message = "INITIATED"
+        elif not self.comparison_status:
+            self.status_code = 0
+            self.message = "UNCHANGED"
+        elif self.compared_as_text:
             self.status_code = 1
             self.message = "CHANGES DETECTED"
+        else:
+            self.status_code = 1
+            n_fields = len(self.crossed_fields)
+            self.message = f"CHANGES DETECTED IN {n_fields} FIELD(S)"
+
+
+class SimilarityComparer(ComparerBase):
+    """Class that reports changes only when the content is no longer similar
+    enough to its previous version
+
+    Similarity is estimated from SimHash or MinHash signatures of word
+    shingles. The signatures are cached with the content, so the archived
+    content is loaded only if a delta is needed for notification.
+
+    Args:
+        method (str, optional): 'simhash' or 'minhash'.
+            Defaults to 'simhash'.
+        min_similarity (float, optional):
+            Similarity below which the content counts as changed: the share
+            of equal SimHash bits, or the estimated Jaccard similarity for
+            MinHash. Defaults to 0.95.
+        shingle_size (int, optional): Words per shingle. Defaults to 3.
+        num_hashes (int, optional): Hashes kept per MinHash.
+            Defaults to 128.
+    """
+
+    def __init__(
+        self,
+        method: str = "simhash",
+        min_similarity: float = 0.95,
+        shingle_size: int = 3,
+        num_hashes: int = 128,
+    ) -> None:
+        super().__init__()
+        if method not in ("simhash", "minhash"):
+            raise ValueError(f"Unknown similarity method: '{method}'")
+        self.method = method
+        self.min_similarity = min_similarity
+        self.shingle_size = shingle_size
+        self.num_hashes = num_hashes
+        self.similarity: Optional[float] = None
+
+    def get_signature_kind(self) -> str:
+        """Function that names the signature, so signatures computed with
+        other settings are not compared
+
+        Returns:
+            str: Signature kind, e.g. 'simhash:3' or 'minhash:3:128'
+        """
+        if self.method == "simhash":
+            return f"simhash:{self.shingle_size}"
+        return f"minhash:{self.shingle_size}:{self.num_hashes}"
+
+    def get_signature(self, mc: MonitoredContent) -> Any:
+        """Function that gets the signature of the monitored content,
+        computing and storing it only if it is not cached yet
+
+        Args:
+            mc (MonitoredContent): Monitored content
+
+        Returns:
+            Any: SimHash or MinHash of the content
+        """
+        signatures = mc.get_signatures()
+        kind = self.get_signature_kind()
+        if kind not in signatures:
+            hashes = get_shingle_hashes(str(mc.content), self.shingle_size)
+            if self.method == "simhash":
+                signatures[kind] = get_simhash(hashes)
+            else:
+                signatures[kind] = get_minhash(hashes, self.num_hashes)
+        return signatures[kind]
+
+    def load_similarity(self) -> None:
+        """Function that estimates the similarity from the signatures"""
+        signature_0 = self.get_signature(self.mc_0)
+        signature_1 = self.get_signature(self.mc_1)
+        if self.method == "simhash":
+            self.similarity = get_simhash_similarity(signature_0, signature_1)
+        else:
+            self.similarity = get_minhash_similarity(signature_0, signature_1)
+
+    def load_comparison_status(self) -> None:
+        self.similarity = None
+        if self.mc_0.get_fingerprint() is None:
+            self.comparison_status = None
+        elif self.mc_0.get_fingerprint() == self.mc_1.get_fingerprint():
+            self.comparison_status = False
+        else:
+            self.load_similarity()
+            self.comparison_status = self.similarity < self.min_similarity
+
+        # cached along with the content for the next round
+        self.get_signature(self.mc_1)
+
+    def compose_comparison_results(self) -> None:
+        if self.comparison_status is None:
+            self.status_code = -1
+            self.message = "INITIATED"
+        elif not self.comparison_status:
+            self.status_code = 0
+            self.message = (
+                "UNCHANGED"
+                if self.similarity is None
+                else f"MINOR CHANGES ({self.similarity:.1%} SIMILAR)"
+            )
+        else:
+            self.status_code = 1
+            self.message = f"CHANGES DETECTED ({self.similarity:.1%} SIMILAR)"
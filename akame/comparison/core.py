@@ -1,7 +1,10 @@
 import logging
 from typing import Any, Optional, Union
 
+from akame.comparison.delta import StringDelta
+from akame.comparison.delta.core import DeltaBase
 from akame.utility.core import MonitoredContent
+from akame.utility.tasking import run_in_executor
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,8 +15,6 @@ class ComparerBase:
 
     mc_0: MonitoredContent
     mc_1: MonitoredContent
-    content_0: Any
-    content_1: Any
     task_name: str
     target_url: str
 
@@ -22,6 +23,17 @@ class ComparerBase:
         self.comparison_status: Union[bool, None] = None
         self.status_code: int = -1
         self.message: str = ""
+        self.delta: Optional[DeltaBase] = None
+        self.n_deltas_computed: int = 0
+
+    @property
+    def content_0(self) -> Any:
+        # archived content may be loaded from the cache only on access
+        return self.mc_0.content
+
+    @property
+    def content_1(self) -> Any:
+        return self.mc_1.content
 
     def load_comparison_status(self) -> None:
         self.comparison_status = None
@@ -30,6 +42,22 @@ class ComparerBase:
         self.status_code = -1
         self.message = ""
 
+    def load_delta(self) -> None:
+        """Function that computes the delta between the compared content"""
+        self.delta = StringDelta(a=str(self.content_0), b=str(self.content_1))
+
+    def get_delta(self) -> DeltaBase:
+        """Function that returns the delta of this round, computed once on
+        first use and shared by all notifiers and formatters
+
+        Returns:
+            DeltaBase: Delta between the compared content
+        """
+        if self.delta is None:
+            self.load_delta()
+            self.n_deltas_computed += 1
+        return self.delta
+
     def main(
         self, mc_1: MonitoredContent, mc_0: Optional[MonitoredContent] = None
     ):
@@ -45,8 +73,20 @@ class ComparerBase:
         self.target_url = mc_1.target_url
         self.mc_0 = mc_0 if mc_0 else MonitoredContent()
 
-        self.content_0 = self.mc_0.content
-        self.content_1 = self.mc_1.content
+        self.delta = None
+        self.n_deltas_computed = 0
 
         self.load_comparison_status()
         self.compose_comparison_results()
+
+    async def main_async(
+        self, mc_1: MonitoredContent, mc_0: Optional[MonitoredContent] = None
+    ):
+        """Function that compares the content without blocking the event loop
+
+        Args:
+            mc_1 (MonitoredContent): Current mnoitored content
+            mc_0 (Optional[MonitoredContent]): Archived monitored content
+                to be compared against. Defaults to None.
+        """
+        await run_in_executor(self.main, mc_1=mc_1, mc_0=mc_0)
@@ -1,8 +1,14 @@
+import json
 import logging
-from difflib import SequenceMatcher
-from typing import Dict, List, Tuple
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from akame.comparison.delta.core import DeltaBase
+from akame.comparison.delta.engines import (
+    DiffEngineBase,
+    diff_tokens_myers,
+    hunk_diff_engine,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,19 +20,24 @@ class StringDelta(DeltaBase):
     Args:
         a (str): String a to compare
         b (str): String b to compare
+        engine (DiffEngineBase, optional): Engine that finds the matches.
+            Defaults to hunk_diff_engine, which diffs lines first and
+            refines changed hunks within time and size budgets.
     """
 
-    def __init__(self, a: str, b: str) -> None:
+    def __init__(
+        self, a: str, b: str, engine: DiffEngineBase = hunk_diff_engine
+    ) -> None:
         super().__init__(a, b)
+        self.engine = engine
 
         self.load_matches()
         self.load_content_positions()
         self.load_all_delta_parts()
 
     def load_matches(self) -> None:
-        """Function that initiates SequenceMatcher and matches"""
-        self.matcher = SequenceMatcher(None, self.a, self.b)
-        self.matches = self.matcher.get_matching_blocks()
+        """Function that loads the matching blocks from the engine"""
+        self.matches = self.engine.get_matching_blocks(self.a, self.b)
 
     def get_content_positions_for_x(
         self, x: str
@@ -80,3 +91,215 @@ class StringDelta(DeltaBase):
     def return_all_delta_parts(self) -> Tuple[List[str], List[str], List[str]]:
         logger.info("Returning all delta parts in lists")
         return (self.parts_matched, self.parts_changed_a, self.parts_changed_b)
+
+
+class Missing:
+    """Class that marks a key path missing on one side of a JSONDelta"""
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+MISSING = Missing()
+
+
+def get_key_path(path: Tuple[Union[str, int], ...]) -> str:
+    """Function that formats the keys leading to a node as a JSONPath
+
+    Args:
+        path (Tuple[Union[str, int], ...]): Keys and indices from the root
+
+    Returns:
+        str: Key path, e.g. "$.rates.TWD" or "$.items[0]['a b']"
+    """
+    parts = ["$"]
+    for key in path:
+        if isinstance(key, int):
+            parts.append(f"[{key}]")
+        elif isinstance(key, str) and key.isidentifier():
+            parts.append(f".{key}")
+        else:
+            parts.append(f"[{key!r}]")
+    return "".join(parts)
+
+
+def get_structural_hash(node: Any, hashes: Dict[int, int]) -> int:
+    """Function that hashes a parsed JSON tree bottom-up, memoizing the hash
+    of every container by its id
+
+    Args:
+        node (Any): Parsed JSON node
+        hashes (Dict[int, int]): Memo of container hashes by id
+
+    Returns:
+        int: Structural hash of the node
+    """
+    if isinstance(node, dict):
+        if id(node) not in hashes:
+            hashes[id(node)] = hash(
+                frozenset(
+                    (key, get_structural_hash(value, hashes))
+                    for key, value in node.items()
+                )
+            )
+        return hashes[id(node)]
+
+    if isinstance(node, list):
+        if id(node) not in hashes:
+            hashes[id(node)] = hash(
+                tuple(get_structural_hash(item, hashes) for item in node)
+            )
+        return hashes[id(node)]
+
+    try:
+        return hash((type(node).__name__, node))
+    except TypeError:
+        return hash((type(node).__name__, repr(node)))
+
+
+def format_change_part(key_path: str, value: Any) -> str:
+    """Function that formats one side of a key path change
+
+    Args:
+        key_path (str): Key path of the change
+        value (Any): Value on this side; MISSING if absent
+
+    Returns:
+        str: Formatted change, e.g. '$.rates.TWD: 30.5'; empty if absent
+    """
+    if value is MISSING:
+        return ""
+    try:
+        formatted = json.dumps(value, ensure_ascii=False, default=repr)
+    except (TypeError, ValueError):
+        formatted = repr(value)
+    return f"{key_path}: {formatted}"
+
+
+class JSONDelta(DeltaBase):
+    """Class that compares two parsed JSON trees and reports the changes as
+    key paths with their old and new values
+
+    Subtrees whose structural hashes differ are walked; those whose hashes
+    match are skipped once confirmed equal, as hashes may collide. List
+    items are aligned by hash so an insertion does not shift every item.
+
+    Args:
+        a (Any): Parsed JSON a to compare
+        b (Any): Parsed JSON b to compare
+        hashes_a (Optional[Dict[int, int]], optional):
+            Memo of container hashes of a, e.g. kept from the last round.
+            Defaults to None.
+        hashes_b (Optional[Dict[int, int]], optional):
+            Memo of container hashes of b. Defaults to None.
+        changes (Optional[List[Tuple[str, Any, Any]]], optional):
+            Changes already found, e.g. by a comparer, to lay out without
+            walking the trees. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        a: Any,
+        b: Any,
+        hashes_a: Optional[Dict[int, int]] = None,
+        hashes_b: Optional[Dict[int, int]] = None,
+        changes: Optional[List[Tuple[str, Any, Any]]] = None,
+    ) -> None:
+        super().__init__(a, b)
+        self.hashes_a = hashes_a if hashes_a is not None else {}
+        self.hashes_b = hashes_b if hashes_b is not None else {}
+
+        if changes is None:
+            self.load_changes()
+        else:
+            self.changes = changes
+        self.load_all_delta_parts()
+
+    def load_changes(self) -> None:
+        """Function that walks both trees and collects the changes"""
+        self.changes: List[Tuple[str, Any, Any]] = []
+        self.walk(self.a, self.b, ())
+
+    def walk(self, a: Any, b: Any, path: Tuple[Union[str, int], ...]) -> None:
+        if a is b:
+            return
+
+        # equal hashes only suggest equal subtrees, e.g. hash(-1) == hash(-2)
+        if (
+            type(a) is type(b)
+            and get_structural_hash(a, self.hashes_a)
+            == get_structural_hash(b, self.hashes_b)
+            and a == b
+        ):
+            return
+
+        if isinstance(a, dict) and isinstance(b, dict):
+            for key, value in a.items():
+                if key in b:
+                    self.walk(value, b[key], path + (key,))
+                else:
+                    self.add_change(path + (key,), value, MISSING)
+            for key, value in b.items():
+                if key not in a:
+                    self.add_change(path + (key,), MISSING, value)
+
+        elif isinstance(a, list) and isinstance(b, list):
+            self.walk_lists(a, b, path)
+
+        else:
+            self.add_change(path, a, b)
+
+    def walk_lists(
+        self, a: List[Any], b: List[Any], path: Tuple[Union[str, int], ...]
+    ) -> None:
+        """Function that aligns list items by hash and walks the pairs
+
+        Args:
+            a (List[Any]): List a
+            b (List[Any]): List b
+            path (Tuple[Union[str, int], ...]): Path to the lists
+        """
+        ids_a = [get_structural_hash(item, self.hashes_a) for item in a]
+        ids_b = [get_structural_hash(item, self.hashes_b) for item in b]
+        blocks = diff_tokens_myers(
+            ids_a, ids_b, max_edits=1000, deadline=time.monotonic() + 1
+        )
+        if blocks is None:
+            blocks = []
+        bounds = [(0, 0, 0)] + blocks + [(len(a), len(b), 0)]
+
+        for (i_0, j_0, size_0), (i_1, j_1, _) in zip(bounds[:-1], bounds[1:]):
+            # items aligned by hash are walked too, to catch hash collisions
+            for k in range(size_0):
+                self.walk(a[i_0 + k], b[j_0 + k], path + (j_0 + k,))
+            indices_a = range(i_0 + size_0, i_1)
+            indices_b = range(j_0 + size_0, j_1)
+            for i, j in zip(indices_a, indices_b):
+                self.walk(a[i], b[j], path + (j,))
+            for i in indices_a[len(indices_b) :]:
+                self.add_change(path + (i,), a[i], MISSING)
+            for j in indices_b[len(indices_a) :]:
+                self.add_change(path + (j,), MISSING, b[j])
+
+    def add_change(
+        self, path: Tuple[Union[str, int], ...], old: Any, new: Any
+    ) -> None:
+        self.changes.append((get_key_path(path), old, new))
+
+    def load_all_delta_parts(self) -> None:
+        """Function that lays out one line per changed key path"""
+        self.parts_matched = [
+            "\n" if i else "" for i in range(len(self.changes))
+        ] + [""]
+        self.parts_changed_a = [
+            format_change_part(key_path, old)
+            for key_path, old, _ in self.changes
+        ]
+        self.parts_changed_b = [
+            format_change_part(key_path, new)
+            for key_path, _, new in self.changes
+        ]
+
+    def return_all_delta_parts(self) -> Tuple[List[str], List[str], List[str]]:
+        logger.info("Returning all delta parts in lists")
+        return (self.parts_matched, self.parts_changed_a, self.parts_changed_b)
@@ -0,0 +1,380 @@
+import logging
+import re
+import time
+from difflib import Match, SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\s+|\w+|[^\w\s]")
+
+
+def get_common_prefix_length(a: str, b: str) -> int:
+    """Function that gets the length of the common prefix of two strings
+
+    Args:
+        a (str): String a
+        b (str): String b
+
+    Returns:
+        int: Length of the common prefix
+    """
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def get_common_suffix_length(a: str, b: str, limit: int) -> int:
+    """Function that gets the length of the common suffix of two strings
+
+    Args:
+        a (str): String a
+        b (str): String b
+        limit (int): Maximum length, to keep clear of the common prefix
+
+    Returns:
+        int: Length of the common suffix
+    """
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle :] == b[len(b) - middle :]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def normalize_matching_blocks(
+    blocks: List[Tuple[int, int, int]], len_a: int, len_b: int
+) -> List[Match]:
+    """Function that merges adjacent blocks and adds the boundary blocks, so
+    changes at the very start and end are kept between matched parts
+
+    Args:
+        blocks (List[Tuple[int, int, int]]): Ordered (a, b, size) blocks
+        len_a (int): Length of string a
+        len_b (int): Length of string b
+
+    Returns:
+        List[Match]: Blocks starting at (0, 0) and ending at
+            (len_a, len_b), with a zero-size sentinel if needed
+    """
+    merged: List[List[int]] = [[0, 0, 0]]
+    for i, j, size in blocks:
+        if not size:
+            continue
+        last = merged[-1]
+        if last[0] + last[2] == i and last[1] + last[2] == j:
+            last[2] += size
+        else:
+            merged.append([i, j, size])
+
+    i, j, size = merged[-1]
+    if (i + size, j + size) != (len_a, len_b):
+        merged.append([len_a, len_b, 0])
+
+    return [Match(i, j, size) for i, j, size in merged]
+
+
+class DiffEngineBase:
+    """Class that defines the base diff engine"""
+
+    def get_matching_blocks(self, a: str, b: str) -> List[Match]:
+        """Function that finds the blocks two strings have in common
+
+        Args:
+            a (str): String a
+            b (str): String b
+
+        Returns:
+            List[Match]: Ordered matching blocks
+        """
+        return normalize_matching_blocks([], len(a), len(b))
+
+
+class SequenceMatcherEngine(DiffEngineBase):
+    """Class that diffs strings character by character with difflib"""
+
+    def get_matching_blocks(self, a: str, b: str) -> List[Match]:
+        blocks = SequenceMatcher(None, a, b).get_matching_blocks()
+        return normalize_matching_blocks(blocks, len(a), len(b))
+
+
+def tokenize(text: str, max_line_length: int) -> List[str]:
+    """Function that splits text into lines, or into words and
+    punctuation when lines are too long to diff usefully (e.g. minified
+    HTML or JSON)
+
+    Args:
+        text (str): Text to split
+        max_line_length (int): Average line length beyond which to split
+            into words
+
+    Returns:
+        List[str]: Tokens that join back into the text
+    """
+    lines = text.splitlines(keepends=True)
+    if len(text) <= max_line_length * max(len(lines), 1):
+        return lines
+    return TOKEN_PATTERN.findall(text)
+
+
+def diff_tokens_myers(
+    a: List[int], b: List[int], max_edits: int, deadline: float
+) -> Optional[List[Tuple[int, int, int]]]:
+    """Function that diffs two token sequences with Myers' O(ND) algorithm
+
+    Args:
+        a (List[int]): Token ids of sequence a
+        b (List[int]): Token ids of sequence b
+        max_edits (int): Maximum number of insertions and deletions
+        deadline (float): Monotonic time to give up at
+
+    Returns:
+        Optional[List[Tuple[int, int, int]]]: Ordered matching blocks;
+            None if a budget ran out
+    """
+    n, m = len(a), len(b)
+    max_d = min(max_edits, n + m)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace: List[List[int]] = []
+
+    for d in range(max_d + 1):
+        if time.monotonic() > deadline:
+            return None
+        trace.append(v[offset - d - 1 : offset + d + 2])
+
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+
+            if x >= n and y >= m:
+                return backtrack_myers(trace, n, m)
+
+    return None
+
+
+def backtrack_myers(
+    trace: List[List[int]], n: int, m: int
+) -> List[Tuple[int, int, int]]:
+    """Function that walks the Myers trace back into matching blocks
+
+    Args:
+        trace (List[List[int]]): Furthest x per diagonal before each step
+        n (int): Length of sequence a
+        m (int): Length of sequence b
+
+    Returns:
+        List[Tuple[int, int, int]]: Ordered matching blocks
+    """
+    blocks = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        # trace[d] covers diagonals -d - 1 to d + 1
+        if k == -d or (k != d and v[k - 1 + d + 1] < v[k + 1 + d + 1]):
+            k_prev = k + 1
+        else:
+            k_prev = k - 1
+        x_prev = v[k_prev + d + 1]
+        y_prev = x_prev - k_prev
+
+        x_snake = max(x_prev, y_prev + k) if d else 0
+        if x > x_snake:
+            blocks.append((x_snake, x_snake - k, x - x_snake))
+        x, y = x_prev, y_prev
+
+    return blocks[::-1]
+
+
+class HunkDiffEngine(DiffEngineBase):
+    """Class that diffs lines (or words) first and refines only the changed
+    hunks character by character, within time and size budgets
+
+    When a budget runs out the delta falls back to a coarse one: the
+    common prefix and suffix around a single replaced block.
+
+    Args:
+        max_edits (int, optional):
+            Maximum number of token insertions and deletions to search
+            for. Defaults to 2000.
+        max_refine_chars (int, optional):
+            Maximum characters per side of a hunk to refine.
+            Defaults to 2000.
+        max_chars (int, optional):
+            Maximum characters per side to diff at all.
+            Defaults to 10_000_000.
+        time_budget_seconds (float, optional):
+            Seconds to spend before falling back. Defaults to 1.
+        max_line_length (int, optional):
+            Average line length beyond which to diff words instead of
+            lines. Defaults to 200.
+    """
+
+    def __init__(
+        self,
+        max_edits: int = 2000,
+        max_refine_chars: int = 2000,
+        max_chars: int = 10_000_000,
+        time_budget_seconds: float = 1,
+        max_line_length: int = 200,
+    ) -> None:
+        self.max_edits = max_edits
+        self.max_refine_chars = max_refine_chars
+        self.max_chars = max_chars
+        self.time_budget_seconds = time_budget_seconds
+        self.max_line_length = max_line_length
+
+    def get_coarse_blocks(self, a: str, b: str) -> List[Tuple[int, int, int]]:
+        """Function that gets the common prefix and suffix around a single
+        replaced block
+
+        Args:
+            a (str): String a
+            b (str): String b
+
+        Returns:
+            List[Tuple[int, int, int]]: Prefix and suffix blocks
+        """
+        prefix = get_common_prefix_length(a, b)
+        suffix = get_common_suffix_length(
+            a, b, min(len(a), len(b)) - prefix
+        )
+        return [(0, 0, prefix), (len(a) - suffix, len(b) - suffix, suffix)]
+
+    def get_token_blocks(
+        self, a: str, b: str, deadline: float
+    ) -> Optional[List[Tuple[int, int, int]]]:
+        """Function that diffs the token sequences into character blocks
+
+        Args:
+            a (str): String a
+            b (str): String b
+            deadline (float): Monotonic time to give up at
+
+        Returns:
+            Optional[List[Tuple[int, int, int]]]: Matching character blocks;
+                None if a budget ran out
+        """
+        tokens_a = tokenize(a, self.max_line_length)
+        tokens_b = tokenize(b, self.max_line_length)
+
+        token_ids: Dict[str, int] = {}
+        ids_a = [token_ids.setdefault(t, len(token_ids)) for t in tokens_a]
+        ids_b = [token_ids.setdefault(t, len(token_ids)) for t in tokens_b]
+
+        prefix = 0
+        while (
+            prefix < min(len(ids_a), len(ids_b))
+            and ids_a[prefix] == ids_b[prefix]
+        ):
+            prefix += 1
+        suffix = 0
+        while (
+            suffix < min(len(ids_a), len(ids_b)) - prefix
+            and ids_a[-suffix - 1] == ids_b[-suffix - 1]
+        ):
+            suffix += 1
+
+        middle = diff_tokens_myers(
+            ids_a[prefix : len(ids_a) - suffix],
+            ids_b[prefix : len(ids_b) - suffix],
+            max_edits=self.max_edits,
+            deadline=deadline,
+        )
+        if middle is None:
+            return None
+
+        blocks = (
+            [(0, 0, prefix)]
+            + [(i + prefix, j + prefix, size) for i, j, size in middle]
+            + [(len(ids_a) - suffix, len(ids_b) - suffix, suffix)]
+        )
+
+        offsets_a, offsets_b = [0], [0]
+        for token in tokens_a:
+            offsets_a.append(offsets_a[-1] + len(token))
+        for token in tokens_b:
+            offsets_b.append(offsets_b[-1] + len(token))
+
+        return [
+            (offsets_a[i], offsets_b[j], offsets_a[i + size] - offsets_a[i])
+            for i, j, size in blocks
+        ]
+
+    def refine_blocks(
+        self,
+        a: str,
+        b: str,
+        blocks: List[Tuple[int, int, int]],
+        deadline: float,
+    ) -> List[Tuple[int, int, int]]:
+        """Function that diffs each changed hunk character by character
+
+        Args:
+            a (str): String a
+            b (str): String b
+            blocks (List[Tuple[int, int, int]]): Matching character blocks
+            deadline (float): Monotonic time to stop refining at
+
+        Returns:
+            List[Tuple[int, int, int]]: Refined matching blocks
+        """
+        blocks = [block for block in blocks if block[2]]
+        bounds = [(0, 0, 0)] + blocks + [(len(a), len(b), 0)]
+        refined: List[Tuple[int, int, int]] = []
+
+        for (i_0, j_0, size_0), (i_1, j_1, _) in zip(bounds[:-1], bounds[1:]):
+            hunk_a = a[i_0 + size_0 : i_1]
+            hunk_b = b[j_0 + size_0 : j_1]
+            refined.append((i_0, j_0, size_0))
+
+            if (
+                hunk_a
+                and hunk_b
+                and len(hunk_a) <= self.max_refine_chars
+                and len(hunk_b) <= self.max_refine_chars
+                and time.monotonic() < deadline
+            ):
+                matcher = SequenceMatcher(None, hunk_a, hunk_b, autojunk=False)
+                refined.extend(
+                    (i + i_0 + size_0, j + j_0 + size_0, size)
+                    for i, j, size in matcher.get_matching_blocks()
+                )
+
+        return refined
+
+    def get_matching_blocks(self, a: str, b: str) -> List[Match]:
+        deadline = time.monotonic() + self.time_budget_seconds
+
+        blocks = None
+        if len(a) <= self.max_chars and len(b) <= self.max_chars:
+            blocks = self.get_token_blocks(a, b, deadline)
+
+        if blocks is None:
+            logger.info("Diff budget exceeded; using a coarse delta")
+            blocks = self.get_coarse_blocks(a, b)
+        else:
+            blocks = self.refine_blocks(a, b, blocks, deadline)
+
+        return normalize_matching_blocks(blocks, len(a), len(b))
+
+
+# used by StringDelta unless an engine is given explicitly
+hunk_diff_engine = HunkDiffEngine()
@@ -0,0 +1,350 @@
+import logging
+import re
+from bisect import bisect_right
+from collections import deque
+from difflib import Match
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# (pattern index, start, end) of a match in the text
+Occurrence = Tuple[int, int, int]
+
+# characters with a meaning in regexes; re.escape also escapes spaces
+REGEX_CHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+
+class AhoCorasick:
+    """Class that finds all occurrences of many literal patterns in a single
+    pass over the text
+
+    Args:
+        patterns (Sequence[str]): Literal patterns to find
+    """
+
+    def __init__(self, patterns: Sequence[str]) -> None:
+        self.patterns = list(patterns)
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[int]] = [[]]
+
+        for index, pattern in enumerate(self.patterns):
+            self.add_pattern(index, pattern)
+        self.load_fail_links()
+
+    def add_pattern(self, index: int, pattern: str) -> None:
+        state = 0
+        for character in pattern:
+            if character not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.goto[state][character] = len(self.goto) - 1
+            state = self.goto[state][character]
+        self.outputs[state].append(index)
+
+    def load_fail_links(self) -> None:
+        """Function that links every state to its longest proper suffix
+        state, breadth first"""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and character not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(character, 0)
+                if self.fail[next_state] == next_state:
+                    self.fail[next_state] = 0
+                self.outputs[next_state] = (
+                    self.outputs[next_state]
+                    + self.outputs[self.fail[next_state]]
+                )
+
+    def iterate_occurrences(
+        self, text: str, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[Occurrence]:
+        """Function that yields every occurrence within text[start:end]
+
+        Args:
+            text (str): Text to scan
+            start (int, optional): Position to start at. Defaults to 0.
+            end (Optional[int], optional): Position to stop at.
+                Defaults to None, the end of the text.
+
+        Yields:
+            Iterator[Occurrence]: Pattern index, start and end of each
+                occurrence, overlapping ones included
+        """
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        for position in range(start, len(text) if end is None else end):
+            character = text[position]
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+            for index in outputs[state]:
+                length = len(self.patterns[index])
+                yield (index, position + 1 - length, position + 1)
+
+
+def check_literal(pattern: str) -> bool:
+    """Function that checks whether a pattern has no regex syntax
+
+    Args:
+        pattern (str): Pattern to check
+
+    Returns:
+        bool: Whether the pattern matches only itself
+    """
+    return bool(pattern) and not REGEX_CHARACTERS.intersection(pattern)
+
+
+def check_combinable(regex: Pattern) -> bool:
+    """Function that checks whether a regex keeps its meaning as one group
+    of a combined alternation
+
+    Args:
+        regex (Pattern): Compiled regex
+
+    Returns:
+        bool: Whether the regex has no groups, whose backreferences would
+            be renumbered, and no global inline flags such as '(?i)'
+    """
+    return not regex.groups and not regex.flags & ~re.UNICODE
+
+
+class MultiPatternMatcher:
+    """Class that compiles many watch patterns once and finds them together
+
+    Literal patterns (e.g. 'in stock', '加入購物車') go into one
+    Aho-Corasick automaton. The other patterns are compiled into one
+    combined regex, except those with groups or global inline flags, which
+    are searched separately. Where combined regexes overlap, only the
+    leftmost match at each position is found.
+
+    Args:
+        patterns (Sequence[str]): Literal strings or regexes to find
+        context_chars (int, optional):
+            Characters around each changed hunk to rescan, which bounds the
+            length of regex matches found across a change. Defaults to 200.
+
+    Raises:
+        ValueError: If a pattern is not a valid regex
+    """
+
+    def __init__(
+        self, patterns: Sequence[str], context_chars: int = 200
+    ) -> None:
+        self.patterns = list(dict.fromkeys(patterns))
+        self.literal_indices = [
+            i
+            for i, pattern in enumerate(self.patterns)
+            if check_literal(pattern)
+        ]
+        self.regex_indices = [
+            i
+            for i, pattern in enumerate(self.patterns)
+            if not check_literal(pattern)
+        ]
+
+        self.automaton = (
+            AhoCorasick([self.patterns[i] for i in self.literal_indices])
+            if self.literal_indices
+            else None
+        )
+        self.regexes = self.compile_regexes()
+
+        max_literal_length = max(
+            (len(self.patterns[i]) for i in self.literal_indices), default=0
+        )
+        self.context_chars = (
+            max(context_chars, max_literal_length)
+            if self.regex_indices
+            else max_literal_length
+        )
+
+    def compile_regexes(self) -> List[Tuple[Optional[int], Pattern]]:
+        """Function that compiles the regex patterns, combining those that
+        keep their meaning in one alternation
+
+        Returns:
+            List[Tuple[Optional[int], Pattern]]: Pattern index and regex of
+                each regex to search; None as the index of the combined one,
+                whose group names carry the indices
+
+        Raises:
+            ValueError: If a pattern is not a valid regex
+        """
+        regexes: List[Tuple[Optional[int], Pattern]] = []
+        combinable_indices = []
+        for i in self.regex_indices:
+            try:
+                regex = re.compile(self.patterns[i])
+            except re.error as e:
+                raise ValueError(
+                    f"Invalid watch pattern '{self.patterns[i]}': {e}"
+                ) from e
+            if check_combinable(regex):
+                combinable_indices.append(i)
+            else:
+                regexes.append((i, regex))
+
+        if len(combinable_indices) == 1:
+            i = combinable_indices[0]
+            regexes.append((i, re.compile(self.patterns[i])))
+        elif combinable_indices:
+            combined = "|".join(
+                f"(?P<p{i}>{self.patterns[i]})" for i in combinable_indices
+            )
+            regexes.append((None, re.compile(combined)))
+        return regexes
+
+    def iterate_regex_occurrences(
+        self, text: str, windows: Sequence[Sequence[int]]
+    ) -> Iterator[Occurrence]:
+        """Function that yields the regex matches starting within windows
+        of the text
+
+        The matches are searched in the whole text, so anchors, word
+        boundaries and lookarounds see it as a full scan would; a search
+        that runs past a window is reused for the windows it skipped.
+
+        Args:
+            text (str): Text to scan
+            windows (Sequence[Sequence[int]]): Sorted, disjoint start and
+                end positions of the windows
+
+        Yields:
+            Iterator[Occurrence]: Pattern index, start and end of each
+                match
+        """
+        for index, regex in self.regexes:
+            matched = regex.search(text, windows[0][0]) if windows else None
+            for start, end in windows:
+                position = start
+                while matched and position <= end:
+                    if matched.start() < position:
+                        matched = regex.search(text, position)
+                    elif matched.start() > end:
+                        break
+                    else:
+                        yield (
+                            int(matched.lastgroup[1:])
+                            if index is None
+                            else index,
+                            matched.start(),
+                            matched.end(),
+                        )
+                        position = matched.start() + 1
+
+    def find_occurrences(
+        self, text: str, start: int = 0, end: Optional[int] = None
+    ) -> Set[Occurrence]:
+        """Function that finds the occurrences starting within
+        text[start:end]
+
+        Args:
+            text (str): Text to scan
+            start (int, optional): Position to start at. Defaults to 0.
+            end (Optional[int], optional): Position to stop at.
+                Defaults to None, the end of the text.
+
+        Returns:
+            Set[Occurrence]: Pattern index, start and end of each occurrence
+        """
+        end = len(text) if end is None else end
+        return self.find_window_occurrences(text, [(start, end)])
+
+    def find_window_occurrences(
+        self, text: str, windows: Sequence[Sequence[int]]
+    ) -> Set[Occurrence]:
+        """Function that finds the occurrences within windows of the text
+
+        Args:
+            text (str): Text to scan
+            windows (Sequence[Sequence[int]]): Sorted, disjoint start and
+                end positions of the windows
+
+        Returns:
+            Set[Occurrence]: Pattern index, start and end of each occurrence
+        """
+        occurrences: Set[Occurrence] = set()
+        if self.automaton:
+            for start, end in windows:
+                occurrences.update(
+                    (self.literal_indices[index], match_start, match_end)
+                    for index, match_start, match_end in (
+                        self.automaton.iterate_occurrences(text, start, end)
+                    )
+                )
+        occurrences.update(self.iterate_regex_occurrences(text, windows))
+        return occurrences
+
+    def update_occurrences(
+        self,
+        occurrences_a: Set[Occurrence],
+        text_b: str,
+        matches: List[Match],
+    ) -> Set[Occurrence]:
+        """Function that finds the occurrences in a new version of the text,
+        rescanning only its changed hunks
+
+        Occurrences within unchanged blocks are carried over from the old
+        version; the changed hunks are scanned with enough context to find
+        occurrences that cross their edges.
+
+        Args:
+            occurrences_a (Set[Occurrence]): Occurrences in the old text
+            text_b (str): New text
+            matches (List[Match]): Matching blocks between the old and new
+                text, as in StringDelta.matches
+
+        Returns:
+            Set[Occurrence]: Occurrences in the new text
+        """
+        starts_a = [match.a for match in matches]
+        occurrences_b: Set[Occurrence] = set()
+        for index, start, end in occurrences_a:
+            match = matches[bisect_right(starts_a, start) - 1]
+            if end <= match.a + match.size:
+                shift = match.b - match.a
+                occurrences_b.add((index, start + shift, end + shift))
+
+        windows: List[List[int]] = []
+        for match_0, match_1 in zip(matches[:-1], matches[1:]):
+            hunk_a = (match_0.a + match_0.size, match_1.a)
+            hunk_b = (match_0.b + match_0.size, match_1.b)
+            if hunk_a[0] == hunk_a[1] and hunk_b[0] == hunk_b[1]:
+                continue
+            start = max(hunk_b[0] - self.context_chars, 0)
+            end = min(hunk_b[1] + self.context_chars, len(text_b))
+            if windows and start <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], end)
+            else:
+                windows.append([start, end])
+
+        occurrences_b.update(self.find_window_occurrences(text_b, windows))
+        return occurrences_b
+
+    def get_patterns(self, occurrences: Set[Occurrence]) -> Set[str]:
+        """Function that gets the patterns that occur
+
+        Args:
+            occurrences (Set[Occurrence]): Occurrences in a text
+
+        Returns:
+            Set[str]: Patterns found at least once
+        """
+        return {self.patterns[index] for index, _, _ in occurrences}
@@ -0,0 +1,143 @@
+import logging
+import re
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from akame.utility.core import MonitoredContent
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# volatile regions common to dynamic pages, usable as `rules`
+CSRF_TOKEN_RULE = (
+    r"""(name=["']?(?:csrf[-_]?token|_token|authenticity_token|"""
+    r"""__RequestVerificationToken)["']?\s+(?:value|content)=)"""
+    r"""(["'])[^"']*\2""",
+    r"\1\2\2",
+)
+TIMESTAMP_RULE = (
+    r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?"
+    r"(?:Z|[+-]\d{2}:?\d{2})?\b",
+    "<timestamp>",
+)
+
+
+class Normalizer:
+    """Class that strips volatile regions from the monitored content before
+    comparison, so rounds that only change those regions are no-ops
+
+    Rules are compiled once and applied in order: regex rules, attribute
+    stripping, then whitespace collapse. Content other than strings is
+    passed through as is.
+
+    Args:
+        rules (Sequence[Tuple[str, str]], optional):
+            Regex patterns and their replacements, e.g. TIMESTAMP_RULE.
+            Defaults to ().
+        strip_attributes (Sequence[str], optional):
+            HTML attributes to remove from all tags, e.g. ['nonce',
+            'data-ad-id']. Defaults to ().
+        collapse_whitespace (bool, optional):
+            Whether to collapse runs of whitespace into one space.
+            Defaults to True.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[Tuple[str, str]] = (),
+        strip_attributes: Sequence[str] = (),
+        collapse_whitespace: bool = True,
+    ) -> None:
+        self.rules = [
+            (re.compile(pattern), replacement)
+            for pattern, replacement in rules
+        ]
+        self.attribute_pattern = (
+            re.compile(
+                r"\s(?:"
+                + "|".join(re.escape(name) for name in strip_attributes)
+                + r""")(?![\w-])(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s"'>]+))?""",
+                re.IGNORECASE,
+            )
+            if strip_attributes
+            else None
+        )
+        self.collapse_whitespace = collapse_whitespace
+
+        self.last_fingerprints: Tuple[Optional[str], Optional[str]] = (
+            None,
+            None,
+        )
+        self.last_content: Any = None
+        self.stats = {"rounds": 0, "raw_changes": 0, "noops": 0}
+
+    def normalize(self, content: Any) -> Any:
+        """Function that normalizes the content
+
+        Args:
+            content (Any): Content fetched through extractor
+
+        Returns:
+            Any: Normalized content
+        """
+        if not isinstance(content, str):
+            return content
+
+        for pattern, replacement in self.rules:
+            content = pattern.sub(replacement, content)
+        if self.attribute_pattern:
+            content = self.attribute_pattern.sub("", content)
+        if self.collapse_whitespace:
+            content = WHITESPACE_PATTERN.sub(" ", content).strip()
+        return content
+
+    def main(self, mc: MonitoredContent) -> MonitoredContent:
+        """Function that normalizes the monitored content, skipping the work
+        if the raw content did not change since the last round
+
+        Args:
+            mc (MonitoredContent): Monitored content as extracted
+
+        Returns:
+            MonitoredContent: Monitored content with normalized content and
+                the fingerprint of the raw content kept
+        """
+        raw_fingerprint = mc.get_fingerprint()
+        last_raw_fingerprint, last_fingerprint = self.last_fingerprints
+
+        if raw_fingerprint == last_raw_fingerprint:
+            content = self.last_content
+        else:
+            content = self.normalize(mc.content)
+
+        normalized_mc = MonitoredContent(
+            content=content,
+            task_name=mc.task_name,
+            target_url=mc.target_url,
+            validators=mc.validators,
+            raw_fingerprint=raw_fingerprint,
+        )
+        fingerprint = normalized_mc.get_fingerprint()
+
+        self.stats["rounds"] += 1
+        if last_raw_fingerprint and raw_fingerprint != last_raw_fingerprint:
+            self.stats["raw_changes"] += 1
+            if fingerprint == last_fingerprint:
+                self.stats["noops"] += 1
+                logger.info(
+                    f"Normalized away the changes of '{mc.task_name}'"
+                )
+
+        self.last_fingerprints = (raw_fingerprint, fingerprint)
+        self.last_content = content
+        return normalized_mc
+
+    def get_stats(self) -> Dict[str, int]:
+        """Function that returns how many rounds were turned into no-ops
+
+        Returns:
+            Dict[str, int]: Rounds normalized, rounds whose raw content
+                changed and rounds whose changes were all normalized away
+        """
+        return dict(self.stats)
@@ -0,0 +1,239 @@
+import logging
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from akame.comparison.delta import get_key_path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class NumericFields:
+    """Class that holds the numeric fields of a parsed JSON tree as a key
+    path layout and a contiguous array of values
+
+    Args:
+        key_paths (Tuple[str, ...]): Key paths of the fields, in tree order
+        values (Sequence[float]): Values of the fields; a float64 NumPy
+            array when NumPy is installed, an array('d') otherwise
+    """
+
+    def __init__(
+        self, key_paths: Tuple[str, ...], values: Sequence[float]
+    ) -> None:
+        self.key_paths = key_paths
+        self.values = values
+        self.indices: Optional[Dict[str, int]] = None
+
+    def get_indices(self) -> Dict[str, int]:
+        """Function that maps each key path to its index, built on first use
+
+        Returns:
+            Dict[str, int]: Index of each key path
+        """
+        if self.indices is None:
+            self.indices = {
+                key_path: i for i, key_path in enumerate(self.key_paths)
+            }
+        return self.indices
+
+    def take(self, indices: List[int]) -> Sequence[float]:
+        """Function that gathers the values at the given indices
+
+        Args:
+            indices (List[int]): Indices of the values
+
+        Returns:
+            Sequence[float]: Gathered values, in the same array type
+        """
+        if np is not None:
+            return self.values[np.asarray(indices, dtype=np.intp)]
+        return array("d", [self.values[i] for i in indices])
+
+
+def get_numeric_fields(tree: Any) -> NumericFields:
+    """Function that flattens the numeric leaves of a parsed JSON tree
+
+    Booleans are not treated as numbers, and integers too large for a
+    float are skipped.
+
+    Args:
+        tree (Any): Parsed JSON tree
+
+    Returns:
+        NumericFields: Key paths and values of the numeric leaves
+    """
+    key_paths: List[str] = []
+    values = array("d")
+    stack: List[Tuple[Tuple[Union[str, int], ...], Any]] = [((), tree)]
+    while stack:
+        path, node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(
+                (path + (key,), value)
+                for key, value in reversed(list(node.items()))
+            )
+        elif isinstance(node, list):
+            stack.extend(
+                (path + (i,), item)
+                for i, item in reversed(list(enumerate(node)))
+            )
+        elif isinstance(node, (int, float)) and not isinstance(node, bool):
+            try:
+                values.append(node)
+            except OverflowError:
+                logger.warning(
+                    f"Skipping '{get_key_path(path)}': "
+                    "the number is too large for a float"
+                )
+                continue
+            key_paths.append(get_key_path(path))
+
+    if np is not None:
+        return NumericFields(tuple(key_paths), np.frombuffer(values))
+    return NumericFields(tuple(key_paths), values)
+
+
+def align_numeric_fields(
+    fields_0: NumericFields, fields_1: NumericFields
+) -> Tuple[Tuple[str, ...], Sequence[float], Sequence[float], List[str]]:
+    """Function that lines up the fields both sides have in common
+
+    Args:
+        fields_0 (NumericFields): Fields of the archived content
+        fields_1 (NumericFields): Fields of the current content
+
+    Returns:
+        Tuple[Tuple[str, ...], Sequence[float], Sequence[float], List[str]]:
+            Common key paths, their values on either side, and the key
+            paths found on one side only
+    """
+    if fields_0.key_paths == fields_1.key_paths:
+        return fields_0.key_paths, fields_0.values, fields_1.values, []
+
+    indices_0 = fields_0.get_indices()
+    indices_1 = fields_1.get_indices()
+    key_paths = tuple(k for k in fields_1.key_paths if k in indices_0)
+    unmatched = [k for k in fields_0.key_paths if k not in indices_1] + [
+        k for k in fields_1.key_paths if k not in indices_0
+    ]
+    return (
+        key_paths,
+        fields_0.take([indices_0[k] for k in key_paths]),
+        fields_1.take([indices_1[k] for k in key_paths]),
+        unmatched,
+    )
+
+
+def find_crossed_indices(
+    values_0: Sequence[float],
+    values_1: Sequence[float],
+    abs_threshold: Optional[float] = None,
+    rel_threshold: Optional[float] = None,
+) -> List[int]:
+    """Function that finds the fields whose change crossed a threshold, in a
+    single vectorized pass when NumPy is installed
+
+    A field crosses when its absolute change exceeds `abs_threshold`, or
+    its change relative to the archived value exceeds `rel_threshold`.
+    Without thresholds any change crosses.
+
+    Args:
+        values_0 (Sequence[float]): Archived values
+        values_1 (Sequence[float]): Current values
+        abs_threshold (Optional[float], optional):
+            Absolute change to exceed. Defaults to None.
+        rel_threshold (Optional[float], optional):
+            Relative change to exceed, e.g. 0.01 for 1%. Defaults to None.
+
+    Returns:
+        List[int]: Indices of the crossed fields
+    """
+    if abs_threshold is None and rel_threshold is None:
+        abs_threshold = 0
+
+    if np is not None:
+        changes = np.abs(values_1 - values_0)
+        crossed = np.zeros(len(changes), dtype=bool)
+        if abs_threshold is not None:
+            crossed |= changes > abs_threshold
+        if rel_threshold is not None:
+            crossed |= changes > rel_threshold * np.abs(values_0)
+        return np.flatnonzero(crossed).tolist()
+
+    return [
+        i
+        for i, (value_0, value_1) in enumerate(zip(values_0, values_1))
+        if (
+            abs_threshold is not None
+            and abs(value_1 - value_0) > abs_threshold
+        )
+        or (
+            rel_threshold is not None
+            and abs(value_1 - value_0) > rel_threshold * abs(value_0)
+        )
+    ]
+
+
+def apply_baselines(
+    key_paths: Tuple[str, ...],
+    values: Sequence[float],
+    baselines: Dict[str, float],
+) -> Sequence[float]:
+    """Function that replaces the values that have a baseline of their own,
+    e.g. the value last notified of
+
+    Args:
+        key_paths (Tuple[str, ...]): Key paths of the values
+        values (Sequence[float]): Values
+        baselines (Dict[str, float]): Baselines by key path
+
+    Returns:
+        Sequence[float]: Values with the baselines applied, in a new array
+    """
+    applied = values.copy() if np is not None else array("d", values)
+    if baselines:
+        for i, key_path in enumerate(key_paths):
+            if key_path in baselines:
+                applied[i] = baselines[key_path]
+    return applied
+
+
+def get_kept_baselines(
+    key_paths: Tuple[str, ...],
+    baselines: Sequence[float],
+    values: Sequence[float],
+    crossed: List[int],
+) -> Dict[str, float]:
+    """Function that gets the baselines to carry over: those of the fields
+    that changed without crossing a threshold
+
+    Args:
+        key_paths (Tuple[str, ...]): Key paths of the values
+        baselines (Sequence[float]): Baselines compared against
+        values (Sequence[float]): Current values
+        crossed (List[int]): Indices of the fields that crossed
+
+    Returns:
+        Dict[str, float]: Baselines by key path, where they differ from
+            the current value
+    """
+    if np is not None:
+        changed = np.flatnonzero(baselines != values).tolist()
+    else:
+        changed = [
+            i
+            for i, (baseline, value) in enumerate(zip(baselines, values))
+            if baseline != value
+        ]
+    crossed_set = set(crossed)
+    return {
+        key_paths[i]: float(baselines[i])
+        for i in changed
+        if i not in crossed_set
+    }
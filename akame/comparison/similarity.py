@@ -0,0 +1,106 @@
+import heapq
+import logging
+import re
+from hashlib import blake2b
+from typing import List, Set
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+WORD_PATTERN = re.compile(r"\w+")
+SIMHASH_BITS = 64
+
+
+def get_shingle_hashes(text: str, shingle_size: int = 3) -> Set[int]:
+    """Function that hashes the overlapping word shingles of the text
+
+    The hashes are stable across processes, so signatures can be cached.
+
+    Args:
+        text (str): Text to hash
+        shingle_size (int, optional): Words per shingle. Defaults to 3.
+
+    Returns:
+        Set[int]: 64-bit hashes of the distinct shingles
+    """
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < shingle_size:
+        shingles = {" ".join(words)} if words else set()
+    else:
+        shingles = {
+            " ".join(words[i : i + shingle_size])
+            for i in range(len(words) - shingle_size + 1)
+        }
+    return {
+        int.from_bytes(
+            blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for shingle in shingles
+    }
+
+
+def get_simhash(hashes: Set[int]) -> int:
+    """Function that folds the shingle hashes into a 64-bit SimHash
+
+    Args:
+        hashes (Set[int]): Shingle hashes
+
+    Returns:
+        int: SimHash, whose bits are set where most hashes have them set
+    """
+    if not hashes:
+        return 0
+    # counts the set bits of every position at once, column by column
+    columns = zip(*(format(h, f"0{SIMHASH_BITS}b") for h in hashes))
+    majority = len(hashes) / 2
+    bits = ("1" if column.count("1") > majority else "0" for column in columns)
+    return int("".join(bits), 2)
+
+
+def get_simhash_similarity(simhash_a: int, simhash_b: int) -> float:
+    """Function that compares two SimHashes
+
+    Args:
+        simhash_a (int): SimHash a
+        simhash_b (int): SimHash b
+
+    Returns:
+        float: Share of equal bits, from 0 to 1
+    """
+    distance = bin(simhash_a ^ simhash_b).count("1")
+    return 1 - distance / SIMHASH_BITS
+
+
+def get_minhash(hashes: Set[int], num_hashes: int = 128) -> List[int]:
+    """Function that sketches the shingle hashes as a bottom-k MinHash
+
+    Args:
+        hashes (Set[int]): Shingle hashes
+        num_hashes (int, optional): Smallest hashes to keep.
+            Defaults to 128.
+
+    Returns:
+        List[int]: Smallest hashes, in ascending order
+    """
+    return heapq.nsmallest(num_hashes, hashes)
+
+
+def get_minhash_similarity(
+    minhash_a: List[int], minhash_b: List[int]
+) -> float:
+    """Function that estimates the Jaccard similarity of two MinHashes
+
+    Args:
+        minhash_a (List[int]): Bottom-k MinHash a
+        minhash_b (List[int]): Bottom-k MinHash b
+
+    Returns:
+        float: Estimated Jaccard similarity, from 0 to 1
+    """
+    if not minhash_a and not minhash_b:
+        return 1.0
+
+    num_hashes = max(len(minhash_a), len(minhash_b))
+    union = heapq.nsmallest(num_hashes, set(minhash_a) | set(minhash_b))
+    shared = set(minhash_a) & set(minhash_b)
+    return sum(1 for h in union if h in shared) / len(union)
@@ -1,7 +1,9 @@
 import logging
-from typing import Type
+from typing import Any, Dict, Hashable, List, Sequence, Type
 
 from akame.extraction.core import StaticExtractor, URLManagerBase
+from akame.extraction.parser import convert_json_to_dict
+from akame.extraction.selectors import compile_selector, load_lxml
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -13,5 +15,83 @@ class URLManager(URLManagerBase):
 
 
 class BasicExtractor(StaticExtractor):
-    def __init__(self, url_manager: Type[URLManagerBase] = URLManager) -> None:
-        super().__init__(url_manager)
+    def __init__(
+        self,
+        url_manager: Type[URLManagerBase] = URLManager,
+        conditional_request: bool = False,
+        stream_digest: bool = False,
+    ) -> None:
+        super().__init__(
+            url_manager,
+            conditional_request=conditional_request,
+            stream_digest=stream_digest,
+        )
+
+
+class SelectorExtractor(StaticExtractor):
+    """Class that extracts only the fragments targeted by selectors
+
+    Args:
+        selectors (Sequence[str]): JSONPath (e.g. '$.rates.TWD'),
+            XPath (e.g. '//b[@class="price"]') or CSS selectors,
+            compiled once upon initialization
+        url_manager (Type[URLManagerBase], optional):
+            URL Manager to parse the URL. Defaults to URLManager.
+        conditional_request (bool, optional):
+            Whether to send conditional requests. Defaults to False.
+        stream_digest (bool, optional):
+            Whether to skip unchanged bodies by digest. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        selectors: Sequence[str],
+        url_manager: Type[URLManagerBase] = URLManager,
+        conditional_request: bool = False,
+        stream_digest: bool = False,
+    ) -> None:
+        super().__init__(
+            url_manager,
+            conditional_request=conditional_request,
+            stream_digest=stream_digest,
+        )
+        self.selectors = [compile_selector(selector) for selector in selectors]
+
+    def get_request_key(self) -> Hashable:
+        # extractors with other selectors parse the same response apart
+        return super().get_request_key() + (
+            tuple(
+                (type(selector).__name__, selector.expression)
+                for selector in self.selectors
+            ),
+        )
+
+    def parse_document(self, text: str, document_type: str) -> Any:
+        """Function that parses the response text for a selector type
+
+        Args:
+            text (str): Response text
+            document_type (str): 'json' or 'html'
+
+        Returns:
+            Any: Parsed document
+        """
+        if document_type == "json":
+            return convert_json_to_dict(text)
+
+        return load_lxml("lxml.html").fromstring(text)
+
+    def get_parsed_content(self, response: Any) -> Dict[str, List[Any]]:
+        text = response.text
+        documents: Dict[str, Any] = {}
+        content: Dict[str, List[Any]] = {}
+
+        for selector in self.selectors:
+            if selector.document_type not in documents:
+                documents[selector.document_type] = self.parse_document(
+                    text, selector.document_type
+                )
+            document = documents[selector.document_type]
+            content[selector.expression] = selector.select(document)
+
+        return content
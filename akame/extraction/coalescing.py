@@ -0,0 +1,114 @@
+import logging
+import time
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class Flight:
+    """Class that holds the outcome of an in-flight call for its waiters"""
+
+    def __init__(self) -> None:
+        self.event = Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Class that shares one call among identical concurrent requests
+
+    Callers with the same key wait for the call already in flight instead
+    of starting their own, and reuse its result while it is still fresh.
+
+    Args:
+        freshness_seconds (float, optional):
+            Seconds a finished result stays reusable. Defaults to 5.
+    """
+
+    def __init__(self, freshness_seconds: float = 5) -> None:
+        self.freshness_seconds = freshness_seconds
+
+        self.flights: Dict[Hashable, Flight] = {}
+        self.results: Dict[Hashable, Tuple[float, Any]] = {}
+        self.stats = {"calls": 0, "shared": 0, "fresh": 0}
+        self.last_purged = time.monotonic()
+        self.lock = Lock()
+
+    def purge_stale_results(self, now: float) -> None:
+        """Function that drops results past the freshness window
+
+        Args:
+            now (float): Current monotonic time
+        """
+        if now - self.last_purged < self.freshness_seconds:
+            return
+
+        self.results = {
+            key: (finished, value)
+            for key, (finished, value) in self.results.items()
+            if now - finished < self.freshness_seconds
+        }
+        self.last_purged = now
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """Function that calls the function once for all identical keys
+
+        Args:
+            key (Hashable): Identity of the call
+            function (Callable[[], Any]): Function to call
+
+        Returns:
+            Any: Result of the shared call
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.purge_stale_results(now)
+
+            if key in self.results:
+                finished, value = self.results[key]
+                if now - finished < self.freshness_seconds:
+                    self.stats["fresh"] += 1
+                    return value
+
+            flight = self.flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = self.flights[key] = Flight()
+                self.stats["calls"] += 1
+            else:
+                self.stats["shared"] += 1
+
+        if not is_leader:
+            flight.event.wait()
+            if flight.error:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = function()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.flights[key]
+                if flight.error is None and self.freshness_seconds > 0:
+                    self.results[key] = (time.monotonic(), flight.value)
+            flight.event.set()
+
+        return flight.value
+
+    def get_stats(self) -> Dict[str, int]:
+        """Function that returns how many calls were made and shared
+
+        Returns:
+            Dict[str, int]: Calls made, joined in flight and served fresh
+        """
+        with self.lock:
+            return dict(self.stats)
+
+
+# shared by all extractors unless one is given explicitly
+single_flight = SingleFlight()
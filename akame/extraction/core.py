@@ -1,8 +1,15 @@
 import logging
-from typing import Any, Type
+from copy import deepcopy
+from hashlib import sha1
+from typing import Any, Dict, Hashable, Optional, Tuple, Type
 
 import requests
 
+from akame.extraction.coalescing import SingleFlight, single_flight
+from akame.extraction.session import SessionPool, session_pool
+from akame.extraction.throttling import HostRateLimiter, rate_limiter
+from akame.utility.tasking import run_in_executor
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -51,10 +58,35 @@ class ExtractorBase:
             URL Manager to parse the URL. Defaults to URLManagerBase.
     """
 
+    conditional_request: bool = False
+    stream_digest: bool = False
+
     def __init__(
         self, url_manager: Type[URLManagerBase] = URLManagerBase
     ) -> None:
         self.urls = url_manager()
+        self.cached_validators: Dict[str, str] = {}
+        self.validators: Dict[str, str] = {}
+        self.not_modified: bool = False
+
+    def load_cached_validators(
+        self, validators: Optional[Dict[str, str]]
+    ) -> None:
+        """Function that loads validators of the cached content
+
+        Args:
+            validators (Optional[Dict[str, str]]):
+                Validators stored with the newest cached content
+        """
+        self.cached_validators = dict(validators) if validators else {}
+
+    def check_uses_cached_validators(self) -> bool:
+        """Function that checks whether extraction needs cached validators
+
+        Returns:
+            bool: Whether to load validators before extracting
+        """
+        return self.conditional_request or self.stream_digest
 
     def update_target_url(self, target_url: str) -> None:
         """Function that parses and loads all core URLs in URL Manager
@@ -86,6 +118,20 @@ class ExtractorBase:
 
         return content
 
+    async def main_async(self, target_url: str) -> Any:
+        """Function that extracts the content without blocking the event loop
+
+        Blocking extractors run in the loop's executor, so every extraction
+        set works with the asynchronous monitor as is.
+
+        Args:
+            target_url (str): Target URL
+
+        Returns:
+            Any: Fetched content
+        """
+        return await run_in_executor(self.main, target_url=target_url)
+
 
 class StaticExtractor(ExtractorBase):
     """Class that defines the content extractor for static content
@@ -93,16 +139,53 @@ class StaticExtractor(ExtractorBase):
     Args:
         url_manager (Type[URLManagerBase], optional):
             URL Manager to parse the URL. Defaults to URLManagerBase.
+        session_pool (SessionPool, optional):
+            Pool of keep-alive sessions to request through.
+            Defaults to session_pool, which is shared by all extractors.
+        conditional_request (bool, optional):
+            Whether to send the cached validators (If-None-Match and
+            If-Modified-Since) and skip the round on 304 Not Modified.
+            Defaults to False.
+        rate_limiter (HostRateLimiter, optional):
+            Per-host limiter to wait on before each request.
+            Defaults to rate_limiter, which is shared by all extractors.
+        single_flight (SingleFlight, optional):
+            Layer that lets identical requests share one fetch.
+            Defaults to single_flight, which is shared by all extractors.
+        stream_digest (bool, optional):
+            Whether to hash the body chunk by chunk, without keeping it,
+            and skip the round when it matches the cached digest. A body
+            that differs is requested again in full. Defaults to False.
+        chunk_size (int, optional):
+            Bytes per streamed chunk. Defaults to 65536.
     """
 
+    request_method: str = "GET"
+
     def __init__(
-        self, url_manager: Type[URLManagerBase] = URLManagerBase
+        self,
+        url_manager: Type[URLManagerBase] = URLManagerBase,
+        session_pool: SessionPool = session_pool,
+        conditional_request: bool = False,
+        rate_limiter: HostRateLimiter = rate_limiter,
+        single_flight: SingleFlight = single_flight,
+        stream_digest: bool = False,
+        chunk_size: int = 65536,
     ) -> None:
         super().__init__(url_manager)
+        self.session_pool = session_pool
+        self.conditional_request = conditional_request
+        self.rate_limiter = rate_limiter
+        self.single_flight = single_flight
+        self.stream_digest = stream_digest
+        self.chunk_size = chunk_size
+        self.stream_response = False
+        self.request_data: Any = None
 
     def load_request(self):
         self.load_request_headers()
         self.load_request_data()
+        self.load_conditional_headers()
 
     def load_request_headers(self) -> None:
         """Function that loads headers to use in the HTTPS request"""
@@ -119,14 +202,162 @@ class StaticExtractor(ExtractorBase):
         """Function that loads data to use in the HTTPS request"""
         pass
 
+    def load_conditional_headers(self) -> None:
+        """Function that adds the cached validators to the request headers"""
+        if not self.conditional_request:
+            return
+
+        if self.cached_validators.get("etag"):
+            self.request_headers["If-None-Match"] = self.cached_validators[
+                "etag"
+            ]
+        if self.cached_validators.get("last_modified"):
+            self.request_headers[
+                "If-Modified-Since"
+            ] = self.cached_validators["last_modified"]
+
+    def load_response_validators(self, response: requests.Response) -> None:
+        """Function that loads validators and 304 status from the response
+
+        Args:
+            response (requests.Response): Response of the request
+        """
+        self.not_modified = (
+            self.conditional_request and response.status_code == 304
+        )
+
+        if self.not_modified:
+            self.validators = dict(self.cached_validators)
+        else:
+            self.validators = {}
+        if response.headers.get("ETag"):
+            self.validators["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            self.validators["last_modified"] = response.headers[
+                "Last-Modified"
+            ]
+
+    def get_session(self) -> requests.Session:
+        """Function that returns the pooled session for the URL to request"""
+        return self.session_pool.get_session(self.urls.url_to_request)
+
     def get_response(self) -> requests.Response:
-        return requests.get(
-            self.urls.url_to_request, headers=self.request_headers
+        return self.get_session().get(
+            self.urls.url_to_request,
+            headers=self.request_headers,
+            stream=self.stream_response,
         )
 
+    def get_throttled_response(self) -> requests.Response:
+        """Function that requests within the host's rate limit, retrying
+        when the host asks to back off
+
+        Returns:
+            requests.Response: Response of the request
+        """
+        url_to_request = self.urls.url_to_request
+        for _ in range(self.rate_limiter.max_retries + 1):
+            self.rate_limiter.wait(url_to_request)
+            response = self.get_response()
+            if not self.rate_limiter.handle_response(url_to_request, response):
+                break
+            # releases the connection of a streamed response
+            response.close()
+
+        return response
+
+    def check_streams_response(self) -> bool:
+        """Function that checks whether to stream the body, which pays off
+        only when there is a cached digest to compare it with
+
+        Returns:
+            bool: Whether to request the body as a stream
+        """
+        return self.stream_digest and bool(
+            self.cached_validators.get("digest")
+        )
+
+    def load_streamed_body(
+        self, response: requests.Response
+    ) -> requests.Response:
+        """Function that hashes the body as it streams in, without keeping
+        it, and requests it again in full only if the digest differs from
+        the cached one
+
+        Args:
+            response (requests.Response): Streamed response of the request
+
+        Returns:
+            requests.Response: Response to parse the body of
+        """
+        digest = sha1()
+        with response:
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                digest.update(chunk)
+
+        self.validators["digest"] = digest.hexdigest()
+        if self.validators["digest"] == self.cached_validators["digest"]:
+            self.not_modified = True
+            return response
+
+        logger.info(
+            f"Requesting '{self.urls.url_to_request}' in full: "
+            "its digest changed"
+        )
+        self.stream_response = False
+        response = self.get_throttled_response()
+        self.load_response_validators(response)
+        self.load_body_digest(response)
+        return response
+
+    def load_body_digest(self, response: requests.Response) -> None:
+        if not self.not_modified:
+            self.validators["digest"] = sha1(response.content).hexdigest()
+
     def get_parsed_content(self, response: Any) -> Any:
         return response.text
 
+    def get_request_key(self) -> Hashable:
+        """Function that identifies the request and how it is parsed, so
+        identical requests can share one fetch. Extractors that parse by
+        their own settings (e.g. selectors) add those to the key
+
+        Returns:
+            Hashable: Key of the request
+        """
+        return (
+            f"{self.__class__.__module__}.{self.__class__.__qualname__}",
+            self.request_method,
+            self.urls.url_to_request,
+            repr(self.request_data),
+            tuple(sorted(self.request_headers.items())),
+            tuple(sorted(self.cached_validators.items())),
+        )
+
+    def fetch_content(self) -> Tuple[Any, Dict[str, str], bool]:
+        """Function that requests and parses the content
+
+        Returns:
+            Tuple[Any, Dict[str, str], bool]:
+                Parsed content, validators and whether it was not modified
+        """
+        self.stream_response = self.check_streams_response()
+        response = self.get_throttled_response()
+        self.load_response_validators(response)
+
+        if self.stream_response and not self.not_modified:
+            response = self.load_streamed_body(response)
+        elif self.stream_response:
+            response.close()
+        elif self.stream_digest:
+            self.load_body_digest(response)
+
+        if self.not_modified:
+            return None, self.validators, True
+
+        content = self.get_parsed_content(response)
+        return content, self.validators, False
+
     def main(self, target_url: str) -> Any:
         """Function that extracts the content from the target URL
 
@@ -134,14 +365,24 @@ class StaticExtractor(ExtractorBase):
             target_url (str): Target URL
 
         Returns:
-            Any: Fetched content
+            Any: Fetched content; None if the content was not modified
         """
         self.update_target_url(target_url=target_url)
         self.load_request()
-        response = self.get_response()
-        content = self.get_parsed_content(response)
+        content, validators, not_modified = self.single_flight.do(
+            self.get_request_key(), self.fetch_content
+        )
+        self.validators = dict(validators)
+        self.not_modified = not_modified
 
-        return content
+        if self.not_modified:
+            logger.info(f"Skipping parsing: '{target_url}' was not modified")
+            return None
+
+        # the parsed content is shared with other callers of the same key
+        if isinstance(content, (str, bytes)):
+            return content
+        return deepcopy(content)
 
 
 class DynamicExtractor(ExtractorBase):
@@ -1,4 +1,35 @@
 import json
+import logging
+import re
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# single-character classes only, so scanning never backtracks
+STRUCTURAL_CHARACTERS = re.compile(r'[\[\]{}"\\]')
+STRING_CHARACTERS = re.compile(r'["\\]')
+SCALAR_TERMINATORS = re.compile(r"[,\])}\s]")
+WHITESPACE = " \t\n\r"
+
+
+def load_json_backend() -> Tuple[str, Callable[[str], Any]]:
+    """Function that loads the fastest installed JSON backend
+
+    Returns:
+        Tuple[str, Callable[[str], Any]]: Name and `loads` of the backend;
+            orjson or ujson when installed, json otherwise
+    """
+    for name in ("orjson", "ujson"):
+        try:
+            return name, import_module(name).loads
+        except ImportError:
+            continue
+    return "json", json.loads
+
+
+json_backend, loads_json = load_json_backend()
 
 
 def convert_json_to_dict(text: str):
@@ -10,7 +41,249 @@ def convert_json_to_dict(text: str):
     Returns:
         str: processed text
     """
-    return json.loads(text)
+    return loads_json(text)
+
+
+def skip_whitespace(text: str, start: int) -> int:
+    while start < len(text) and text[start] in WHITESPACE:
+        start += 1
+    return start
+
+
+def find_string_end(text: str, start: int) -> Optional[int]:
+    """Function that finds the end of the JSON string opened at `start`
+
+    Args:
+        text (str): text to scan
+        start (int): position of the opening quote
+
+    Returns:
+        Optional[int]: position after the closing quote;
+            None if the string is incomplete
+    """
+    position = start + 1
+    while True:
+        matched = STRING_CHARACTERS.search(text, position)
+        if not matched:
+            return None
+        if matched.group() == "\\":
+            position = matched.end() + 1
+            continue
+        return matched.end()
+
+
+def find_json_end(text: str, start: int) -> Optional[int]:
+    """Function that finds the end of the JSON value starting at `start`
+    without parsing it
+
+    Args:
+        text (str): text to scan
+        start (int): position of the first character of the value
+
+    Returns:
+        Optional[int]: position after the value;
+            None if the value is incomplete
+    """
+    if text[start] == '"':
+        return find_string_end(text, start)
+
+    if text[start] not in "[{":
+        matched = SCALAR_TERMINATORS.search(text, start)
+        return matched.start() if matched else None
+
+    depth = 0
+    position = start
+    while True:
+        matched = STRUCTURAL_CHARACTERS.search(text, position)
+        if not matched:
+            return None
+
+        character = matched.group()
+        if character == '"':
+            end = find_string_end(text, matched.start())
+            if end is None:
+                return None
+            position = end
+            continue
+
+        depth += 1 if character in "[{" else -1
+        position = matched.end()
+        if depth == 0:
+            return position
+
+
+def strip_jsonp(text: str, callback: Optional[str] = None) -> str:
+    """Function that strips the JSONP callback around a JSON payload
+
+    Args:
+        text (str): text to be processed, e.g. 'try{cb([...]);}catch(e){}'
+        callback (Optional[str], optional): name of the callback.
+            Defaults to None; the first call in the text is used.
+
+    Returns:
+        str: JSON argument of the callback
+    """
+    if callback:
+        start = text.index(callback + "(") + len(callback) + 1
+    else:
+        start = text.index("(") + 1
+        name_start = start - 1
+        while name_start > 0 and (
+            text[name_start - 1].isalnum() or text[name_start - 1] in "_$."
+        ):
+            name_start -= 1
+        if name_start == start - 1:
+            raise ValueError("Missing JSONP callback")
+
+    start = skip_whitespace(text, start)
+    end = find_json_end(text, start)
+    if end is None:
+        raise ValueError("Unterminated JSONP payload")
+
+    return text[start:end]
+
+
+def convert_jsonp_to_object(text: str, callback: Optional[str] = None) -> Any:
+    """Function that converts the JSON wrapped in a JSONP callback
+
+    Args:
+        text (str): text to be processed, e.g. 'try{cb([...]);}catch(e){}'
+        callback (Optional[str], optional): name of the callback.
+            Defaults to None; the first call in the text is used.
+
+    Returns:
+        Any: parsed JSON argument of the callback
+    """
+    return loads_json(strip_jsonp(text, callback))
+
+
+class PartialJSONObject:
+    """Class that extracts top-level keys of a JSON object as text arrives,
+    without parsing the values of other keys
+
+    Args:
+        keys (Sequence[str]): keys to extract
+    """
+
+    def __init__(self, keys: Sequence[str]) -> None:
+        self.keys = set(keys)
+        self.found: Dict[str, Any] = {}
+        self.text = ""
+        self.position = 0
+        self.opened = False
+        self.closed = False
+
+    @property
+    def done(self) -> bool:
+        return self.closed or self.keys.issubset(self.found)
+
+    def feed(self, chunk: str, final: bool = False) -> bool:
+        """Function that scans the text received so far
+
+        Args:
+            chunk (str): next piece of the text
+            final (bool, optional): whether no more text will arrive.
+                Defaults to False.
+
+        Returns:
+            bool: whether all keys were found or the object was closed
+        """
+        self.text += chunk
+        while not self.done and self.scan_member(final):
+            pass
+
+        if final and not self.done:
+            raise ValueError("Incomplete JSON object")
+        return self.done
+
+    def scan_member(self, final: bool) -> bool:
+        """Function that scans the next member of the object
+
+        Args:
+            final (bool): whether no more text will arrive
+
+        Returns:
+            bool: whether a member (or the object start or end) was scanned
+        """
+        text = self.text
+        position = skip_whitespace(text, self.position)
+        if position >= len(text):
+            return False
+
+        if not self.opened:
+            if text[position] != "{":
+                raise ValueError("Expected a JSON object")
+            self.opened = True
+            self.position = position + 1
+            return True
+
+        if text[position] in ",}":
+            self.closed = text[position] == "}"
+            self.position = position + 1
+            return True
+
+        key_end = find_string_end(text, position)
+        if key_end is None:
+            return False
+        value_start = skip_whitespace(text, key_end)
+        if value_start >= len(text):
+            return False
+        if text[value_start] != ":":
+            raise ValueError(f"Expected ':' at {value_start}")
+        value_start = skip_whitespace(text, value_start + 1)
+        if value_start >= len(text):
+            return False
+
+        value_end = find_json_end(text, value_start)
+        if value_end is None:
+            if not final:
+                return False
+            value_end = len(text)
+
+        key = json.loads(text[position:key_end])
+        if key in self.keys:
+            self.found[key] = loads_json(text[value_start:value_end])
+        self.position = value_end
+        return True
+
+
+def extract_json_keys(text: str, keys: Sequence[str]) -> Dict[str, Any]:
+    """Function that extracts top-level keys of a JSON object, stopping
+    once all of them are found
+
+    Args:
+        text (str): text to be processed
+        keys (Sequence[str]): keys to extract
+
+    Returns:
+        Dict[str, Any]: found keys and their parsed values
+    """
+    partial = PartialJSONObject(keys)
+    partial.feed(text, final=True)
+    return partial.found
+
+
+def extract_json_keys_from_chunks(
+    chunks: Iterable[str], keys: Sequence[str]
+) -> Dict[str, Any]:
+    """Function that extracts top-level keys of a streamed JSON object,
+    stopping the stream once all of them are found
+
+    Args:
+        chunks (Iterable[str]): decoded pieces of the text,
+            e.g. `response.iter_content(decode_unicode=True)`
+        keys (Sequence[str]): keys to extract
+
+    Returns:
+        Dict[str, Any]: found keys and their parsed values
+    """
+    partial = PartialJSONObject(keys)
+    for chunk in chunks:
+        if partial.feed(chunk):
+            return partial.found
+
+    partial.feed("", final=True)
+    return partial.found
 
 
 class JSONString:
@@ -0,0 +1,256 @@
+import logging
+from importlib import import_module
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JSONPathStep = Tuple[str, Union[str, int, None]]
+
+
+class SelectorBase:
+    """Class that defines the base selector, compiled once on construction
+
+    Args:
+        expression (str): Selector expression
+    """
+
+    document_type: str = ""
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.compile()
+
+    def compile(self) -> None:
+        pass
+
+    def select(self, document: Any) -> List[Any]:
+        """Function that selects the targeted fragments of the document
+
+        Args:
+            document (Any): Parsed document
+
+        Returns:
+            List[Any]: Selected fragments
+        """
+        return []
+
+
+def parse_jsonpath(expression: str) -> List[JSONPathStep]:
+    """Function that parses a JSONPath expression into steps
+
+    Supports child keys (`.key`, `['key']`), indices (`[0]`),
+    wildcards (`.*`, `[*]`) and recursive descent (`..key`).
+
+    Args:
+        expression (str): JSONPath expression, e.g. '$.rates.TWD'
+
+    Returns:
+        List[JSONPathStep]: Steps of (kind, argument)
+    """
+    if not expression.startswith("$"):
+        raise ValueError(f"JSONPath must start with '$': '{expression}'")
+
+    steps: List[JSONPathStep] = []
+    i, n = 1, len(expression)
+    while i < n:
+        if expression.startswith("..", i):
+            i += 2
+            kind = "descend"
+        elif expression[i] == ".":
+            i += 1
+            kind = "key"
+        elif expression[i] == "[":
+            end = expression.find("]", i)
+            if end < 0:
+                raise ValueError(f"Unclosed '[' in JSONPath: '{expression}'")
+            token = expression[i + 1 : end].strip()
+            i = end + 1
+            if token == "*":
+                steps.append(("wildcard", None))
+            elif token[:1] in ("'", '"') and token[-1:] == token[:1]:
+                steps.append(("key", token[1:-1]))
+            else:
+                steps.append(("index", int(token)))
+            continue
+        else:
+            raise ValueError(
+                f"Unexpected '{expression[i]}' at {i} in JSONPath: "
+                f"'{expression}'"
+            )
+
+        start = i
+        while i < n and expression[i] not in ".[":
+            i += 1
+        name = expression[start:i]
+        if not name and kind == "key":
+            raise ValueError(f"Empty key in JSONPath: '{expression}'")
+        if kind == "descend":
+            steps.append(("descend", name if name and name != "*" else None))
+        elif name == "*":
+            steps.append(("wildcard", None))
+        else:
+            steps.append(("key", name))
+
+    return steps
+
+
+def iterate_children(node: Any) -> Iterator[Any]:
+    if isinstance(node, dict):
+        yield from node.values()
+    elif isinstance(node, list):
+        yield from node
+
+
+def iterate_descendants(node: Any) -> Iterator[Any]:
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(list(iterate_children(current))))
+
+
+class JSONPathSelector(SelectorBase):
+    """Class that selects values from parsed JSON with a JSONPath
+
+    Args:
+        expression (str): JSONPath expression, e.g. '$.rates.TWD'
+    """
+
+    document_type = "json"
+
+    def compile(self) -> None:
+        self.steps = parse_jsonpath(self.expression)
+
+    def select(self, document: Any) -> List[Any]:
+        nodes = [document]
+        for kind, argument in self.steps:
+            selected = []
+            for node in nodes:
+                if kind == "key":
+                    if isinstance(node, dict) and argument in node:
+                        selected.append(node[argument])
+                elif kind == "index":
+                    if isinstance(node, list) and -len(node) <= argument < len(
+                        node
+                    ):
+                        selected.append(node[argument])
+                elif kind == "wildcard":
+                    selected.extend(iterate_children(node))
+                elif kind == "descend":
+                    for descendant in iterate_descendants(node):
+                        if argument is None:
+                            selected.extend(iterate_children(descendant))
+                        elif (
+                            isinstance(descendant, dict)
+                            and argument in descendant
+                        ):
+                            selected.append(descendant[argument])
+            nodes = selected
+
+        return nodes
+
+
+def load_lxml(module_name: str) -> Any:
+    """Function that loads the lxml module HTML selectors need
+
+    Args:
+        module_name (str): Module to load, e.g. 'lxml.etree'
+
+    Returns:
+        Any: Loaded module
+
+    Raises:
+        ImportError: If lxml (or cssselect, for CSS selectors) is not
+            installed
+    """
+    try:
+        return import_module(module_name)
+    except ImportError as e:
+        raise ImportError(
+            f"lxml is needed for XPath and CSS selectors: '{module_name}' "
+            "could not be imported; install lxml (and cssselect for CSS)"
+        ) from e
+
+
+def get_node_text(node: Any) -> Any:
+    """Function that converts a selected HTML node into text
+
+    Args:
+        node (Any): Element, attribute value or XPath result
+
+    Returns:
+        Any: Text of the element; other results as is
+    """
+    if hasattr(node, "itertext"):
+        return " ".join(" ".join(node.itertext()).split())
+    return str(node) if isinstance(node, str) else node
+
+
+class XPathSelector(SelectorBase):
+    """Class that selects fragments from parsed HTML with an XPath
+
+    Args:
+        expression (str): XPath expression, e.g. '//span[@class="price"]'
+    """
+
+    document_type = "html"
+
+    def compile(self) -> None:
+        self.xpath = load_lxml("lxml.etree").XPath(self.expression)
+
+    def select(self, document: Any) -> List[Any]:
+        results = self.xpath(document)
+        if not isinstance(results, list):
+            results = [results]
+        return [get_node_text(result) for result in results]
+
+
+class CSSSelector(SelectorBase):
+    """Class that selects fragments from parsed HTML with a CSS selector
+
+    Args:
+        expression (str): CSS selector, e.g. 'ul.price > li > b'
+    """
+
+    document_type = "html"
+
+    def compile(self) -> None:
+        self.css = load_lxml("lxml.cssselect").CSSSelector(self.expression)
+
+    def select(self, document: Any) -> List[Any]:
+        return [get_node_text(element) for element in self.css(document)]
+
+
+def compile_selector(
+    expression: str, selector_type: Optional[str] = None
+) -> SelectorBase:
+    """Function that compiles a selector expression
+
+    Args:
+        expression (str): Selector expression
+        selector_type (Optional[str], optional):
+            'jsonpath', 'xpath' or 'css'. Defaults to None; the type is
+            derived from the expression ('$' for JSONPath, '/' or '(' for
+            XPath, CSS otherwise).
+
+    Returns:
+        SelectorBase: Compiled selector
+    """
+    if selector_type is None:
+        if expression.startswith("$"):
+            selector_type = "jsonpath"
+        elif expression.startswith(("/", "(", "./")):
+            selector_type = "xpath"
+        else:
+            selector_type = "css"
+
+    selector_classes = {
+        "jsonpath": JSONPathSelector,
+        "xpath": XPathSelector,
+        "css": CSSSelector,
+    }
+    if selector_type not in selector_classes:
+        raise ValueError(f"Unknown selector type: '{selector_type}'")
+
+    return selector_classes[selector_type](expression)
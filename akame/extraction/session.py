@@ -0,0 +1,139 @@
+import logging
+import time
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def get_url_host(url: str) -> str:
+    """Function that gets the pooling key of the URL
+
+    Args:
+        url (str): URL to request
+
+    Returns:
+        str: Scheme and host of the URL, e.g. 'https://inline.app'
+    """
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+
+class SessionPool:
+    """Class that shares keep-alive HTTP sessions across extractors
+
+    Sessions are created once per host and reused by all extractors so that
+    steady-state polling runs on warm connections instead of a fresh TCP and
+    TLS handshake per round. The sessions keep no cookies, so extractors
+    sharing them stay as stateless as separate requests.
+
+    Args:
+        max_connections_per_host (int, optional):
+            Maximum number of pooled connections kept for each host.
+            Defaults to 10.
+        idle_seconds (float, optional):
+            Seconds after which an unused host session is closed.
+            Defaults to 900.
+        block_when_full (bool, optional):
+            Whether to wait for a free connection instead of opening
+            an extra one once the host limit is reached. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: int = 10,
+        idle_seconds: float = 900,
+        block_when_full: bool = False,
+    ) -> None:
+        self.max_connections_per_host = max(int(max_connections_per_host), 1)
+        self.idle_seconds = idle_seconds
+        self.block_when_full = block_when_full
+
+        self.sessions: Dict[str, Tuple[requests.Session, float]] = {}
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.lock = Lock()
+
+    def create_session(self) -> requests.Session:
+        """Function that creates a session with a bounded connection pool
+        that blocks all cookies
+
+        Returns:
+            requests.Session: New session
+        """
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_connections_per_host,
+            pool_block=self.block_when_full,
+        )
+        session = requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def evict_idle_sessions(self, now: float) -> None:
+        """Function that closes sessions unused for over `idle_seconds`
+
+        Args:
+            now (float): Current monotonic time
+        """
+        hosts_idle = [
+            host
+            for host, (_, last_used) in self.sessions.items()
+            if now - last_used > self.idle_seconds
+        ]
+        for host in hosts_idle:
+            session, _ = self.sessions.pop(host)
+            session.close()
+            self.stats["evictions"] += 1
+            logger.info(f"Closed idle session for '{host}'")
+
+    def get_session(self, url: str) -> requests.Session:
+        """Function that returns the pooled session for the URL's host
+
+        Args:
+            url (str): URL to request
+
+        Returns:
+            requests.Session: Session bound to the host
+        """
+        host = get_url_host(url)
+        now = time.monotonic()
+
+        with self.lock:
+            self.evict_idle_sessions(now)
+            if host in self.sessions:
+                session, _ = self.sessions[host]
+                self.stats["hits"] += 1
+            else:
+                session = self.create_session()
+                self.stats["misses"] += 1
+            self.sessions[host] = (session, now)
+
+        return session
+
+    def get_stats(self) -> Dict[str, int]:
+        """Function that returns the pool hit/miss stats
+
+        Returns:
+            Dict[str, int]: Hits, misses, evictions and open sessions
+        """
+        with self.lock:
+            return dict(self.stats, sessions=len(self.sessions))
+
+    def close(self) -> None:
+        """Function that closes all pooled sessions"""
+        with self.lock:
+            for session, _ in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+
+# shared by all extractors unless one is given explicitly
+session_pool = SessionPool()
@@ -37,6 +37,8 @@ class Extractor(StaticExtractor):
             URL Manager to parse the URL. Defaults to URLManager.
     """
 
+    request_method = "POST"
+
     def __init__(
         self,
         action: str,
@@ -67,8 +69,9 @@ class Extractor(StaticExtractor):
         }
 
     def get_response(self) -> requests.Response:
-        return requests.post(
+        return self.get_session().post(
             self.urls.url_to_request,
             headers=self.request_headers,
             data=self.request_data,
+            stream=self.stream_response,
         )
\ No newline at end of file
@@ -1,10 +1,9 @@
-import json
 import logging
 import re
-from json.decoder import JSONDecodeError
-from typing import Type
+from typing import Any, Dict, Type, Union
 
 from akame.extraction.core import StaticExtractor, URLManagerBase
+from akame.extraction.parser import extract_json_keys
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,27 +37,39 @@ class Extractor(StaticExtractor):
     Args:
         url_manager (Type[URLManagerBase], optional):
             URL Manager to parse the URL. Defaults to URLManager.
+        structured (bool, optional):
+            Whether to return the dates as a dictionary instead of a
+            report string. Defaults to False.
     """
 
-    def __init__(self, url_manager: Type[URLManagerBase] = URLManager) -> None:
+    def __init__(
+        self,
+        url_manager: Type[URLManagerBase] = URLManager,
+        structured: bool = False,
+    ) -> None:
         super().__init__(url_manager)
+        self.structured = structured
 
-    def get_parsed_content(self, response) -> str:
+    def get_parsed_content(self, response) -> Union[str, Dict[str, Any]]:
         response_text = response.text
-        report = ""
+        report: Union[str, Dict[str, Any]] = {} if self.structured else ""
 
         try:
-            response_dict = json.loads(response_text)
-            dates_open = response_dict["default"]
+            dates_open = extract_json_keys(response_text, ["default"])[
+                "default"
+            ]
             seats_open = {
                 date: seats for date, seats in dates_open.items() if seats
             }
-            report = (
-                f"Dates with open seats: '{seats_open}';\n"
-                f"Dates open: '{dates_open}';"
-            )
+            if self.structured:
+                report = {"seats_open": seats_open, "dates_open": dates_open}
+            else:
+                report = (
+                    f"Dates with open seats: '{seats_open}';\n"
+                    f"Dates open: '{dates_open}';"
+                )
 
-        except JSONDecodeError as e:
+        except ValueError as e:
             logger.error(e)
 
         except Exception as e:
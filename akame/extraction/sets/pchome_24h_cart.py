@@ -1,12 +1,112 @@
 import logging
 import re
-from typing import Type
+import time
+from threading import Lock
+from typing import Any, Dict, List, Sequence, Tuple, Type
 
-from akame.extraction.core import StaticExtractor, URLManagerBase
+from akame.extraction.coalescing import Flight
+from akame.extraction.core import (
+    ExtractionError,
+    ExtractorBase,
+    StaticExtractor,
+    URLManagerBase,
+)
+from akame.extraction.parser import (
+    convert_jsonp_to_object,
+    find_json_end,
+    loads_json,
+    skip_whitespace,
+)
+from akame.extraction.session import SessionPool, session_pool
+from akame.extraction.throttling import HostRateLimiter, rate_limiter
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+JSONP_CALLBACK = "jsonp_button"
+
+
+def get_url_to_request(product_ids: Sequence[str]) -> str:
+    """Function that gets the button API URL for one or more products
+
+    Args:
+        product_ids (Sequence[str]): Product IDs, e.g. ['DYAJ9A-A900B51S8']
+
+    Returns:
+        str: URL to request
+    """
+    return (
+        "https://ecapi.pchome.com.tw/ecshop/prodapi/v2/prod/"
+        f"button&id={','.join(product_ids)}"
+        "&fields=Seq,Id,Price,Qty,ButtonType,SaleStatus,isPrimeOnly,SpecialQty"
+        f"&_callback={JSONP_CALLBACK}&1611904320?_callback={JSONP_CALLBACK}"
+    )
+
+
+def get_request_headers(url_referrer: str) -> Dict[str, str]:
+    """Function that gets the headers to request the button API with
+
+    Args:
+        url_referrer (str): Referrer URL
+
+    Returns:
+        Dict[str, str]: Request headers
+    """
+    return {
+        "authority": "ecapi.pchome.com.tw",
+        "user-agent": (
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 11_1_0) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/88.0.4324.96 Safari/537.36"
+        ),
+        "accept": "*/*",
+        "sec-fetch-site": "same-site",
+        "sec-fetch-mode": "no-cors",
+        "sec-fetch-dest": "script",
+        "referer": url_referrer,
+        "accept-language": "en,zh-TW;q=0.9,zh-CN;q=0.8,zh;q=0.7,ja;q=0.6",
+    }
+
+
+def split_batch_response(
+    text: str,
+) -> Tuple[str, Dict[str, List[str]], str]:
+    """Function that splits a batch response into the JSON text of each
+    product's items, without reserializing them
+
+    Args:
+        text (str): Response text, e.g. 'try{jsonp_button([...]);}...'
+
+    Returns:
+        Tuple[str, Dict[str, List[str]], str]: Text before the item array,
+            item texts by product ID and text after the item array
+    """
+    position = skip_whitespace(
+        text, text.index(JSONP_CALLBACK + "(") + len(JSONP_CALLBACK) + 1
+    )
+    if text[position : position + 1] != "[":
+        raise ValueError("Missing button item array")
+    prefix = text[:position]
+
+    items: Dict[str, List[str]] = {}
+    position = skip_whitespace(text, position + 1)
+    while text[position : position + 1] != "]":
+        end = find_json_end(text, position)
+        if end is None:
+            raise ValueError("Unterminated button item")
+        item_text = text[position:end]
+        # button IDs carry a spec suffix, e.g. 'DYAJ9A-A900B51S8-000'
+        product_id = loads_json(item_text)["Id"].rsplit("-", 1)[0]
+        items.setdefault(product_id, []).append(item_text)
+
+        position = skip_whitespace(text, end)
+        if text[position : position + 1] == ",":
+            position = skip_whitespace(text, position + 1)
+        elif text[position : position + 1] != "]":
+            raise ValueError("Malformed button item array")
+
+    return prefix, items, text[position + 1 :]
+
 
 class URLManager(URLManagerBase):
     def __init__(self) -> None:
@@ -21,12 +121,7 @@ class URLManager(URLManagerBase):
         self.url_referrer = self.target_url
 
     def load_url_to_request(self):
-        self.url_to_request = (
-            "https://ecapi.pchome.com.tw/ecshop/prodapi/v2/prod/"
-            f"button&id={self.product_id}"
-            "&fields=Seq,Id,Price,Qty,ButtonType,SaleStatus,isPrimeOnly,SpecialQty"
-            "&_callback=jsonp_button&1611904320?_callback=jsonp_button"
-        )
+        self.url_to_request = get_url_to_request([self.product_id])
 
 
 class Extractor(StaticExtractor):
@@ -35,23 +130,261 @@ class Extractor(StaticExtractor):
     Args:
         url_manager (Type[URLManagerBase], optional):
             URL Manager to parse the URL. Defaults to URLManager.
+        structured (bool, optional):
+            Whether to return the parsed button info instead of the JSONP
+            text. Defaults to False.
     """
 
-    def __init__(self, url_manager: Type[URLManagerBase] = URLManager) -> None:
+    def __init__(
+        self,
+        url_manager: Type[URLManagerBase] = URLManager,
+        structured: bool = False,
+    ) -> None:
         super().__init__(url_manager)
+        self.structured = structured
+
+    def get_parsed_content(self, response: Any) -> Any:
+        if self.structured:
+            return convert_jsonp_to_object(response.text, JSONP_CALLBACK)
+        return response.text
 
     def load_request_headers(self):
-        self.request_headers = {
-            "authority": "ecapi.pchome.com.tw",
-            "user-agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 11_1_0) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/88.0.4324.96 Safari/537.36"
-            ),
-            "accept": "*/*",
-            "sec-fetch-site": "same-site",
-            "sec-fetch-mode": "no-cors",
-            "sec-fetch-dest": "script",
-            "referer": self.urls.url_referrer,
-            "accept-language": "en,zh-TW;q=0.9,zh-CN;q=0.8,zh;q=0.7,ja;q=0.6",
+        self.request_headers = get_request_headers(self.urls.url_referrer)
+
+
+class BatchFetcher:
+    """Class that fetches many products through batched button API requests
+
+    Shared by the BatchExtractor of every monitored product. A product gone
+    stale is fetched in a batch with other stale products, so their
+    extractors find them fresh. Each batch is requested once however many
+    extractors wait on it, and a failed batch fails only its own products.
+
+    Args:
+        batch_size (int, optional):
+            Maximum number of products per request. Defaults to 20.
+        freshness_seconds (float, optional):
+            Seconds a fetched product stays reusable. Defaults to 60.
+        session_pool (SessionPool, optional):
+            Pool of keep-alive sessions to request through.
+            Defaults to session_pool, which is shared by all extractors.
+        rate_limiter (HostRateLimiter, optional):
+            Per-host limiter to wait on before each request.
+            Defaults to rate_limiter, which is shared by all extractors.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 20,
+        freshness_seconds: float = 60,
+        session_pool: SessionPool = session_pool,
+        rate_limiter: HostRateLimiter = rate_limiter,
+    ) -> None:
+        self.batch_size = max(int(batch_size), 1)
+        self.freshness_seconds = freshness_seconds
+        self.session_pool = session_pool
+        self.rate_limiter = rate_limiter
+
+        self.product_ids: Dict[str, None] = {}
+        # product ID -> (fetched time, single-product response text)
+        self.results: Dict[str, Tuple[float, str]] = {}
+        # product ID -> flight of the batch fetching it
+        self.flights: Dict[str, Flight] = {}
+        self.stats = {"batches": 0, "failed_batches": 0, "shared": 0}
+        self.lock = Lock()
+
+    def register_product(self, product_id: str) -> None:
+        """Function that adds a product to every following batch
+
+        Args:
+            product_id (str): Product ID, e.g. 'DYAJ9A-A900B51S8'
+        """
+        with self.lock:
+            self.product_ids[product_id] = None
+
+    def register_target_urls(self, target_urls: Sequence[str]) -> None:
+        """Function that registers products upfront so that the first
+        round is batched as well
+
+        Args:
+            target_urls (Sequence[str]): Product URLs on 24h.pchome.com.tw
+        """
+        url_manager = URLManager()
+        for target_url in target_urls:
+            url_manager.main(target_url)
+            self.register_product(url_manager.product_id)
+
+    def fetch_batch(self, product_ids: List[str]) -> Dict[str, str]:
+        """Function that fetches one batch and splits it by product
+
+        Args:
+            product_ids (List[str]): Product IDs to fetch together
+
+        Returns:
+            Dict[str, str]: Response text of each product, as if it was
+                requested alone
+        """
+        url_to_request = get_url_to_request(product_ids)
+        session = self.session_pool.get_session(url_to_request)
+        headers = get_request_headers("https://24h.pchome.com.tw/")
+
+        for _ in range(self.rate_limiter.max_retries + 1):
+            self.rate_limiter.wait(url_to_request)
+            response = session.get(url_to_request, headers=headers)
+            if not self.rate_limiter.handle_response(url_to_request, response):
+                break
+
+        try:
+            prefix, items, suffix = split_batch_response(response.text)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ExtractionError(f"Failed to parse batch response: {e}")
+
+        for product_id in product_ids:
+            if product_id not in items:
+                logger.error(
+                    f"Product '{product_id}' is missing in the response"
+                )
+        return {
+            product_id: (
+                prefix
+                + "["
+                + ",".join(items.get(product_id, []))
+                + "]"
+                + suffix
+            )
+            for product_id in product_ids
         }
+
+    def get_stale_batch(self, product_id: str, now: float) -> List[str]:
+        """Function that groups the product with other stale products that
+        no batch is fetching yet
+
+        Args:
+            product_id (str): Product ID to fetch
+            now (float): Current monotonic time
+
+        Returns:
+            List[str]: Product IDs to fetch together
+        """
+        batch = [product_id]
+        for other_id in self.product_ids:
+            if len(batch) >= self.batch_size:
+                break
+            if (
+                other_id != product_id
+                and other_id not in self.flights
+                and now - self.results.get(other_id, (-float("inf"),))[0]
+                >= self.freshness_seconds
+            ):
+                batch.append(other_id)
+        return batch
+
+    def run_flight(self, flight: Flight, batch: List[str]) -> None:
+        """Function that fetches the batch outside the lock and hands the
+        outcome to the extractors waiting on it
+
+        Args:
+            flight (Flight): Flight of the batch
+            batch (List[str]): Product IDs to fetch together
+        """
+        logger.info(f"Fetching a batch of {len(batch)} products")
+        try:
+            flight.value = self.fetch_batch(batch)
+        except Exception as e:
+            flight.error = e
+            logger.error(f"Failed to fetch a batch of {len(batch)}: {e}")
+        finally:
+            with self.lock:
+                for product_id in batch:
+                    del self.flights[product_id]
+                if flight.error is None:
+                    fetched = time.monotonic()
+                    for product_id, text in flight.value.items():
+                        self.results[product_id] = (fetched, text)
+                    self.stats["batches"] += 1
+                else:
+                    self.stats["failed_batches"] += 1
+            flight.event.set()
+
+    def get_product(self, product_id: str) -> str:
+        """Function that returns the response text of a registered product
+
+        Args:
+            product_id (str): Product ID
+
+        Returns:
+            str: Response text, as if the product was requested alone
+        """
+        with self.lock:
+            self.product_ids[product_id] = None
+            now = time.monotonic()
+            result = self.results.get(product_id)
+            if result and now - result[0] < self.freshness_seconds:
+                return result[1]
+
+            flight = self.flights.get(product_id)
+            batch = None
+            if flight is None:
+                batch = self.get_stale_batch(product_id, now)
+                flight = Flight()
+                for batch_id in batch:
+                    self.flights[batch_id] = flight
+            else:
+                self.stats["shared"] += 1
+
+        if batch is not None:
+            self.run_flight(flight, batch)
+        else:
+            flight.event.wait()
+
+        if flight.error is not None:
+            raise ExtractionError(
+                f"Failed to fetch product '{product_id}': {flight.error}"
+            )
+        return flight.value[product_id]
+
+    def get_stats(self) -> Dict[str, int]:
+        """Function that returns how many batches were fetched
+
+        Returns:
+            Dict[str, int]: Batches fetched and failed, and extractors that
+                waited on a batch already in flight
+        """
+        with self.lock:
+            return dict(self.stats)
+
+
+class BatchExtractor(ExtractorBase):
+    """Class that extracts shopping cart info from pchome.com.tw in batches
+
+    Every monitored product gets its own BatchExtractor, while all of
+    them share one BatchFetcher that groups the products into as few
+    requests as possible. The content is the same as Extractor's, so
+    monitors can switch between the two.
+
+    Args:
+        fetcher (BatchFetcher): Fetcher shared across the products
+        url_manager (Type[URLManagerBase], optional):
+            URL Manager to parse the URL. Defaults to URLManager.
+        structured (bool, optional):
+            Whether to return the parsed button info instead of the JSONP
+            text. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        fetcher: BatchFetcher,
+        url_manager: Type[URLManagerBase] = URLManager,
+        structured: bool = False,
+    ) -> None:
+        super().__init__(url_manager)
+        self.fetcher = fetcher
+        self.structured = structured
+
+    def get_response(self) -> str:
+        return self.fetcher.get_product(self.urls.product_id)
+
+    def get_parsed_content(self, response: str) -> Any:
+        if self.structured:
+            return convert_jsonp_to_object(response, JSONP_CALLBACK)
+        return response
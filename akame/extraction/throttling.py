@@ -0,0 +1,193 @@
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from threading import Lock
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def get_url_hostname(url: str) -> str:
+    """Function that gets the hostname the URL is throttled by
+
+    Args:
+        url (str): URL to request
+
+    Returns:
+        str: Lowercased hostname, e.g. '24h.pchome.com.tw'
+    """
+    return (urlparse(url).hostname or "").lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Function that parses the Retry-After header into seconds
+
+    Args:
+        value (Optional[str]): Header value, in seconds or as an HTTP date
+
+    Returns:
+        Optional[float]: Seconds to wait; None if it cannot be parsed
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+class TokenBucket:
+    """Class that hands out request slots at a steady rate
+
+    Args:
+        rate (float): Requests allowed per second
+        burst (int): Requests allowed at once after an idle period
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = float(rate)
+        self.burst = max(int(burst), 1)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def reserve(self, now: float) -> float:
+        """Function that takes a token and returns how long to wait for it
+
+        Args:
+            now (float): Current monotonic time
+
+        Returns:
+            float: Seconds to wait before requesting
+        """
+        if now > self.updated:
+            elapsed = now - self.updated
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+        self.tokens -= 1
+        return (self.updated - now) + max(-self.tokens, 0) / self.rate
+
+    def block_until(self, until: float) -> None:
+        """Function that holds all tokens until the given time
+
+        Args:
+            until (float): Monotonic time at which requests may resume
+        """
+        if until > self.updated:
+            self.updated = until
+            self.tokens = min(self.tokens, 1)
+
+
+class HostRateLimiter:
+    """Class that throttles requests per host across all monitors
+
+    Args:
+        rate (float, optional):
+            Default requests per second for each host. Defaults to 2.
+        burst (int, optional):
+            Default burst size for each host. Defaults to 10.
+        backoff_seconds (float, optional):
+            Seconds to hold a host after 429 without Retry-After.
+            Defaults to 30.
+        max_retries (int, optional):
+            Times to retry a throttled request. Defaults to 2.
+    """
+
+    def __init__(
+        self,
+        rate: float = 2,
+        burst: int = 10,
+        backoff_seconds: float = 30,
+        max_retries: int = 2,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.backoff_seconds = backoff_seconds
+        self.max_retries = max_retries
+
+        self.host_limits: Dict[str, Tuple[float, int]] = {}
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = Lock()
+
+    def configure_host(self, hostname: str, rate: float, burst: int) -> None:
+        """Function that sets the rate and burst size of a host
+
+        Args:
+            hostname (str): Hostname, e.g. '24h.pchome.com.tw'
+            rate (float): Requests allowed per second
+            burst (int): Requests allowed at once
+        """
+        hostname = hostname.lower()
+        with self.lock:
+            self.host_limits[hostname] = (rate, burst)
+            self.buckets.pop(hostname, None)
+
+    def get_bucket(self, hostname: str) -> TokenBucket:
+        if hostname not in self.buckets:
+            rate, burst = self.host_limits.get(
+                hostname, (self.rate, self.burst)
+            )
+            self.buckets[hostname] = TokenBucket(rate=rate, burst=burst)
+        return self.buckets[hostname]
+
+    def wait(self, url: str) -> float:
+        """Function that blocks until the URL's host allows another request
+
+        Args:
+            url (str): URL to request
+
+        Returns:
+            float: Seconds waited
+        """
+        hostname = get_url_hostname(url)
+        with self.lock:
+            seconds = self.get_bucket(hostname).reserve(time.monotonic())
+
+        if seconds > 0:
+            logger.info(f"Throttling '{hostname}' for {seconds:.2f} seconds")
+            time.sleep(seconds)
+        return seconds
+
+    def handle_response(self, url: str, response: requests.Response) -> bool:
+        """Function that holds the host if the response asks to back off
+
+        Args:
+            url (str): Requested URL
+            response (requests.Response): Response of the request
+
+        Returns:
+            bool: Whether the request was throttled by the host
+        """
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if response.status_code == 429 and retry_after is None:
+            retry_after = self.backoff_seconds
+        if response.status_code not in (429, 503) or retry_after is None:
+            return False
+
+        hostname = get_url_hostname(url)
+        logger.warning(
+            f"'{hostname}' responded {response.status_code}: "
+            f"holding requests for {retry_after:.0f} seconds"
+        )
+        with self.lock:
+            self.get_bucket(hostname).block_until(
+                time.monotonic() + retry_after
+            )
+        return True
+
+
+# shared by all extractors unless one is given explicitly
+rate_limiter = HostRateLimiter()
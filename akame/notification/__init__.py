@@ -1,6 +1,5 @@
 import logging
 
-from akame.comparison.delta import StringDelta
 from akame.notification.core import NotifierBase
 from akame.notification.formatters import (
     FormatColoredTerminalText,
@@ -26,12 +25,10 @@ class BasicNotifier(NotifierBase):
         logger.info(message)
 
     def get_formatted_message(self) -> str:
-        content_0 = str(self.comparer.content_0)
-        content_1 = str(self.comparer.content_1)
         comparer_message = self.comparer.message
         task_name = self.comparer.task_name
 
-        delta = StringDelta(a=content_0, b=content_1)
+        delta = self.comparer.get_delta()
         try:
             message = FormatColoredTerminalText(delta).main()
         except ImportError as e:
@@ -1,6 +1,7 @@
 import logging
 
 from akame.comparison.core import ComparerBase
+from akame.utility.tasking import run_in_executor
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -35,3 +36,11 @@ class NotifierBase:
             self.notify_condition_met()
         else:
             self.notify_condition_notmet()
+
+    async def main_async(self, comparer: ComparerBase) -> None:
+        """Function that notifies without blocking the event loop
+
+        Args:
+            comparer (ComparerBase): Comparer
+        """
+        await run_in_executor(self.main, comparer)
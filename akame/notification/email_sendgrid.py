@@ -3,7 +3,6 @@ import logging
 from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import Mail
 
-from akame.comparison.delta import StringDelta
 from akame.notification.core import NotifierBase
 from akame.notification.formatters import FormatEmailHTML
 
@@ -50,13 +49,11 @@ class SendGridNotifier(NotifierBase):
             logger.error(f"Failed to send the message: {e}")
 
     def get_formatted_message(self) -> str:
-        content_0 = str(self.comparer.content_0)
-        content_1 = str(self.comparer.content_1)
         task_name = self.comparer.task_name
         target_url = self.comparer.target_url
         comparer_message = self.comparer.message
 
-        delta = StringDelta(a=content_0, b=content_1)
+        delta = self.comparer.get_delta()
         formatter = FormatEmailHTML(delta)
 
         return formatter.main(
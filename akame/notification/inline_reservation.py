@@ -102,12 +102,19 @@ class InlineReservationHelper(NotifierBase):
 
     def load_available_dates(self, reserve_all_or_none: bool = True):
 
-        pattern = r"Dates with open seats: '(?P<open_seats>\{.*?\})';"
         message = self.comparer.mc_1.content
-        message = str(message) if message else "{}"
-        avail_found = re.search(pattern, message)
-        avail_raw = avail_found.group("open_seats") if avail_found else "{}"
-        avail_parsed: Dict[str, Dict[str, List[int]]] = literal_eval(avail_raw)
+        avail_parsed: Dict[str, Dict[str, List[int]]]
+
+        if isinstance(message, dict):
+            avail_parsed = message.get("seats_open", {})
+        else:
+            pattern = r"Dates with open seats: '(?P<open_seats>\{.*?\})';"
+            message = str(message) if message else "{}"
+            avail_found = re.search(pattern, message)
+            avail_raw = (
+                avail_found.group("open_seats") if avail_found else "{}"
+            )
+            avail_parsed = literal_eval(avail_raw)
 
         # TODO: use dataclass to improve type checking here
         avail_list: List[Dict] = []
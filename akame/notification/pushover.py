@@ -2,7 +2,6 @@ import logging
 from http.client import HTTPSConnection
 from urllib.parse import urlencode
 
-from akame.comparison.delta import StringDelta
 from akame.notification.core import NotifierBase
 from akame.notification.formatters import FormatPushoverHTML
 
@@ -48,12 +47,10 @@ class PushoverNotifier(NotifierBase):
             logger.error(f"Failed to send the message: {e}")
 
     def get_formatted_message(self) -> str:
-        content_0 = str(self.comparer.content_0)
-        content_1 = str(self.comparer.content_1)
         target_url = self.comparer.target_url
         comparer_message = self.comparer.message
 
-        delta = StringDelta(a=content_0, b=content_1)
+        delta = self.comparer.get_delta()
         formatter = FormatPushoverHTML(delta)
 
         return formatter.main(
@@ -1,12 +1,33 @@
+import atexit
+import json
 import logging
-import pickle
+import os
+import sqlite3
 import sys
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime
 from hashlib import sha1
 from pathlib import Path
+from queue import Empty, Queue
 from shutil import rmtree
-from typing import Union
+from tempfile import NamedTemporaryFile
+from threading import Condition, Lock, Thread, get_ident
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from akame.utility.core import MonitoredContent
+from akame.utility.serialization import (
+    MAGIC,
+    check_is_serialized,
+    dump_content,
+    dump_mc,
+    get_mc_header,
+    load_content,
+    load_mc_header,
+    migrate_legacy_cache,
+    read_mc,
+    read_mc_header,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -61,6 +82,103 @@ def reset_folder(path_to_folder: Path) -> None:
     path_to_folder.mkdir(parents=True, exist_ok=True)
 
 
+class MemoryCache:
+    """Class that keeps the newest MonitoredContent of each task in memory,
+    evicting the least recently used tasks beyond a size budget
+
+    Args:
+        max_bytes (int, optional):
+            Budget in serialized bytes across all tasks.
+            Defaults to 256 * 2 ** 20 (256 MiB).
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2 ** 20) -> None:
+        self.max_bytes = max_bytes
+        # task key -> (version, content, size), least recently used first
+        self.entries: Dict[str, Tuple[int, MonitoredContent, int]]
+        self.entries = OrderedDict()
+        self.n_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self.lock = Lock()
+
+    def get(self, key: str, version: int) -> Optional[MonitoredContent]:
+        """Function that gets the content cached for the task and version
+
+        Args:
+            key (str): Key of the task, e.g. its cache folder
+            version (int): Version the content should be
+
+        Returns:
+            Optional[MonitoredContent]: Cached content; None if missing
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] != version:
+                self.stats["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def put(
+        self, key: str, version: int, mc: MonitoredContent, size: int
+    ) -> None:
+        """Function that caches the newest content of the task
+
+        Args:
+            key (str): Key of the task, e.g. its cache folder
+            version (int): Version of the content
+            mc (MonitoredContent): Content to cache
+            size (int): Size of the content in serialized bytes
+        """
+        with self.lock:
+            self.pop(key)
+            if size > self.max_bytes:
+                return
+            self.entries[key] = (version, mc, size)
+            self.n_bytes += size
+            while self.n_bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self.entries.popitem(last=False)
+                self.n_bytes -= evicted_size
+                self.stats["evictions"] += 1
+
+    def pop(self, key: str) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.n_bytes -= entry[2]
+
+    def discard(self, key: str) -> None:
+        """Function that drops the content of the task
+
+        Args:
+            key (str): Key of the task, e.g. its cache folder
+        """
+        with self.lock:
+            self.pop(key)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.n_bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """Function that returns how often disk reads were avoided
+
+        Returns:
+            Dict[str, int]: Hits, misses, evictions, tasks and bytes held
+        """
+        with self.lock:
+            return {
+                **self.stats,
+                "tasks": len(self.entries),
+                "bytes": self.n_bytes,
+            }
+
+
+# shared by all cache managers unless one is given explicitly
+memory_cache = MemoryCache()
+
+
 def reset_cached_folder(
     task_hash: Union[str, None] = None,
     reset_whole_folder: bool = False,
@@ -101,17 +219,31 @@ def reset_cached_folder(
                 "Ignoring `reset_whole_folder`: `task_hash` was provided"
             )
         path_cache_folder_th = path_cache_folder / task_hash
+        get_blob_store(path_cache_folder).release_manifest(
+            path_cache_folder_th / "manifest.json"
+        )
         reset_folder(path_cache_folder_th)
+        memory_cache.discard(str(path_cache_folder_th))
+        if sqlite_cache_store.path_database.exists():
+            sqlite_cache_store.delete_task(task_hash)
+        memory_cache.discard(f"sqlite:{task_hash}")
 
     elif not task_hash and reset_whole_folder:
+        sqlite_cache_store.close()
         reset_folder(path_cache_folder)
+        memory_cache.clear()
+        get_blob_store(path_cache_folder).clear()
 
 
-def get_cached_mc(path_cache) -> MonitoredContent:
+def get_cached_mc(
+    path_cache: Path, allow_pickle: bool = False
+) -> MonitoredContent:
     """Function that returns the cached Monitored Content
 
     Args:
         path_cache (Path, optional): Path to the cache file.
+        allow_pickle (bool, optional): Whether to unpickle pickled content.
+            Defaults to False.
 
     Returns:
         MonitoredContent: Fetched MonitoredContent
@@ -121,21 +253,470 @@ def get_cached_mc(path_cache) -> MonitoredContent:
         mc_0 = MonitoredContent()
     else:
         logger.info("Comparing the old and new Monitored Content")
-        with open(path_cache, "rb") as f:
-            mc_0 = pickle.load(f)
+        mc_0 = read_mc(path_cache, allow_pickle)
 
     return mc_0
 
 
-def cache_mc(mc: MonitoredContent, path_cache: Path) -> None:
+def write_file_atomically(path: Path, data: bytes) -> None:
+    """Function that writes the file through a temporary file, so readers
+    and crashes never see it half written
+
+    Args:
+        path (Path): Path to the file
+        data (bytes): Data to write
+    """
+    with NamedTemporaryFile(
+        dir=path.parent, prefix=path.name, suffix=".tmp", delete=False
+    ) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f.name, path)
+
+
+def cache_mc(
+    mc: MonitoredContent, path_cache: Path, allow_pickle: bool = False
+) -> int:
     """Function that caches the given MonitoredContent
 
     Args:
         mc (MonitoredContent): MonitoredContent to cache
         path_cache (Path, optional): Path to the cache file.
+        allow_pickle (bool, optional): Whether to pickle content that
+            does not round-trip through JSON. Defaults to False.
+
+    Returns:
+        int: Size of the cache file in bytes
+    """
+    data = dump_mc(mc, allow_pickle=allow_pickle)
+    write_file_atomically(path_cache, data)
+    return len(data)
+
+
+class BlobStore:
+    """Class that stores content once per distinct content, shared by all
+    tasks and versions that point to it
+
+    Blobs are keyed by the content fingerprint and counted by references.
+    The counts are rebuilt on first use from the task manifests of the
+    parent folder and of every other cache folder recorded as using the
+    store, and blobs none of them points to are removed.
+
+    Args:
+        path_blob_folder (Path): Path to the blob folder
+    """
+
+    def __init__(self, path_blob_folder: Path) -> None:
+        self.path_blob_folder = path_blob_folder
+        self.references: Optional[Dict[str, int]] = None
+        self.stats = {"writes": 0, "dedups": 0, "removals": 0}
+        self.lock = Lock()
+
+    def get_path_blob(self, digest: str) -> Path:
+        return self.path_blob_folder / digest[:2] / f"{digest}.akameblob"
+
+    def load_cache_folders(self) -> List[Path]:
+        """Function that lists the cache folders whose manifests may point
+        to blobs here
+
+        Returns:
+            List[Path]: The parent folder and the recorded ones
+        """
+        path_folders = self.path_blob_folder / "folders.json"
+        folders = [self.path_blob_folder.parent.resolve()]
+        if path_folders.exists():
+            folders += [
+                Path(folder) for folder in json.loads(path_folders.read_text())
+            ]
+        return folders
+
+    def add_cache_folder(self, path_cache_folder: Path) -> None:
+        """Function that records a cache folder using the store, so its
+        manifests are counted before any blob is removed, also by later
+        processes
+
+        Args:
+            path_cache_folder (Path): Path to the cache folder
+        """
+        path_cache_folder = path_cache_folder.resolve()
+        with self.lock:
+            folders = self.load_cache_folders()
+            if path_cache_folder in folders:
+                return
+            self.path_blob_folder.mkdir(parents=True, exist_ok=True)
+            write_file_atomically(
+                self.path_blob_folder / "folders.json",
+                json.dumps(
+                    [str(folder) for folder in folders[1:]]
+                    + [str(path_cache_folder)]
+                ).encode("utf-8"),
+            )
+            if self.references is not None:
+                self.count_references(self.references, path_cache_folder)
+
+    def count_references(
+        self, references: Dict[str, int], path_cache_folder: Path
+    ) -> None:
+        """Function that adds the references of the task manifests in a
+        cache folder to the counts
+
+        Args:
+            references (Dict[str, int]): Counts to add to
+            path_cache_folder (Path): Path to the cache folder
+        """
+        for path_manifest in path_cache_folder.glob("*/manifest.json"):
+            for entry in json.loads(path_manifest.read_text())["versions"]:
+                digest = entry.get("digest")
+                if digest:
+                    references[digest] = references.get(digest, 0) + 1
+
+    def load_references(self) -> Dict[str, int]:
+        """Function that counts the references in all task manifests, once
+
+        Returns:
+            Dict[str, int]: Number of versions pointing to each blob
+        """
+        if self.references is not None:
+            return self.references
+
+        self.references = {}
+        for path_cache_folder in self.load_cache_folders():
+            self.count_references(self.references, path_cache_folder)
+
+        for path_blob in self.path_blob_folder.glob("*/*.akameblob"):
+            if path_blob.stem not in self.references:
+                path_blob.unlink()
+                self.stats["removals"] += 1
+        return self.references
+
+    def put(
+        self, digest: str, content: Any, allow_pickle: bool = False
+    ) -> int:
+        """Function that adds a reference to the content, writing it only
+        if no version holds it yet
+
+        Args:
+            digest (str): Fingerprint of the content
+            content (Any): Content to store
+            allow_pickle (bool, optional): Whether to pickle content that
+                does not round-trip through JSON. Defaults to False.
+
+        Returns:
+            int: Size of the blob in bytes
+        """
+        with self.lock:
+            references = self.load_references()
+            path_blob = self.get_path_blob(digest)
+            if references.get(digest) and path_blob.exists():
+                self.stats["dedups"] += 1
+                size = path_blob.stat().st_size
+            else:
+                data = dump_content(content, allow_pickle=allow_pickle)
+                path_blob.parent.mkdir(parents=True, exist_ok=True)
+                write_file_atomically(path_blob, data)
+                self.stats["writes"] += 1
+                size = len(data)
+            references[digest] = references.get(digest, 0) + 1
+        return size
+
+    def get(self, digest: str, allow_pickle: bool = False) -> Any:
+        """Function that reads the content of a blob
+
+        Args:
+            digest (str): Fingerprint of the content
+            allow_pickle (bool, optional): Whether to unpickle pickled
+                content. Defaults to False.
+
+        Returns:
+            Any: Content
+        """
+        return load_content(
+            self.get_path_blob(digest).read_bytes(), allow_pickle
+        )
+
+    def release(self, digest: Optional[str]) -> None:
+        """Function that drops a reference, removing the blob with the last
+
+        Args:
+            digest (Optional[str]): Fingerprint of the content
+        """
+        if not digest:
+            return
+        with self.lock:
+            references = self.load_references()
+            references[digest] = references.get(digest, 0) - 1
+            if references[digest] <= 0:
+                del references[digest]
+                self.get_path_blob(digest).unlink(missing_ok=True)
+                self.stats["removals"] += 1
+
+    def release_manifest(self, path_manifest: Path) -> None:
+        """Function that drops the references of a task about to be reset
+
+        Args:
+            path_manifest (Path): Path to the task manifest
+        """
+        if not path_manifest.exists():
+            return
+        for entry in json.loads(path_manifest.read_text())["versions"]:
+            self.release(entry.get("digest"))
+
+    def clear(self) -> None:
+        """Function that forgets the counts after the folder was reset"""
+        with self.lock:
+            self.references = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Function that returns how many writes deduplication saved
+
+        Returns:
+            Dict[str, int]: Blobs written, writes skipped, blobs removed
+                and blobs held
+        """
+        with self.lock:
+            return {
+                **self.stats,
+                "blobs": len(self.references or {}),
+            }
+
+
+# shared by the cache managers of each cache folder
+blob_stores: Dict[Path, BlobStore] = {}
+blob_stores_lock = Lock()
+
+
+def get_blob_store(path_cache_folder: Path = path_cache_folder) -> BlobStore:
+    """Function that gets the blob store shared by the tasks cached in a
+    folder, kept in the folder next to their manifests
+
+    Args:
+        path_cache_folder (Path, optional): Path to the cache folder.
+            Defaults to path_cache_folder.
+
+    Returns:
+        BlobStore: Blob store of the folder
     """
-    with open(path_cache, "wb") as f:
-        pickle.dump(mc, f)
+    path_cache_folder = path_cache_folder.resolve()
+    with blob_stores_lock:
+        if path_cache_folder not in blob_stores:
+            blob_stores[path_cache_folder] = BlobStore(
+                path_cache_folder / "blobs"
+            )
+        return blob_stores[path_cache_folder]
+
+
+# shared by the cache managers of the default folder
+blob_store = get_blob_store()
+
+
+# (SQL statement, parameters) run by the writer thread
+Statement = Tuple[str, Tuple[Any, ...]]
+
+
+class SQLiteCacheStore:
+    """Class that keeps the caches of all tasks in one SQLite database
+
+    The database runs in WAL mode, so readers never wait for the writer.
+    Writes from all threads go through one writer thread, which commits
+    whatever is queued in a single transaction; callers block until their
+    writes are committed. A failed transaction is retried one write at a
+    time, so only the failing writes raise. The database is opened on first
+    use.
+
+    Args:
+        path_database (Path): Path to the database file
+        max_batch_size (int, optional):
+            Maximum writes committed per transaction. Defaults to 256.
+    """
+
+    def __init__(self, path_database: Path, max_batch_size: int = 256) -> None:
+        self.path_database = path_database
+        self.max_batch_size = max_batch_size
+        self.queue: "Queue[Optional[Tuple[List[Statement], Future]]]"
+        self.queue = Queue()
+        self.writer: Optional[Thread] = None
+        self.connections: Dict[int, sqlite3.Connection] = {}
+        self.stats = {"writes": 0, "transactions": 0}
+        self.lock = Lock()
+
+    def connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self.path_database, check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def start(self) -> None:
+        """Function that creates the database and starts the writer, once"""
+        with self.lock:
+            if self.writer:
+                return
+            self.path_database.parent.mkdir(parents=True, exist_ok=True)
+            connection = self.connect()
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS versions ("
+                    "task_hash TEXT NOT NULL, "
+                    "version INTEGER NOT NULL, "
+                    "timestamp TEXT NOT NULL, "
+                    "header TEXT NOT NULL, "
+                    "content BLOB NOT NULL, "
+                    "PRIMARY KEY (task_hash, version)) WITHOUT ROWID"
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS versions_by_timestamp "
+                    "ON versions (task_hash, timestamp)"
+                )
+            self.writer = Thread(
+                target=self.write, args=(connection,), daemon=True
+            )
+            self.writer.start()
+
+    def get_connection(self) -> sqlite3.Connection:
+        """Function that gets the reading connection of the calling thread
+
+        Returns:
+            sqlite3.Connection: Connection for this thread
+        """
+        self.start()
+        with self.lock:
+            thread_id = get_ident()
+            if thread_id not in self.connections:
+                self.connections[thread_id] = self.connect()
+            return self.connections[thread_id]
+
+    def write(self, connection: sqlite3.Connection) -> None:
+        """Function that commits queued writes in batches until closed
+
+        Args:
+            connection (sqlite3.Connection): Connection of the writer
+        """
+        stopped = False
+        while not stopped:
+            batch = [self.queue.get()]
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except Empty:
+                    break
+            if None in batch:
+                stopped = True
+            writes = [write for write in batch if write is not None]
+            if not writes:
+                continue
+
+            try:
+                self.commit(
+                    connection, [statements for statements, _ in writes]
+                )
+            except sqlite3.Error:
+                # rolled back; retried one by one, so only the writes that
+                # fail on their own fail
+                for statements, future in writes:
+                    try:
+                        self.commit(connection, [statements])
+                    except sqlite3.Error as e:
+                        future.set_exception(e)
+                    else:
+                        future.set_result(None)
+            else:
+                for _, future in writes:
+                    future.set_result(None)
+
+        connection.close()
+
+    def commit(
+        self, connection: sqlite3.Connection, writes: List[List[Statement]]
+    ) -> None:
+        """Function that runs writes in one transaction, rolled back if any
+        statement fails
+
+        Args:
+            connection (sqlite3.Connection): Connection of the writer
+            writes (List[List[Statement]]): Statements of each write
+        """
+        with connection:
+            for statements in writes:
+                for sql, parameters in statements:
+                    connection.execute(sql, parameters)
+        self.stats["writes"] += len(writes)
+        self.stats["transactions"] += 1
+
+    def execute(self, statements: List[Statement]) -> None:
+        """Function that runs the statements in one transaction, committed
+        along with writes from other threads
+
+        Args:
+            statements (List[Statement]): Statements to run atomically
+        """
+        self.start()
+        future: Future = Future()
+        self.queue.put((statements, future))
+        future.result()
+
+    def query(self, sql: str, parameters: Tuple[Any, ...]) -> List[Any]:
+        return self.get_connection().execute(sql, parameters).fetchall()
+
+    def delete_task(self, task_hash: str) -> None:
+        """Function that deletes all versions of a task
+
+        Args:
+            task_hash (str): Hashed task name
+        """
+        self.execute(
+            [("DELETE FROM versions WHERE task_hash = ?", (task_hash,))]
+        )
+
+    def close(self) -> None:
+        """Function that stops the writer after the queued writes and closes
+        all connections, e.g. before the folder is reset"""
+        with self.lock:
+            writer, self.writer = self.writer, None
+            if writer:
+                self.queue.put(None)
+                writer.join()
+            for connection in self.connections.values():
+                connection.close()
+            self.connections.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Function that returns how well writes were batched
+
+        Returns:
+            Dict[str, int]: Writes and the transactions that committed them
+        """
+        return dict(self.stats)
+
+
+# shared by all SQLite cache managers unless one is given explicitly
+sqlite_cache_store = SQLiteCacheStore(path_cache_folder / "cache.sqlite3")
+
+
+class CachedMonitoredContent(MonitoredContent):
+    """Class that restores cached MonitoredContent from its header and
+    reads the content only when it is accessed
+
+    Args:
+        header (Dict[str, Any]): Header written by `get_mc_header`
+        load_content (Callable[[], Any]): Function that reads the content
+    """
+
+    def __init__(
+        self, header: Dict[str, Any], load_content: Callable[[], Any]
+    ) -> None:
+        load_mc_header(self, header)
+        self.load_content = load_content
+        self.is_loaded = False
+        self.loaded_content: Any = None
+
+    @property
+    def content(self) -> Any:
+        if not self.is_loaded:
+            self.loaded_content = self.load_content()
+            self.is_loaded = True
+        return self.loaded_content
 
 
 class CacheManagerBase:
@@ -160,6 +741,12 @@ class CacheManagerBase:
 class TaskCacheManager(CacheManagerBase):
     """Class that handles caching for a monitoring task
 
+    A manifest lists the kept versions with their headers and is replaced
+    atomically each round. With a blob store, versions point to content
+    shared across rounds and tasks, so unchanged content is not written
+    again. Without one, versions are kept in a ring buffer of slot files,
+    one written per round.
+
     Args:
         task_name (str): Name of the task
         n_versions (int, optional):
@@ -168,6 +755,16 @@ class TaskCacheManager(CacheManagerBase):
             Path to the cache folder. Defaults to path_cache_folder.
         reset_task_cache (bool, optional):
             Whether to reset task cache upon initilization. Defaults to True.
+        memory_cache (Optional[MemoryCache], optional):
+            In-memory layer holding the newest version. Defaults to the
+            shared memory_cache; None reads every version from disk.
+        blob_store (Optional[BlobStore], optional):
+            Content-addressed store holding the content. Defaults to the
+            store shared in `path_cache_folder`; None keeps slot files per
+            task.
+        allow_pickle (bool, optional): Whether to pickle content that does
+            not round-trip through JSON, and to migrate legacy pickled
+            caches; the cache must then be trusted. Defaults to False.
     """
 
     def __init__(
@@ -176,12 +773,21 @@ class TaskCacheManager(CacheManagerBase):
         n_versions: int = 3,
         path_cache_folder: Path = path_cache_folder,
         reset_task_cache: bool = True,
+        memory_cache: Optional[MemoryCache] = memory_cache,
+        blob_store: Optional[BlobStore] = blob_store,
+        allow_pickle: bool = False,
     ) -> None:
         super().__init__(task_name)
         self.n_versions = int(n_versions)
         self.check_n_versions()
         self.path_cache_folder = path_cache_folder
         self.reset_task_cache = reset_task_cache
+        self.memory_cache = memory_cache
+        if blob_store is get_blob_store():
+            # the shared store belongs to the default folder
+            blob_store = get_blob_store(path_cache_folder)
+        self.blob_store = blob_store
+        self.allow_pickle = allow_pickle
 
         self.setup_cache_folder()
 
@@ -193,51 +799,541 @@ class TaskCacheManager(CacheManagerBase):
 
     def setup_cache_folder(self) -> None:
         """Function that sets up the task cache folder and configurations"""
-        self.path_cache_folder_th = path_cache_folder / self.task_hash
+        self.path_cache_folder_th = self.path_cache_folder / self.task_hash
         self.cache_extention = "akamecache"
-        self.cache_oldest_version: int = 0
-        self.cache_newest_version: int = (
-            self.cache_oldest_version + self.n_versions - 1
-        )
+        self.path_manifest = self.path_cache_folder_th / "manifest.json"
 
+        if self.blob_store:
+            self.blob_store.add_cache_folder(self.path_cache_folder)
         if self.reset_task_cache:
+            if self.blob_store:
+                self.blob_store.release_manifest(self.path_manifest)
             reset_folder(self.path_cache_folder_th)
+            if self.memory_cache:
+                self.memory_cache.discard(str(self.path_cache_folder_th))
+        self.path_cache_folder_th.mkdir(parents=True, exist_ok=True)
+
+        self.load_manifest()
 
-    def get_path_cache(self, version: int) -> Path:
-        filename = str(version) + "." + self.cache_extention
+    def get_path_cache(self, slot: int) -> Path:
+        filename = str(slot) + "." + self.cache_extention
         return self.path_cache_folder_th / filename
 
-    def replace_older_caches(self) -> None:
-        """Function that replaces older caches with their new versions"""
-        paths_cache = self.path_cache_folder_th.iterdir()
-        existing_versions = sorted([int(path.stem) for path in paths_cache])
-        version_migration = [
-            (version, version - 1) for version in existing_versions
-        ]
-
-        for v_old, v_new in version_migration:
-            if v_new < self.cache_oldest_version:
-                pass
-            else:
-                path_old = self.get_path_cache(v_old)
-                path_new = self.get_path_cache(v_new)
-                path_old.rename(path_new)
+    def check_slot_is_readable(self, path_cache: Path) -> bool:
+        """Function that checks whether a slot file from before the manifest
+        can be read, migrating legacy pickled caches when pickle is allowed
+
+        Args:
+            path_cache (Path): Path to the slot file
+
+        Returns:
+            bool: Whether the slot is in the cache format
+        """
+        with open(path_cache, "rb") as f:
+            if check_is_serialized(f.read(len(MAGIC))):
+                return True
+        if self.allow_pickle:
+            return migrate_legacy_cache(path_cache)
+        logger.warning(
+            f"Skipping legacy pickled cache '{path_cache.name}' of "
+            f"'{self.task_name}': pickle is not allowed"
+        )
+        return False
+
+    def load_manifest(self) -> None:
+        """Function that loads the manifest, or builds one from caches
+        rotated by renaming (the newest with the highest number)"""
+        if self.path_manifest.exists():
+            self.manifest = json.loads(self.path_manifest.read_text())
+            return
+
+        slots = sorted(
+            int(path.stem)
+            for path in self.path_cache_folder_th.glob(
+                f"*.{self.cache_extention}"
+            )
+            if self.check_slot_is_readable(path)
+        )
+        self.manifest = {
+            "head": len(slots),
+            "versions": [
+                {"version": version, "slot": slot, "header": None}
+                for version, slot in enumerate(slots)
+            ],
+        }
+
+    def get_free_slot(self) -> int:
+        """Function that picks the slot for the next version: an unused one
+        while the buffer fills up, then the oldest version's
+
+        Returns:
+            int: Slot to write to
+        """
+        versions = self.manifest["versions"]
+        used = {entry["slot"] for entry in versions if "slot" in entry}
+        if len(versions) < self.n_versions or versions[0].get("slot") is None:
+            return next(
+                slot for slot in range(len(versions) + 1) if slot not in used
+            )
+        return versions[0]["slot"]
 
     def cache_task_mc(self, mc: MonitoredContent) -> None:
-        """Function that rotates and caches monitored content
+        """Function that caches monitored content into the blob store or the
+        next slot
 
         Args:
             mc (MonitoredContent): MonitoredContent to cache
         """
-        if self.n_versions > 1:
-            if check_is_folder_emtpy(self.path_cache_folder_th):
-                pass
-            else:
-                self.replace_older_caches()
+        entry: Dict[str, Any] = {"version": self.manifest["head"]}
+        versions = self.manifest["versions"]
+        if self.blob_store:
+            entry["digest"] = mc.get_fingerprint()
+            size = (
+                self.blob_store.put(
+                    entry["digest"], mc.content, self.allow_pickle
+                )
+                if entry["digest"]
+                else 0
+            )
+        else:
+            entry["slot"] = self.get_free_slot()
+            size = cache_mc(
+                mc, self.get_path_cache(entry["slot"]), self.allow_pickle
+            )
+            versions = [
+                kept
+                for kept in versions
+                if kept.get("slot") != entry["slot"]
+            ]
+        entry["header"] = get_mc_header(mc)
+        versions = versions + [entry]
+
+        self.manifest = {
+            "head": self.manifest["head"] + 1,
+            "versions": versions[-self.n_versions :],
+        }
+        write_file_atomically(
+            self.path_manifest, json.dumps(self.manifest).encode("utf-8")
+        )
+        # released once the manifest no longer points to them
+        if self.blob_store:
+            for evicted in versions[: -self.n_versions]:
+                self.blob_store.release(evicted.get("digest"))
+
+        if self.memory_cache:
+            self.memory_cache.put(
+                str(self.path_cache_folder_th),
+                versions[-1]["version"],
+                mc,
+                size,
+            )
+
+    def get_cache(self, age: int = 0) -> MonitoredContent:
+        """Function that gets a cached version, from its header when there
+        is one, so the content is read only if it is needed
+
+        Args:
+            age (int, optional): Versions back from the newest.
+                Defaults to 0, the newest.
+
+        Returns:
+            MonitoredContent: Cached MonitoredContent; an empty one if there
+                is no such version
+        """
+        versions = self.manifest["versions"]
+        if age >= len(versions):
+            logger.info("Caching Monitored Content for the first run")
+            return MonitoredContent()
+
+        entry = versions[-1 - age]
+        if age == 0 and self.memory_cache:
+            mc = self.memory_cache.get(
+                str(self.path_cache_folder_th), entry["version"]
+            )
+            if mc is not None:
+                return mc
+
+        if "digest" in entry:
+            digest = entry["digest"]
+            return CachedMonitoredContent(
+                entry["header"],
+                lambda: (
+                    self.blob_store.get(digest, self.allow_pickle)
+                    if digest
+                    else None
+                ),
+            )
+
+        path_cache = self.get_path_cache(entry["slot"])
+        header = entry["header"]
+        if not header and path_cache.exists():
+            header = read_mc_header(path_cache)
+        if header:
+            return CachedMonitoredContent(
+                header, lambda: self.read_slot_content(path_cache, header)
+            )
+        return get_cached_mc(path_cache, self.allow_pickle)
+
+    def read_slot_content(
+        self, path_cache: Path, header: Dict[str, Any]
+    ) -> Any:
+        """Function that reads the content of a slot file
+
+        Args:
+            path_cache (Path): Path to the slot file
+            header (Dict[str, Any]): Header the slot should match
+
+        Returns:
+            Any: Content of the slot
+        """
+        mc = get_cached_mc(path_cache, self.allow_pickle)
+        if mc.get_fingerprint() != header["fingerprint"]:
+            logger.warning(
+                f"Cache header of '{self.task_name}' is out of date"
+            )
+        return mc.content
+
+    def get_newest_cache(self) -> MonitoredContent:
+        """Function that gets the newest cache"""
+        return self.get_cache(age=0)
+
+
+class SQLiteCacheManager(CacheManagerBase):
+    """Class that handles caching for a monitoring task in a SQLite database
+    shared by all tasks, a drop-in replacement for TaskCacheManager
+
+    Versions are indexed by task hash and version number, so large fleets
+    of tasks do not need a folder and files each.
+
+    Args:
+        task_name (str): Name of the task
+        n_versions (int, optional):
+            Number of cache versions to retain. Defaults to 3.
+        reset_task_cache (bool, optional):
+            Whether to reset task cache upon initilization. Defaults to True.
+        store (SQLiteCacheStore, optional): Database holding the caches.
+            Defaults to the shared sqlite_cache_store.
+        memory_cache (Optional[MemoryCache], optional):
+            In-memory layer holding the newest version. Defaults to the
+            shared memory_cache; None reads every version from the database.
+        allow_pickle (bool, optional): Whether to pickle content that does
+            not round-trip through JSON; the database must then be trusted.
+            Defaults to False.
+    """
+
+    def __init__(
+        self,
+        task_name: str,
+        n_versions: int = 3,
+        reset_task_cache: bool = True,
+        store: SQLiteCacheStore = sqlite_cache_store,
+        memory_cache: Optional[MemoryCache] = memory_cache,
+        allow_pickle: bool = False,
+    ) -> None:
+        super().__init__(task_name)
+        self.n_versions = max(int(n_versions), 1)
+        self.store = store
+        self.memory_cache = memory_cache
+        self.allow_pickle = allow_pickle
+        self.memory_cache_key = f"sqlite:{self.task_hash}"
+
+        if reset_task_cache:
+            self.store.delete_task(self.task_hash)
+            if self.memory_cache:
+                self.memory_cache.discard(self.memory_cache_key)
+
+        rows = self.store.query(
+            "SELECT MAX(version) FROM versions WHERE task_hash = ?",
+            (self.task_hash,),
+        )
+        self.head = 0 if rows[0][0] is None else rows[0][0] + 1
+
+    def cache_task_mc(self, mc: MonitoredContent) -> None:
+        """Function that caches monitored content and drops the versions
+        beyond `n_versions` in the same transaction
+
+        Args:
+            mc (MonitoredContent): MonitoredContent to cache
+        """
+        version = self.head
+        data = dump_content(mc.content, allow_pickle=self.allow_pickle)
+        header = get_mc_header(mc)
+        self.store.execute(
+            [
+                (
+                    "INSERT OR REPLACE INTO versions "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        self.task_hash,
+                        version,
+                        header["timestamp"],
+                        json.dumps(header),
+                        data,
+                    ),
+                ),
+                (
+                    "DELETE FROM versions "
+                    "WHERE task_hash = ? AND version <= ?",
+                    (self.task_hash, version - self.n_versions),
+                ),
+            ]
+        )
+        self.head = version + 1
+
+        if self.memory_cache:
+            self.memory_cache.put(
+                self.memory_cache_key, version, mc, len(data)
+            )
+
+    def read_content(self, version: int) -> Any:
+        rows = self.store.query(
+            "SELECT content FROM versions "
+            "WHERE task_hash = ? AND version = ?",
+            (self.task_hash, version),
+        )
+        if not rows:
+            raise KeyError(f"Version {version} has been dropped")
+        return load_content(rows[0][0], self.allow_pickle)
+
+    def get_cache_from_row(
+        self, row: Optional[Tuple[int, str]]
+    ) -> MonitoredContent:
+        if row is None:
+            logger.info("Caching Monitored Content for the first run")
+            return MonitoredContent()
+
+        version, header = row
+        if self.memory_cache:
+            mc = self.memory_cache.get(self.memory_cache_key, version)
+            if mc is not None:
+                return mc
+        return CachedMonitoredContent(
+            json.loads(header), lambda: self.read_content(version)
+        )
+
+    def get_cache(self, age: int = 0) -> MonitoredContent:
+        """Function that gets a cached version from its header, so the
+        content is read only if it is needed
+
+        Args:
+            age (int, optional): Versions back from the newest.
+                Defaults to 0, the newest.
+
+        Returns:
+            MonitoredContent: Cached MonitoredContent; an empty one if there
+                is no such version
+        """
+        rows = self.store.query(
+            "SELECT version, header FROM versions WHERE task_hash = ? "
+            "ORDER BY version DESC LIMIT 1 OFFSET ?",
+            (self.task_hash, age),
+        )
+        return self.get_cache_from_row(rows[0] if rows else None)
+
+    def get_cache_at(self, timestamp: datetime) -> MonitoredContent:
+        """Function that gets the newest version cached at or before the
+        given time
 
-        cache_mc(mc, self.get_path_cache(self.cache_newest_version))
+        Args:
+            timestamp (datetime): Time to look back to
+
+        Returns:
+            MonitoredContent: Cached MonitoredContent; an empty one if there
+                is no such version
+        """
+        rows = self.store.query(
+            "SELECT version, header FROM versions "
+            "WHERE task_hash = ? AND timestamp <= ? "
+            "ORDER BY timestamp DESC, version DESC LIMIT 1",
+            (self.task_hash, timestamp.isoformat()),
+        )
+        return self.get_cache_from_row(rows[0] if rows else None)
 
     def get_newest_cache(self) -> MonitoredContent:
         """Function that gets the newest cache"""
-        path_cache = self.get_path_cache(self.cache_newest_version)
-        return get_cached_mc(path_cache)
+        return self.get_cache(age=0)
+
+
+class WriteBehindQueue:
+    """Class that writes caches on a background thread, so rounds do not
+    wait on disk
+
+    Only the newest pending version of each cache manager is written;
+    versions superseded before their turn are skipped. Pending writes are
+    flushed when the interpreter exits.
+    """
+
+    def __init__(self) -> None:
+        # cache manager id -> (cache manager, content), oldest first
+        self.pending: Dict[int, Tuple["WriteBehindCacheManager", Any]]
+        self.pending = OrderedDict()
+        self.n_writing = 0
+        self.thread: Optional[Thread] = None
+        self.stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "written": 0,
+            "failed": 0,
+        }
+        self.condition = Condition()
+
+    def submit(
+        self, cache_manager: "WriteBehindCacheManager", mc: MonitoredContent
+    ) -> None:
+        """Function that queues the content, replacing any version of the
+        same cache manager still pending
+
+        Args:
+            cache_manager (WriteBehindCacheManager): Cache manager to write
+            mc (MonitoredContent): MonitoredContent to cache
+        """
+        with self.condition:
+            key = id(cache_manager)
+            if key in self.pending:
+                self.stats["coalesced"] += 1
+            self.pending[key] = (cache_manager, mc)
+            self.stats["submitted"] += 1
+            if not self.thread:
+                self.thread = Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.condition.notify_all()
+
+    def run(self) -> None:
+        """Function that writes the pending versions, oldest first"""
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                _, (cache_manager, mc) = self.pending.popitem(last=False)
+                self.n_writing += 1
+
+            try:
+                cache_manager.write(mc)
+                result = "written"
+            except Exception:
+                logger.exception(
+                    f"Failed to cache '{cache_manager.task_name}'"
+                )
+                result = "failed"
+
+            with self.condition:
+                self.stats[result] += 1
+                self.n_writing -= 1
+                self.condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Function that blocks until all pending versions are written
+
+        Args:
+            timeout (Optional[float], optional):
+                Seconds to wait at most. Defaults to None, no limit.
+
+        Returns:
+            bool: Whether everything was written in time
+        """
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: not self.pending and not self.n_writing, timeout
+            )
+
+    def get_stats(self) -> Dict[str, int]:
+        """Function that returns how many writes were coalesced away
+
+        Returns:
+            Dict[str, int]: Versions submitted, skipped, written, failed
+                and still pending
+        """
+        with self.condition:
+            return dict(self.stats, pending=len(self.pending))
+
+
+# shared by all write-behind cache managers unless one is given explicitly
+write_behind_queue = WriteBehindQueue()
+atexit.register(write_behind_queue.flush)
+
+
+class WriteBehindCacheManager(CacheManagerBase):
+    """Class that wraps a cache manager to write its caches in the
+    background, keeping disk I/O off the notification path
+
+    Until a version is written it is served from memory, so the next round
+    compares against it all the same. Each write is as atomic as the
+    wrapped manager makes it: TaskCacheManager replaces files and its
+    manifest atomically, SQLiteCacheManager commits in transactions.
+
+    Args:
+        cache_manager (CacheManagerBase): Cache manager that does the writes
+        queue (WriteBehindQueue, optional): Queue that runs the writes.
+            Defaults to the shared write_behind_queue.
+    """
+
+    def __init__(
+        self,
+        cache_manager: CacheManagerBase,
+        queue: WriteBehindQueue = write_behind_queue,
+    ) -> None:
+        self.task_name = cache_manager.task_name
+        self.task_hash = cache_manager.task_hash
+        self.cache_manager = cache_manager
+        self.queue = queue
+        self.pending_mc: Optional[MonitoredContent] = None
+        self.lock = Lock()
+
+    def cache_task_mc(self, mc: MonitoredContent) -> None:
+        """Function that queues monitored content to be cached
+
+        Args:
+            mc (MonitoredContent): MonitoredContent to cache
+        """
+        with self.lock:
+            self.pending_mc = mc
+        self.queue.submit(self, mc)
+
+    def write(self, mc: MonitoredContent) -> None:
+        """Function that caches the content through the wrapped manager,
+        called by the queue
+
+        Args:
+            mc (MonitoredContent): MonitoredContent to cache
+        """
+        try:
+            self.cache_manager.cache_task_mc(mc)
+        finally:
+            with self.lock:
+                if self.pending_mc is mc:
+                    self.pending_mc = None
+
+    def get_cache(self, age: int = 0) -> MonitoredContent:
+        """Function that gets a cached version; older versions are read
+        once the pending writes are flushed
+
+        Args:
+            age (int, optional): Versions back from the newest.
+                Defaults to 0, the newest.
+
+        Returns:
+            MonitoredContent: Cached MonitoredContent
+        """
+        if age == 0:
+            return self.get_newest_cache()
+        self.flush()
+        return self.cache_manager.get_cache(age)
+
+    def get_newest_cache(self) -> MonitoredContent:
+        """Function that gets the newest cache, pending or written"""
+        with self.lock:
+            if self.pending_mc is not None:
+                return self.pending_mc
+        return self.cache_manager.get_newest_cache()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Function that blocks until the pending writes are done
+
+        Args:
+            timeout (Optional[float], optional):
+                Seconds to wait at most. Defaults to None, no limit.
+
+        Returns:
+            bool: Whether everything was written in time
+        """
+        return self.queue.flush(timeout)
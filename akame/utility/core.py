@@ -1,11 +1,41 @@
+import json
 import logging
 from datetime import datetime
-from typing import Any, Hashable, Optional
+from hashlib import blake2b
+from typing import Any, Dict, Hashable, Optional
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def get_content_fingerprint(content: Any) -> Optional[str]:
+    """Function that gets the fingerprint of the content
+
+    Args:
+        content (Any): Content fetched through extractor
+
+    Returns:
+        Optional[str]: Hex digest of the content; None if there is no content
+    """
+    if content is None:
+        return None
+
+    if isinstance(content, bytes):
+        data = b"bytes\0" + content
+    elif isinstance(content, str):
+        data = b"str\0" + content.encode("utf-8")
+    else:
+        try:
+            serialized = json.dumps(
+                content, sort_keys=True, ensure_ascii=False, default=repr
+            )
+            data = b"json\0" + serialized.encode("utf-8")
+        except (TypeError, ValueError):
+            data = b"repr\0" + repr(content).encode("utf-8")
+
+    return blake2b(data, digest_size=16).hexdigest()
+
+
 class MonitoredContent:
     """Class that structures monitored content
 
@@ -16,6 +46,11 @@ class MonitoredContent:
             Name of the task. Defaults to None.
         target_url (Optional[str], optional):
             Target URL. Defaults to None.
+        validators (Optional[Dict[str, str]], optional):
+            Cache validators of the response (e.g. ETag). Defaults to None.
+        raw_fingerprint (Optional[str], optional):
+            Fingerprint of the content before normalization.
+            Defaults to None; the content was not normalized.
     """
 
     def __init__(
@@ -23,11 +58,19 @@ class MonitoredContent:
         content: Optional[Any] = None,
         task_name: Optional[str] = None,
         target_url: Optional[str] = None,
+        validators: Optional[Dict[str, str]] = None,
+        raw_fingerprint: Optional[str] = None,
     ):
         self.timestamp = datetime.now()
         self.content = content
         self.task_name = task_name if task_name else ""
         self.target_url = target_url if target_url else ""
+        self.validators = validators if validators else {}
+        self.fingerprint = get_content_fingerprint(content)
+        self.raw_fingerprint = (
+            raw_fingerprint if raw_fingerprint else self.fingerprint
+        )
+        self.signatures: Dict[str, Any] = {}
 
         str_empty = "" if content else "an empty "
         logger.info(
@@ -45,10 +88,30 @@ class MonitoredContent:
             ")"
         )
 
+    def get_fingerprint(self) -> Optional[str]:
+        """Function that returns the content fingerprint, computed once
+
+        Returns:
+            Optional[str]: Fingerprint of the content
+        """
+        # caches pickled before fingerprints existed lack the attribute
+        if "fingerprint" not in self.__dict__:
+            self.fingerprint = get_content_fingerprint(self.content)
+        return self.fingerprint
+
+    def get_signatures(self) -> Dict[str, Any]:
+        """Function that returns the signatures of the content, filled in by
+        comparers and cached along with it
+
+        Returns:
+            Dict[str, Any]: Signatures by kind, e.g. 'numeric_baselines'
+        """
+        if "signatures" not in self.__dict__:
+            self.signatures = {}
+        return self.signatures
+
     def __key(self) -> Hashable:
-        return tuple(
-            v for k, v in sorted(self.__dict__.items()) if k != "timestamp"
-        )
+        return (self.task_name, self.target_url, self.get_fingerprint())
 
     def __hash__(self):
         return hash(self.__key())
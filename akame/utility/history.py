@@ -0,0 +1,484 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from akame.comparison.delta.engines import DiffEngineBase, hunk_diff_engine
+from akame.utility.caching import (
+    CachedMonitoredContent,
+    CacheManagerBase,
+    path_cache_folder,
+    reset_folder,
+    write_file_atomically,
+)
+from akame.utility.core import MonitoredContent
+from akame.utility.serialization import (
+    decode_content,
+    dump_content,
+    encode_content,
+    get_mc_header,
+    load_content,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# a [start, size] copy from the previous version, or literal text to insert
+DeltaOp = Union[List[int], str]
+
+
+def get_delta_ops(
+    text_a: str,
+    text_b: str,
+    diff_engine: DiffEngineBase = hunk_diff_engine,
+    min_copy_size: int = 16,
+) -> List[DeltaOp]:
+    """Function that encodes text b as copies from text a and insertions
+
+    Args:
+        text_a (str): Previous version
+        text_b (str): New version
+        diff_engine (DiffEngineBase, optional): Engine that finds the
+            matching blocks. Defaults to hunk_diff_engine.
+        min_copy_size (int, optional):
+            Characters below which a match is inserted rather than copied,
+            as a copy op would take more room. Defaults to 16.
+
+    Returns:
+        List[DeltaOp]: Ops that rebuild text b from text a
+    """
+    ops: List[DeltaOp] = []
+    literal_start = 0
+    for match in diff_engine.get_matching_blocks(text_a, text_b):
+        if match.size < min_copy_size:
+            continue
+        if match.b > literal_start:
+            ops.append(text_b[literal_start : match.b])
+        ops.append([match.a, match.size])
+        literal_start = match.b + match.size
+    if literal_start < len(text_b):
+        ops.append(text_b[literal_start:])
+    return ops
+
+
+def apply_delta_ops(text_a: str, ops: List[DeltaOp]) -> str:
+    """Function that rebuilds a version from the previous one and its delta
+
+    Args:
+        text_a (str): Previous version
+        ops (List[DeltaOp]): Ops from `get_delta_ops`
+
+    Returns:
+        str: New version
+    """
+    return "".join(
+        op if isinstance(op, str) else text_a[op[0] : op[0] + op[1]]
+        for op in ops
+    )
+
+
+def encode_history_text(
+    content: Any, allow_pickle: bool = False
+) -> Tuple[str, str]:
+    """Function that encodes the content as text to diff, one character per
+    byte, so content of any type can be delta-encoded
+
+    Args:
+        content (Any): Content fetched through extractor
+        allow_pickle (bool, optional): Whether to pickle content that
+            does not round-trip through JSON. Defaults to False.
+
+    Returns:
+        Tuple[str, str]: Content type and text
+    """
+    content_type, data = encode_content(content, allow_pickle)
+    return content_type, data.decode("latin-1")
+
+
+def decode_history_text(
+    content_type: str, text: str, allow_pickle: bool = False
+) -> Any:
+    """Function that decodes the text from `encode_history_text`
+
+    Args:
+        content_type (str): Content type
+        text (str): Text
+        allow_pickle (bool, optional): Whether to unpickle pickled content.
+            Defaults to False.
+
+    Returns:
+        Any: Content
+    """
+    return decode_content(content_type, text.encode("latin-1"), allow_pickle)
+
+
+class HistoryCacheManager(CacheManagerBase):
+    """Class that retains a long history of a monitoring task as periodic
+    keyframes and forward deltas between consecutive versions
+
+    A version is rebuilt from the nearest keyframe before it, replaying at
+    most `keyframe_interval - 1` deltas. Rounds that repeat the previous
+    content take no file at all. Beyond `max_bytes`, the oldest keyframe is
+    dropped along with the deltas that depend on it. Versions and drops are
+    appended to an index, which is rewritten only once most of its lines
+    are dropped versions.
+
+    Args:
+        task_name (str): Name of the task
+        keyframe_interval (int, optional):
+            Deltas after which a keyframe is written, bounding the replay
+            cost. Defaults to 32.
+        max_delta_ratio (float, optional):
+            Share of the content inserted as new text beyond which a delta
+            is written as a keyframe instead. Defaults to 0.5.
+        max_bytes (int, optional):
+            Budget in bytes on disk for the task. The newest keyframe and
+            its deltas are always kept. Defaults to 64 * 2 ** 20 (64 MiB).
+        path_cache_folder (Path, optional):
+            Path to the cache folder. Defaults to path_cache_folder.
+        reset_task_cache (bool, optional):
+            Whether to reset task cache upon initilization. Defaults to True.
+        diff_engine (DiffEngineBase, optional): Engine that finds the
+            matching blocks of deltas. Defaults to hunk_diff_engine.
+        allow_pickle (bool, optional): Whether to pickle content that does
+            not round-trip through JSON; the history must then be trusted.
+            Defaults to False.
+    """
+
+    def __init__(
+        self,
+        task_name: str,
+        keyframe_interval: int = 32,
+        max_delta_ratio: float = 0.5,
+        max_bytes: int = 64 * 2 ** 20,
+        path_cache_folder: Path = path_cache_folder,
+        reset_task_cache: bool = True,
+        diff_engine: DiffEngineBase = hunk_diff_engine,
+        allow_pickle: bool = False,
+    ) -> None:
+        super().__init__(task_name)
+        self.keyframe_interval = max(int(keyframe_interval), 1)
+        self.max_delta_ratio = max_delta_ratio
+        self.max_bytes = max_bytes
+        self.path_cache_folder = path_cache_folder
+        self.reset_task_cache = reset_task_cache
+        self.diff_engine = diff_engine
+        self.allow_pickle = allow_pickle
+
+        # (version, text) of the newest and the last rebuilt version
+        self.newest_text: Optional[Tuple[int, str]] = None
+        self.replayed_text: Optional[Tuple[int, str]] = None
+
+        self.setup_cache_folder()
+
+    def setup_cache_folder(self) -> None:
+        """Function that sets up the task cache folder and loads its index"""
+        self.path_cache_folder_th = self.path_cache_folder / self.task_hash
+        self.path_index = self.path_cache_folder_th / "history.jsonl"
+
+        if self.reset_task_cache:
+            reset_folder(self.path_cache_folder_th)
+        self.path_cache_folder_th.mkdir(parents=True, exist_ok=True)
+
+        self.load_index()
+
+    def load_index(self) -> None:
+        """Function that replays the index: an entry per version, and marks
+        dropping the versions before a given one"""
+        versions: List[Dict[str, Any]] = []
+        self.n_index_lines = 0
+        is_torn = False
+        if self.path_index.exists():
+            with open(self.path_index, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        if not line.endswith("\n"):
+                            raise ValueError("Incomplete line")
+                        record = json.loads(line)
+                    except ValueError:
+                        # the last line was cut short by a crash
+                        is_torn = True
+                        continue
+                    self.n_index_lines += 1
+                    if "dropped_before" in record:
+                        versions = [
+                            entry
+                            for entry in versions
+                            if entry["version"] >= record["dropped_before"]
+                        ]
+                    else:
+                        versions.append(record)
+
+        self.manifest = {
+            "head": versions[-1]["version"] + 1 if versions else 0,
+            "versions": versions,
+        }
+        if is_torn:
+            self.write_index()
+
+    def write_index(self) -> None:
+        """Function that rewrites the index with the kept versions only"""
+        versions = self.manifest["versions"]
+        write_file_atomically(
+            self.path_index,
+            "".join(json.dumps(entry) + "\n" for entry in versions).encode(
+                "utf-8"
+            ),
+        )
+        self.n_index_lines = len(versions)
+
+    def append_index(self, records: List[Dict[str, Any]]) -> None:
+        """Function that appends records to the index, rewriting it instead
+        once most of its lines would be dropped versions
+
+        Args:
+            records (List[Dict[str, Any]]): Version entries and drop marks
+        """
+        if self.n_index_lines + len(records) > 2 * len(
+            self.manifest["versions"]
+        ):
+            self.write_index()
+            return
+
+        with open(self.path_index, "ab") as f:
+            f.write(
+                "".join(json.dumps(record) + "\n" for record in records)
+                .encode("utf-8")
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        self.n_index_lines += len(records)
+
+    def get_path_version(self, entry: Dict[str, Any]) -> Path:
+        filename = f"{entry['version']}.akame{entry['kind']}"
+        return self.path_cache_folder_th / filename
+
+    def count_deltas_since_keyframe(self) -> int:
+        count = 0
+        for entry in reversed(self.manifest["versions"]):
+            if entry["kind"] == "keyframe":
+                return count
+            count += entry["kind"] == "delta"
+        return count
+
+    def get_newest_text(self) -> Optional[str]:
+        """Function that gets the text of the newest version, rebuilding it
+        only if this manager did not write it
+
+        Returns:
+            Optional[str]: Text; None if there is no version yet
+        """
+        versions = self.manifest["versions"]
+        if not versions:
+            return None
+        newest_version = versions[-1]["version"]
+        if self.newest_text and self.newest_text[0] == newest_version:
+            return self.newest_text[1]
+        self.newest_text = (
+            newest_version,
+            self.rebuild_text(len(versions) - 1),
+        )
+        return self.newest_text[1]
+
+    def cache_task_mc(self, mc: MonitoredContent) -> None:
+        """Function that caches monitored content as a keyframe, a delta
+        from the previous version, or a repeat of it
+
+        Args:
+            mc (MonitoredContent): MonitoredContent to cache
+        """
+        versions = self.manifest["versions"]
+        content_type, text = encode_history_text(
+            mc.content, self.allow_pickle
+        )
+        entry: Dict[str, Any] = {
+            "version": self.manifest["head"],
+            "content_type": content_type,
+            "content_size": len(text),
+            "header": get_mc_header(mc),
+        }
+
+        previous_text = self.get_newest_text()
+        data = b""
+        if previous_text is None:
+            entry["kind"] = "keyframe"
+        elif (
+            text == previous_text
+            and content_type == versions[-1]["content_type"]
+        ):
+            entry["kind"] = "repeat"
+        elif self.count_deltas_since_keyframe() + 1 >= self.keyframe_interval:
+            entry["kind"] = "keyframe"
+        else:
+            ops = get_delta_ops(previous_text, text, self.diff_engine)
+            inserted_size = sum(len(op) for op in ops if isinstance(op, str))
+            if inserted_size > self.max_delta_ratio * len(text):
+                entry["kind"] = "keyframe"
+            else:
+                entry["kind"] = "delta"
+                data = dump_content(ops)
+
+        if entry["kind"] == "keyframe":
+            data = dump_content(text.encode("latin-1"))
+        if data:
+            write_file_atomically(self.get_path_version(entry), data)
+        entry["size"] = len(data)
+
+        versions, evicted = self.enforce_budget(versions + [entry])
+        self.manifest = {
+            "head": self.manifest["head"] + 1,
+            "versions": versions,
+        }
+        records = [entry]
+        if evicted:
+            records.append({"dropped_before": versions[0]["version"]})
+        self.append_index(records)
+        # removed once the index no longer points to them
+        for evicted_entry in evicted:
+            if evicted_entry["size"]:
+                self.get_path_version(evicted_entry).unlink(missing_ok=True)
+
+        self.newest_text = (entry["version"], text)
+
+    def enforce_budget(
+        self, versions: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Function that drops the oldest keyframe groups beyond the budget
+
+        Args:
+            versions (List[Dict[str, Any]]): Versions, oldest first
+
+        Returns:
+            Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]: Versions kept
+                and versions evicted
+        """
+        n_bytes = sum(entry["size"] for entry in versions)
+        keyframes = [
+            i
+            for i, entry in enumerate(versions)
+            if entry["kind"] == "keyframe"
+        ]
+        start = 0
+        for next_keyframe in keyframes[1:]:
+            if n_bytes <= self.max_bytes:
+                break
+            n_bytes -= sum(
+                entry["size"] for entry in versions[start:next_keyframe]
+            )
+            start = next_keyframe
+
+        if start:
+            logger.info(
+                f"Dropping {start} version(s) of '{self.task_name}': "
+                "the history exceeded its budget"
+            )
+        return versions[start:], versions[:start]
+
+    def rebuild_text(self, index: int) -> str:
+        """Function that rebuilds a version from the nearest keyframe before
+        it, or from the last rebuilt version if that is nearer
+
+        Args:
+            index (int): Index of the version in the manifest
+
+        Returns:
+            str: Text of the version
+        """
+        versions = self.manifest["versions"]
+        start = index
+        while versions[start]["kind"] != "keyframe":
+            start -= 1
+
+        replayed = self.replayed_text
+        text = None
+        for i in range(index, start - 1, -1):
+            if replayed and versions[i]["version"] == replayed[0]:
+                start, text = i, replayed[1]
+                break
+        if text is None:
+            text = load_content(
+                self.get_path_version(versions[start]).read_bytes()
+            ).decode("latin-1")
+
+        for entry in versions[start + 1 : index + 1]:
+            if entry["kind"] == "delta":
+                ops = load_content(self.get_path_version(entry).read_bytes())
+                text = apply_delta_ops(text, ops)
+
+        self.replayed_text = (versions[index]["version"], text)
+        return text
+
+    def load_version_content(self, version: int) -> Any:
+        versions = self.manifest["versions"]
+        index = version - versions[0]["version"]
+        if index < 0:
+            raise KeyError(f"Version {version} has been dropped")
+        if index == len(versions) - 1:
+            text = self.get_newest_text()
+        else:
+            text = self.rebuild_text(index)
+        return decode_history_text(
+            versions[index]["content_type"], text, self.allow_pickle
+        )
+
+    def get_cache(self, age: int = 0) -> MonitoredContent:
+        """Function that gets a retained version, rebuilding its content
+        only when it is accessed
+
+        Args:
+            age (int, optional): Versions back from the newest.
+                Defaults to 0, the newest.
+
+        Returns:
+            MonitoredContent: Cached MonitoredContent; an empty one if there
+                is no such version
+        """
+        versions = self.manifest["versions"]
+        if age >= len(versions):
+            logger.info("Caching Monitored Content for the first run")
+            return MonitoredContent()
+
+        entry = versions[-1 - age]
+        return CachedMonitoredContent(
+            entry["header"],
+            lambda: self.load_version_content(entry["version"]),
+        )
+
+    def get_version(self, version: int) -> Optional[MonitoredContent]:
+        """Function that gets a retained version by its number
+
+        Args:
+            version (int): Version number, counted from the first round
+
+        Returns:
+            Optional[MonitoredContent]: Cached MonitoredContent; None if the
+                version was never written or has been dropped
+        """
+        versions = self.manifest["versions"]
+        if not versions or not (
+            versions[0]["version"] <= version <= versions[-1]["version"]
+        ):
+            return None
+        return self.get_cache(age=versions[-1]["version"] - version)
+
+    def get_newest_cache(self) -> MonitoredContent:
+        """Function that gets the newest cache"""
+        return self.get_cache(age=0)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Function that returns how compact the history is
+
+        Returns:
+            Dict[str, int]: Versions, keyframes, bytes on disk and bytes
+                the versions would take as full copies
+        """
+        versions = self.manifest["versions"]
+        return {
+            "versions": len(versions),
+            "keyframes": sum(
+                entry["kind"] == "keyframe" for entry in versions
+            ),
+            "bytes": sum(entry["size"] for entry in versions),
+            "full_bytes": sum(entry["content_size"] for entry in versions),
+        }
@@ -0,0 +1,236 @@
+import heapq
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from threading import Condition, Thread
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from akame.utility.tasking import check_loop_seconds
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MISSED_DEADLINE_POLICIES = ("skip", "catch_up", "coalesce")
+
+
+class ScheduledTask:
+    """Class that tracks the deadlines and lag of a scheduled task
+
+    Args:
+        function (Callable): Function to run every round
+        seconds (float): Interval in seconds
+        max_rounds (int): Maximum rounds to run
+        task_name (str): Name of the task
+        policy (str, optional): What to do with missed deadlines.
+            'skip' drops them and waits for the next future deadline,
+            'catch_up' runs every missed round back to back and
+            'coalesce' runs a single round for all of them.
+            Defaults to 'skip'.
+    """
+
+    def __init__(
+        self,
+        function: Callable,
+        seconds: float,
+        max_rounds: int,
+        task_name: str,
+        policy: str = "skip",
+    ) -> None:
+        if policy not in MISSED_DEADLINE_POLICIES:
+            raise ValueError(
+                f"Unknown policy '{policy}': "
+                f"expected one of {MISSED_DEADLINE_POLICIES}"
+            )
+
+        self.function = function
+        self.seconds = seconds
+        self.max_rounds = max_rounds
+        self.task_name = task_name
+        self.policy = policy
+
+        self.due: float = 0
+        self.rounds_run: int = 0
+        self.rounds_missed: int = 0
+        self.rounds_failed: int = 0
+        self.last_lag: float = 0
+        self.max_lag: float = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.rounds_run >= self.max_rounds
+
+    def run(self) -> None:
+        """Function that runs one round and records its lag"""
+        lag = max(time.monotonic() - self.due, 0)
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.rounds_run += 1
+
+        logger.info(f"Going round {self.rounds_run} of '{self.task_name}'")
+        try:
+            self.function()
+        except Exception as e:
+            self.rounds_failed += 1
+            logger.error(f"Round {self.rounds_run} of '{self.task_name}': {e}")
+
+    def load_next_due(self, now: float) -> None:
+        """Function that moves the deadline after a round per the policy
+
+        Args:
+            now (float): Current monotonic time
+        """
+        self.due += self.seconds
+        if self.due >= now:
+            return
+
+        n_missed = int((now - self.due) // self.seconds) + 1
+        if self.policy == "skip":
+            self.rounds_missed += n_missed
+            self.due += n_missed * self.seconds
+        elif self.policy == "coalesce":
+            self.rounds_missed += n_missed - 1
+            self.due += (n_missed - 1) * self.seconds
+
+        logger.warning(
+            f"'{self.task_name}' is behind by {n_missed} round(s); "
+            f"applying policy '{self.policy}'"
+        )
+
+
+class Scheduler:
+    """Class that runs many looping tasks from one monotonic-clock heap
+
+    Due tasks are dispatched to a bounded worker pool instead of each task
+    sleeping in its own thread; a task never overlaps with itself.
+
+    Args:
+        max_workers (int, optional):
+            Maximum number of rounds running at once. Defaults to 10.
+    """
+
+    def __init__(self, max_workers: int = 10) -> None:
+        self.max_workers = max_workers
+        self.tasks: List[ScheduledTask] = []
+        self.heap: List[Tuple[float, int, ScheduledTask]] = []
+        self.counter = count()
+        self.n_running = 0
+        self.condition = Condition()
+        self.stopped = False
+        self.thread: Optional[Thread] = None
+
+    def add_task(
+        self,
+        function: Callable,
+        seconds: float,
+        max_rounds: int,
+        task_name: str,
+        policy: str = "skip",
+        delay_seconds: float = 0,
+    ) -> ScheduledTask:
+        """Function that schedules a looping task
+
+        Args:
+            function (Callable): Function to run every round
+            seconds (float): Interval in seconds
+            max_rounds (int): Maximum rounds to run
+            task_name (str): Name of the task
+            policy (str, optional): Missed-deadline policy.
+                Defaults to 'skip'.
+            delay_seconds (float, optional):
+                Seconds before the first round. Defaults to 0.
+
+        Returns:
+            ScheduledTask: Scheduled task holding its lag metrics
+        """
+        check_loop_seconds(seconds)
+        task = ScheduledTask(function, seconds, max_rounds, task_name, policy)
+        task.due = time.monotonic() + delay_seconds
+
+        with self.condition:
+            self.tasks.append(task)
+            self.push_task(task)
+            self.condition.notify_all()
+
+        logger.info(
+            f"Scheduled '{task_name}' every {seconds} seconds "
+            f"until {max_rounds} rounds"
+        )
+        return task
+
+    def push_task(self, task: ScheduledTask) -> None:
+        if not task.finished:
+            heapq.heappush(self.heap, (task.due, next(self.counter), task))
+
+    def run_task(self, task: ScheduledTask) -> None:
+        """Function that runs a round and reschedules the task"""
+        try:
+            task.run()
+        finally:
+            with self.condition:
+                task.load_next_due(time.monotonic())
+                self.push_task(task)
+                self.n_running -= 1
+                self.condition.notify_all()
+
+    def dispatch(self, executor: ThreadPoolExecutor) -> None:
+        """Function that dispatches due tasks until all tasks finish"""
+        with self.condition:
+            while not self.stopped and (self.heap or self.n_running):
+                now = time.monotonic()
+                if self.heap and self.heap[0][0] <= now:
+                    _, _, task = heapq.heappop(self.heap)
+                    self.n_running += 1
+                    executor.submit(self.run_task, task)
+                    continue
+
+                timeout = self.heap[0][0] - now if self.heap else None
+                self.condition.wait(timeout)
+
+    def run(self) -> None:
+        """Function that blocks until all tasks finish or it is stopped"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            self.dispatch(executor)
+
+    def start(self) -> None:
+        """Function that runs the scheduler in a background thread"""
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Function that stops dispatching new rounds"""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if self.thread:
+            self.thread.join()
+
+    def get_lag_metrics(self) -> Dict[str, Union[int, float]]:
+        """Function that summarizes how far the tasks are behind schedule
+
+        Returns:
+            Dict[str, Union[int, float]]: Lag metrics across all tasks
+        """
+        with self.condition:
+            now = time.monotonic()
+            lags = [task.last_lag for task in self.tasks]
+            overdue = [
+                now - due for due, _, _ in self.heap if due < now
+            ] + [0]
+            return {
+                "tasks": len(self.tasks),
+                "tasks_running": self.n_running,
+                "tasks_overdue": len(overdue) - 1,
+                "max_overdue_seconds": max(overdue),
+                "mean_lag_seconds": sum(lags) / len(lags) if lags else 0,
+                "max_lag_seconds": max(
+                    [task.max_lag for task in self.tasks] + [0]
+                ),
+                "rounds_run": sum(task.rounds_run for task in self.tasks),
+                "rounds_missed": sum(
+                    task.rounds_missed for task in self.tasks
+                ),
+                "rounds_failed": sum(
+                    task.rounds_failed for task in self.tasks
+                ),
+            }
@@ -0,0 +1,445 @@
+import json
+import logging
+import mmap
+import pickle
+import struct
+import zlib
+from datetime import datetime
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from akame.utility.core import MonitoredContent
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# magic, format version and header length ahead of the JSON header
+MAGIC = b"AKAMEMC"
+FORMAT_VERSION = 1
+PREFIX = struct.Struct(">7sBI")
+
+
+def load_zstd() -> Optional[Any]:
+    """Function that loads zstandard if it is installed
+
+    Returns:
+        Optional[Any]: zstandard module; None if it is not installed
+    """
+    try:
+        return import_module("zstandard")
+    except ImportError:
+        return None
+
+
+zstd = load_zstd()
+
+
+def get_mc_header(mc: MonitoredContent) -> Dict[str, Any]:
+    """Function that gets what comparers need of MonitoredContent without
+    its content
+
+    Args:
+        mc (MonitoredContent): MonitoredContent to describe
+
+    Returns:
+        Dict[str, Any]: JSON-serializable header
+    """
+    return {
+        "timestamp": mc.timestamp.isoformat(),
+        "task_name": mc.task_name,
+        "target_url": mc.target_url,
+        "validators": mc.validators,
+        "fingerprint": mc.get_fingerprint(),
+        "raw_fingerprint": mc.raw_fingerprint,
+        "signatures": mc.get_signatures(),
+    }
+
+
+def load_mc_header(mc: MonitoredContent, header: Dict[str, Any]) -> None:
+    """Function that restores the fields of MonitoredContent from its header
+
+    Args:
+        mc (MonitoredContent): MonitoredContent to restore into
+        header (Dict[str, Any]): Header from `get_mc_header`
+    """
+    mc.timestamp = datetime.fromisoformat(header["timestamp"])
+    mc.task_name = header["task_name"]
+    mc.target_url = header["target_url"]
+    mc.validators = header["validators"]
+    mc.fingerprint = header["fingerprint"]
+    mc.raw_fingerprint = header["raw_fingerprint"]
+    mc.signatures = header["signatures"]
+
+
+def upgrade_legacy_mc(mc: MonitoredContent) -> MonitoredContent:
+    """Function that fills in the fields MonitoredContent pickled by older
+    versions lacks
+
+    Args:
+        mc (MonitoredContent): Unpickled MonitoredContent
+
+    Returns:
+        MonitoredContent: The same MonitoredContent, with every field set
+    """
+    mc.__dict__.setdefault("validators", {})
+    mc.__dict__.setdefault("raw_fingerprint", mc.get_fingerprint())
+    mc.get_signatures()
+    return mc
+
+
+def check_is_json_compatible(content: Any) -> bool:
+    """Function that checks whether the content comes back the same from
+    JSON, which turns tuples into lists and non-string keys into strings
+
+    Args:
+        content (Any): Content to check
+
+    Returns:
+        bool: Whether the content holds only dicts with string keys,
+            lists, strings, numbers, booleans and None
+    """
+    stack = [content]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if not all(type(key) is str for key in node):
+                return False
+            stack.extend(node.values())
+        elif type(node) is list:
+            stack.extend(node)
+        elif node is not None and type(node) not in (str, int, float, bool):
+            return False
+    return True
+
+
+def encode_content(
+    content: Any, allow_pickle: bool = False
+) -> Tuple[str, bytes]:
+    """Function that encodes the content by its type
+
+    Args:
+        content (Any): Content fetched through extractor
+        allow_pickle (bool, optional): Whether to pickle content that
+            does not round-trip through JSON. Defaults to False.
+
+    Returns:
+        Tuple[str, bytes]: Content type and encoded content
+
+    Raises:
+        TypeError: If the content does not round-trip through JSON and
+            pickling is not allowed
+    """
+    if content is None:
+        return "none", b""
+    if isinstance(content, str):
+        return "str", content.encode("utf-8")
+    if isinstance(content, bytes):
+        return "bytes", content
+    if check_is_json_compatible(content):
+        return "json", json.dumps(content, ensure_ascii=False).encode("utf-8")
+    if allow_pickle:
+        return "pickle", pickle.dumps(content)
+    raise TypeError(
+        f"Cannot cache content of type '{type(content).__name__}': "
+        "it does not round-trip through JSON, and pickling is not allowed"
+    )
+
+
+def decode_content(
+    content_type: str, data: bytes, allow_pickle: bool = False
+) -> Any:
+    """Function that decodes the content by its type
+
+    Args:
+        content_type (str): Content type from `encode_content`
+        data (bytes): Encoded content
+        allow_pickle (bool, optional): Whether to unpickle pickled content,
+            which must come from a trusted cache. Defaults to False.
+
+    Returns:
+        Any: Content
+
+    Raises:
+        ValueError: If the content is pickled and pickling is not allowed
+    """
+    if content_type == "none":
+        return None
+    if content_type == "str":
+        return data.decode("utf-8")
+    if content_type == "bytes":
+        return data
+    if content_type == "json":
+        return json.loads(data)
+    if content_type == "pickle":
+        if not allow_pickle:
+            raise ValueError("Refusing to unpickle cached content")
+        return pickle.loads(data)
+    raise ValueError(f"Unknown content type: '{content_type}'")
+
+
+def compress_payload(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstd.ZstdCompressor(level=3).compress(data)
+    if compression == "zlib":
+        return zlib.compress(data, 1)
+    return data
+
+
+def decompress_payload(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        if zstd is None:
+            raise ImportError("zstandard is needed to read this cache")
+        return zstd.ZstdDecompressor().decompress(data)
+    if compression == "zlib":
+        return zlib.decompress(data)
+    if compression == "none":
+        return data
+    raise ValueError(f"Unknown compression: '{compression}'")
+
+
+def encode_payload(
+    content: Any,
+    compression: Optional[str] = None,
+    min_compress_size: int = 1024,
+    allow_pickle: bool = False,
+) -> Tuple[Dict[str, Any], bytes]:
+    """Function that encodes and compresses the content into a payload
+
+    Args:
+        content (Any): Content to encode
+        compression (Optional[str], optional): 'zstd', 'zlib' or 'none'.
+            Defaults to None; zstd when installed, zlib otherwise.
+        min_compress_size (int, optional):
+            Bytes below which the content is stored uncompressed.
+            Defaults to 1024.
+        allow_pickle (bool, optional): Whether to pickle content that
+            does not round-trip through JSON. Defaults to False.
+
+    Returns:
+        Tuple[Dict[str, Any], bytes]: Header fields describing the payload,
+            and the payload
+    """
+    content_type, data = encode_content(content, allow_pickle)
+    if compression is None:
+        compression = "zstd" if zstd else "zlib"
+    if len(data) < min_compress_size:
+        compression = "none"
+    payload = compress_payload(data, compression)
+
+    header = {
+        "content_type": content_type,
+        "compression": compression,
+        "content_size": len(data),
+        "payload_size": len(payload),
+    }
+    return header, payload
+
+
+def pack_serialized(header: Dict[str, Any], payload: bytes) -> bytes:
+    header_bytes = json.dumps(header).encode("utf-8")
+    prefix = PREFIX.pack(MAGIC, FORMAT_VERSION, len(header_bytes))
+    return prefix + header_bytes + payload
+
+
+def dump_content(
+    content: Any,
+    compression: Optional[str] = None,
+    allow_pickle: bool = False,
+) -> bytes:
+    """Function that serializes the content alone, e.g. as a shared blob
+
+    Args:
+        content (Any): Content to serialize
+        compression (Optional[str], optional): 'zstd', 'zlib' or 'none'.
+            Defaults to None; zstd when installed, zlib otherwise.
+        allow_pickle (bool, optional): Whether to pickle content that
+            does not round-trip through JSON. Defaults to False.
+
+    Returns:
+        bytes: Prefix, JSON header and payload
+    """
+    return pack_serialized(
+        *encode_payload(content, compression, allow_pickle=allow_pickle)
+    )
+
+
+def dump_mc(
+    mc: MonitoredContent,
+    compression: Optional[str] = None,
+    min_compress_size: int = 1024,
+    allow_pickle: bool = False,
+) -> bytes:
+    """Function that serializes MonitoredContent into the cache format
+
+    Args:
+        mc (MonitoredContent): MonitoredContent to serialize
+        compression (Optional[str], optional): 'zstd', 'zlib' or 'none'.
+            Defaults to None; zstd when installed, zlib otherwise.
+        min_compress_size (int, optional):
+            Bytes below which the content is stored uncompressed.
+            Defaults to 1024.
+        allow_pickle (bool, optional): Whether to pickle content that
+            does not round-trip through JSON. Defaults to False.
+
+    Returns:
+        bytes: Prefix, JSON header and payload
+    """
+    payload_header, payload = encode_payload(
+        mc.content, compression, min_compress_size, allow_pickle
+    )
+    header = get_mc_header(mc)
+    header.update(payload_header)
+    return pack_serialized(header, payload)
+
+
+def check_is_serialized(data: bytes) -> bool:
+    """Function that checks whether the data is in the cache format rather
+    than a legacy pickle
+
+    Args:
+        data (bytes): Data or its first bytes
+
+    Returns:
+        bool: Whether the data starts with the format's magic
+    """
+    return data[: len(MAGIC)] == MAGIC
+
+
+def parse_header(data: Any) -> Tuple[Dict[str, Any], int]:
+    """Function that parses the header of serialized data
+
+    Args:
+        data (Any): Serialized data, as bytes or a memory map
+
+    Returns:
+        Tuple[Dict[str, Any], int]: Header and the offset of the payload
+    """
+    magic, version, header_size = PREFIX.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not an akame cache")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported cache format version: {version}")
+
+    start = PREFIX.size
+    header = json.loads(bytes(data[start : start + header_size]))
+    return header, start + header_size
+
+
+def decode_payload(
+    header: Dict[str, Any], data: bytes, allow_pickle: bool = False
+) -> Any:
+    """Function that decompresses and decodes the payload
+
+    Args:
+        header (Dict[str, Any]): Header describing the payload
+        data (bytes): Data starting with the payload
+        allow_pickle (bool, optional): Whether to unpickle pickled content.
+            Defaults to False.
+
+    Returns:
+        Any: Content
+    """
+    payload = data[: header["payload_size"]]
+    return decode_content(
+        header["content_type"],
+        decompress_payload(payload, header["compression"]),
+        allow_pickle,
+    )
+
+
+def load_mc(data: bytes, allow_pickle: bool = False) -> MonitoredContent:
+    """Function that deserializes MonitoredContent
+
+    Args:
+        data (bytes): Serialized data
+        allow_pickle (bool, optional): Whether to unpickle pickled content
+            and legacy pickled caches, which must be trusted.
+            Defaults to False.
+
+    Returns:
+        MonitoredContent: Deserialized MonitoredContent
+
+    Raises:
+        ValueError: If the data is pickled and pickling is not allowed
+    """
+    if not check_is_serialized(data):
+        if not allow_pickle:
+            raise ValueError("Refusing to load a legacy pickled cache")
+        logger.info("Reading a legacy pickled cache")
+        return upgrade_legacy_mc(pickle.loads(data))
+
+    header, offset = parse_header(data)
+    mc = MonitoredContent.__new__(MonitoredContent)
+    mc.content = decode_payload(header, data[offset:], allow_pickle)
+    load_mc_header(mc, header)
+    return mc
+
+
+def load_content(data: bytes, allow_pickle: bool = False) -> Any:
+    """Function that deserializes content dumped by `dump_content`
+
+    Args:
+        data (bytes): Serialized data
+        allow_pickle (bool, optional): Whether to unpickle pickled content.
+            Defaults to False.
+
+    Returns:
+        Any: Content
+    """
+    header, offset = parse_header(data)
+    return decode_payload(header, data[offset:], allow_pickle)
+
+
+def read_mc(path: Path, allow_pickle: bool = False) -> MonitoredContent:
+    """Function that reads MonitoredContent from a cache file
+
+    Args:
+        path (Path): Path to the cache file
+        allow_pickle (bool, optional): Whether to unpickle pickled content
+            and legacy pickled caches. Defaults to False.
+
+    Returns:
+        MonitoredContent: Cached MonitoredContent
+    """
+    return load_mc(path.read_bytes(), allow_pickle)
+
+
+def read_mc_header(path: Path) -> Optional[Dict[str, Any]]:
+    """Function that reads only the header of a cache file, through a
+    memory map so the payload is not read
+
+    Args:
+        path (Path): Path to the cache file
+
+    Returns:
+        Optional[Dict[str, Any]]: Header; None for a legacy pickled cache
+    """
+    with open(path, "rb") as f:
+        if not check_is_serialized(f.read(len(MAGIC))):
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            header, _ = parse_header(mapped)
+    return header
+
+
+def migrate_legacy_cache(path: Path) -> bool:
+    """Function that rewrites a legacy pickled cache in the cache format;
+    the cache is unpickled, so it must be trusted
+
+    Args:
+        path (Path): Path to the cache file
+
+    Returns:
+        bool: Whether the file was migrated
+    """
+    data = path.read_bytes()
+    if check_is_serialized(data):
+        return False
+
+    migrated = path.with_name(path.name + ".migrating")
+    mc = upgrade_legacy_mc(pickle.loads(data))
+    migrated.write_bytes(dump_mc(mc, allow_pickle=True))
+    migrated.replace(path)
+    logger.info(f"Migrated legacy cache '{path}'")
+    return True
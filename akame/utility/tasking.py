@@ -1,7 +1,9 @@
+import asyncio
 import logging
 import time
 from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, List
+from functools import partial
+from typing import Any, Awaitable, Callable, List
 from urllib.parse import urlparse
 
 logging.basicConfig(level=logging.INFO)
@@ -53,11 +55,17 @@ def loop_task(*ignore, seconds: float, max_rounds: int) -> Callable:
         def wrapper(*args, **kwargs):
             round = 0
             while round < max_rounds:
-                start_time = time.time()
+                start_time = time.monotonic()
                 round += 1
                 logger.info(f"Going round {round}")
                 function(*args, **kwargs)
-                used_interval = (time.time() - start_time) % seconds
+                used_seconds = time.monotonic() - start_time
+                if used_seconds > seconds:
+                    logger.warning(
+                        f"Round {round} overran the interval: skipping "
+                        f"{int(used_seconds // seconds)} deadline(s)"
+                    )
+                used_interval = used_seconds % seconds
                 time.sleep(seconds - used_interval)
 
         return wrapper
@@ -65,6 +73,58 @@ def loop_task(*ignore, seconds: float, max_rounds: int) -> Callable:
     return decorator
 
 
+def loop_task_async(*ignore, seconds: float, max_rounds: int) -> Callable:
+    """Function that decorates the coroutine function with looping
+
+    Args:
+        seconds (float): Interval in seconds
+        max_rounds (int): Maximum rounds to run
+
+    Returns:
+        Callable: Decorated coroutine function to be awaited
+    """
+    check_loop_seconds(seconds)
+
+    logger.info(
+        f"Looping the task every {seconds} seconds "
+        f"until {max_rounds} rounds"
+    )
+
+    def decorator(function) -> Callable:
+        async def wrapper(*args, **kwargs):
+            round = 0
+            while round < max_rounds:
+                start_time = time.monotonic()
+                round += 1
+                logger.info(f"Going round {round}")
+                await function(*args, **kwargs)
+                used_seconds = time.monotonic() - start_time
+                if used_seconds > seconds:
+                    logger.warning(
+                        f"Round {round} overran the interval: skipping "
+                        f"{int(used_seconds // seconds)} deadline(s)"
+                    )
+                used_interval = used_seconds % seconds
+                await asyncio.sleep(seconds - used_interval)
+
+        return wrapper
+
+    return decorator
+
+
+async def run_in_executor(function: Callable, *args, **kwargs) -> Any:
+    """Function that runs a blocking function in the loop's executor
+
+    Args:
+        function (Callable): Blocking function to run
+
+    Returns:
+        Any: Result of the function
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, partial(function, *args, **kwargs))
+
+
 # slightly modified from
 # https://stackoverflow.com/questions/7207309/how-to-run-functions-in-parallel
 def run_tasks_in_parallel(tasks: List[Callable]):
@@ -77,3 +137,33 @@ def run_tasks_in_parallel(tasks: List[Callable]):
         running_tasks = [executor.submit(task) for task in tasks]
         for running_task in running_tasks:
             running_task.result()
+
+
+def run_tasks_asynchronously(
+    tasks: List[Callable[[asyncio.Semaphore], Awaitable]],
+    max_in_flight: int = 100,
+) -> None:
+    """Function that runs multiple monitoring tasks on one event loop
+
+    Args:
+        tasks (List[Callable[[asyncio.Semaphore], Awaitable]]):
+            List of coroutine functions that take the shared semaphore
+            bounding in-flight requests
+        max_in_flight (int, optional):
+            Maximum number of concurrent requests (and of executor threads
+            for blocking steps). Defaults to 100.
+    """
+
+    async def run_all():
+        semaphore = asyncio.Semaphore(max_in_flight)
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            asyncio.get_running_loop().set_default_executor(executor)
+            results = await asyncio.gather(
+                *(task(semaphore) for task in tasks), return_exceptions=True
+            )
+
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Monitoring task failed: {result!r}")
+
+    asyncio.run(run_all())
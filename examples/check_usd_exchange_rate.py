@@ -1,6 +1,7 @@
 from os import environ
 
 from akame import Monitor, init
+from akame.comparison import NumericThresholdComparer
 from akame.notification.pushover import PushoverNotifier
 
 
@@ -23,6 +24,7 @@ def main() -> None:
         target_url=(r"https://api.exchangeratesapi.io/latest?base=USD"),
         loop_seconds=300,  # every 5 minutes
         loop_max_rounds=8640,  # for a month
+        comparer=NumericThresholdComparer(rel_threshold=0.01),  # moves by 1%
         notifiers=notifiers,
     )
 
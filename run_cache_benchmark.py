@@ -0,0 +1,78 @@
+import pickle
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Callable, Dict
+
+from akame.utility.core import MonitoredContent
+from akame.utility.serialization import dump_mc, read_mc, read_mc_header
+
+
+def get_sample_mc(n_lines: int = 20000) -> MonitoredContent:
+    """Function that builds a page-sized MonitoredContent to benchmark"""
+    content = "".join(
+        f'<tr><td class="item">Item {i}</td>'
+        f"<td>NT$ {i * 37 % 9000}</td></tr>\n"
+        for i in range(n_lines)
+    )
+    return MonitoredContent(
+        content=content, task_name="benchmark", target_url="https://x"
+    )
+
+
+def time_function(function: Callable[[], object], n_rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n_rounds):
+        function()
+    return (time.perf_counter() - start) / n_rounds
+
+
+def main(n_rounds: int = 20) -> Dict[str, Dict[str, float]]:
+    """Function that compares the cache format against pickle
+
+    Args:
+        n_rounds (int, optional): Rounds to average over. Defaults to 20.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Size and MB/s of writes and reads
+    """
+    mc = get_sample_mc()
+    size = len(mc.content.encode("utf-8")) / 2 ** 20
+
+    with TemporaryDirectory() as folder:
+        path_pickle = Path(folder) / "pickle.akamecache"
+        path_format = Path(folder) / "format.akamecache"
+
+        def write_pickle():
+            path_pickle.write_bytes(pickle.dumps(mc))
+
+        def read_pickle():
+            pickle.loads(path_pickle.read_bytes())
+
+        def write_format():
+            path_format.write_bytes(dump_mc(mc))
+
+        results = {
+            "pickle": {
+                "write_mb_s": size / time_function(write_pickle, n_rounds),
+                "read_mb_s": size / time_function(read_pickle, n_rounds),
+                "file_kb": path_pickle.stat().st_size / 2 ** 10,
+            },
+            "format": {
+                "write_mb_s": size / time_function(write_format, n_rounds),
+                "read_mb_s": size
+                / time_function(lambda: read_mc(path_format), n_rounds),
+                "file_kb": path_format.stat().st_size / 2 ** 10,
+                "header_reads_s": 1
+                / time_function(lambda: read_mc_header(path_format), n_rounds),
+            },
+        }
+
+    for name, metrics in results.items():
+        print(name, {key: round(value, 1) for key, value in metrics.items()})
+    return results
+
+
+if __name__ == "__main__":
+    # benchmark the cache format against pickle
+    main()
@@ -0,0 +1,150 @@
+import asyncio
+import io
+
+import pytest
+import requests
+
+from akame.extraction import BasicExtractor
+from akame.extraction.coalescing import SingleFlight
+from akame.utility.caching import CacheManagerBase
+from akame.utility.core import MonitoredContent
+
+
+def get_response(body=b"", status_code=200, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(body)
+    response.encoding = "utf-8"
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeSession:
+    """Session that answers from a list of responses, or with a function
+    of the URL, and records each request"""
+
+    def __init__(self, responses):
+        self.responses = responses if callable(responses) else list(responses)
+        self.requests = []
+
+    def get(self, url, headers, stream=False):
+        self.requests.append(
+            {"url": url, "headers": dict(headers), "stream": stream}
+        )
+        if callable(self.responses):
+            return self.responses(url)
+        return self.responses.pop(0)
+
+
+class FakeRateLimiter:
+    """Rate limiter that never waits, and asks to retry `retries` times"""
+
+    def __init__(self, retries=0):
+        self.max_retries = retries
+        self.retries = retries
+
+    def wait(self, url):
+        pass
+
+    def handle_response(self, url, response):
+        if self.retries:
+            self.retries -= 1
+            return True
+        return False
+
+
+class FakeExtractor:
+    """Extractor that returns the given contents in turn; exceptions among
+    them are raised instead. Counts the requests `in_flight` when given"""
+
+    not_modified = False
+    validators = {}
+
+    def __init__(self, contents, in_flight=None):
+        self.contents = list(contents)
+        self.in_flight = in_flight
+
+    def check_uses_cached_validators(self):
+        return False
+
+    def main(self, target_url):
+        content = self.contents.pop(0)
+        if isinstance(content, Exception):
+            raise content
+        return content
+
+    async def main_async(self, target_url):
+        if self.in_flight is not None:
+            in_flight = self.in_flight
+            in_flight.current += 1
+            in_flight.max = max(in_flight.max, in_flight.current)
+            await asyncio.sleep(0.01)
+            in_flight.current -= 1
+        return self.main(target_url)
+
+
+class FakeCacheManager(CacheManagerBase):
+    """Cache manager that keeps every version in a list"""
+
+    def __init__(self, task_name="task"):
+        super().__init__(task_name)
+        self.versions = []
+
+    def cache_task_mc(self, mc):
+        self.versions.append(mc)
+
+    def get_newest_cache(self):
+        return self.versions[-1] if self.versions else MonitoredContent()
+
+
+@pytest.fixture
+def make_response():
+    return get_response
+
+
+@pytest.fixture
+def make_session():
+    return FakeSession
+
+
+@pytest.fixture
+def make_rate_limiter():
+    return FakeRateLimiter
+
+
+@pytest.fixture
+def make_extractor():
+    return FakeExtractor
+
+
+@pytest.fixture
+def make_cache_manager():
+    return FakeCacheManager
+
+
+@pytest.fixture
+def make_basic_extractor():
+    def make_basic_extractor(session, rate_limiter=None, **kwargs):
+        """Function that makes a BasicExtractor requesting through the
+        session, with no throttling and no shared results"""
+        extractor = BasicExtractor(**kwargs)
+        extractor.session_pool = type(
+            "Pool", (), {"get_session": lambda self, url: session}
+        )()
+        extractor.rate_limiter = rate_limiter or FakeRateLimiter()
+        extractor.single_flight = SingleFlight(freshness_seconds=0)
+        return extractor
+
+    return make_basic_extractor
+
+
+@pytest.fixture
+def compare():
+    def compare(comparer, content_0, content_1):
+        comparer.main(
+            mc_0=MonitoredContent(content=content_0),
+            mc_1=MonitoredContent(content=content_1),
+        )
+        return comparer
+
+    return compare
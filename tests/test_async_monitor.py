@@ -0,0 +1,63 @@
+import pytest
+
+from akame import AsyncMonitor, run_monitors_async
+from akame.notification.core import NotifierBase
+
+
+class InFlight:
+    def __init__(self):
+        self.current = 0
+        self.max = 0
+
+
+class SilentNotifier(NotifierBase):
+    def notify_condition_met(self):
+        pass
+
+    def notify_condition_notmet(self):
+        pass
+
+
+@pytest.fixture
+def get_monitors(make_extractor, make_cache_manager):
+    def get_monitors(in_flight, n_monitors, failing=()):
+        return [
+            AsyncMonitor(
+                f"https://example.com/{i}",
+                task_name=f"task {i}",
+                loop_seconds=0.01,
+                loop_max_rounds=2,
+                extractor=make_extractor(
+                    [ConnectionError("unreachable")] * 2
+                    if i in failing
+                    else [f"{i} 1", f"{i} 2"],
+                    in_flight,
+                ),
+                notifiers=[SilentNotifier()],
+                cache_manager=make_cache_manager(f"task {i}"),
+            )
+            for i in range(n_monitors)
+        ]
+
+    return get_monitors
+
+
+def test_requests_in_flight_are_bounded(get_monitors):
+    in_flight = InFlight()
+    monitors = get_monitors(in_flight, 6)
+    run_monitors_async(monitors, max_in_flight=2)
+
+    assert in_flight.max == 2
+    for monitor in monitors:
+        assert len(monitor.cache_manager.versions) == 2
+
+
+def test_failing_monitors_do_not_stop_the_others(get_monitors):
+    monitors = get_monitors(InFlight(), 3, failing={1})
+    run_monitors_async(monitors, max_in_flight=10)
+
+    assert [len(monitor.cache_manager.versions) for monitor in monitors] == [
+        2,
+        0,
+        2,
+    ]
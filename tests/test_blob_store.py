@@ -0,0 +1,113 @@
+from akame.utility.caching import BlobStore, TaskCacheManager
+from akame.utility.core import MonitoredContent
+
+
+def get_cache_manager(tmp_path, blob_store, task_name="task", **kwargs):
+    return TaskCacheManager(
+        task_name,
+        path_cache_folder=tmp_path,
+        memory_cache=None,
+        blob_store=blob_store,
+        **kwargs,
+    )
+
+
+def test_put_writes_each_content_once(tmp_path):
+    blob_store = BlobStore(tmp_path / "blobs")
+    size = blob_store.put("ab12", "content")
+    assert blob_store.put("ab12", "content") == size
+    assert blob_store.get("ab12") == "content"
+    assert blob_store.get_stats() == {
+        "writes": 1,
+        "dedups": 1,
+        "removals": 0,
+        "blobs": 1,
+    }
+
+
+def test_last_release_removes_the_blob(tmp_path):
+    blob_store = BlobStore(tmp_path / "blobs")
+    blob_store.put("ab12", "content")
+    blob_store.put("ab12", "content")
+
+    blob_store.release("ab12")
+    assert blob_store.get_path_blob("ab12").exists()
+    blob_store.release("ab12")
+    assert not blob_store.get_path_blob("ab12").exists()
+    assert blob_store.get_stats()["removals"] == 1
+    blob_store.release(None)
+
+
+def test_tasks_share_blobs_and_release_evicted_versions(tmp_path):
+    blob_store = BlobStore(tmp_path / "blobs")
+    task_a = get_cache_manager(tmp_path, blob_store, "a", n_versions=2)
+    task_b = get_cache_manager(tmp_path, blob_store, "b", n_versions=2)
+
+    for content in ["same", "same"]:
+        task_a.cache_task_mc(MonitoredContent(content=content))
+        task_b.cache_task_mc(MonitoredContent(content=content))
+    assert blob_store.get_stats()["writes"] == 1
+    assert blob_store.get_stats()["dedups"] == 3
+
+    digest = task_a.manifest["versions"][-1]["digest"]
+    for content in ["x", "y"]:
+        task_a.cache_task_mc(MonitoredContent(content=content))
+    assert blob_store.references[digest] == 2
+    for content in ["x", "y"]:
+        task_b.cache_task_mc(MonitoredContent(content=content))
+    assert digest not in blob_store.references
+    assert not blob_store.get_path_blob(digest).exists()
+    assert task_b.get_cache(age=1).content == "x"
+
+
+def test_references_are_rebuilt_from_manifests(tmp_path):
+    blob_store = BlobStore(tmp_path / "blobs")
+    cache_manager = get_cache_manager(tmp_path, blob_store)
+    cache_manager.cache_task_mc(MonitoredContent(content="kept"))
+    blob_store.put("ff00", "orphan")
+
+    restarted = BlobStore(tmp_path / "blobs")
+    digest = cache_manager.manifest["versions"][-1]["digest"]
+    assert restarted.load_references() == {digest: 1}
+    assert not restarted.get_path_blob("ff00").exists()
+    assert restarted.get(digest) == "kept"
+
+
+def test_resetting_a_task_releases_its_blobs(tmp_path):
+    blob_store = BlobStore(tmp_path / "blobs")
+    cache_manager = get_cache_manager(tmp_path, blob_store)
+    cache_manager.cache_task_mc(MonitoredContent(content="a"))
+    digest = cache_manager.manifest["versions"][-1]["digest"]
+
+    get_cache_manager(tmp_path, blob_store)
+    assert not blob_store.get_path_blob(digest).exists()
+
+
+def test_cache_folders_keep_their_own_blobs(tmp_path):
+    task_a = TaskCacheManager(
+        "a", path_cache_folder=tmp_path / "a", memory_cache=None
+    )
+    task_a.cache_task_mc(MonitoredContent(content="kept"))
+    task_b = TaskCacheManager(
+        "b", path_cache_folder=tmp_path / "b", memory_cache=None
+    )
+    task_b.cache_task_mc(MonitoredContent(content="other"))
+
+    assert task_a.blob_store.path_blob_folder == tmp_path / "a" / "blobs"
+    assert task_b.blob_store.path_blob_folder == tmp_path / "b" / "blobs"
+    # a new process collecting the blobs of either folder keeps them
+    for folder in ["a", "b"]:
+        BlobStore(tmp_path / folder / "blobs").load_references()
+    assert task_a.get_newest_cache().content == "kept"
+    assert task_b.get_newest_cache().content == "other"
+
+
+def test_blobs_of_other_cache_folders_are_kept(tmp_path):
+    blob_store = BlobStore(tmp_path / "a" / "blobs")
+    cache_manager = get_cache_manager(tmp_path / "b", blob_store)
+    cache_manager.cache_task_mc(MonitoredContent(content="kept"))
+    digest = cache_manager.manifest["versions"][-1]["digest"]
+
+    restarted = BlobStore(tmp_path / "a" / "blobs")
+    assert restarted.load_references() == {digest: 1}
+    assert restarted.get(digest) == "kept"
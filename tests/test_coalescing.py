@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+from akame.extraction import BasicExtractor, SelectorExtractor
+from akame.extraction.coalescing import SingleFlight
+
+
+def test_single_flight_shares_concurrent_calls():
+    single_flight = SingleFlight(freshness_seconds=0)
+    calls = []
+    barrier = threading.Barrier(8)
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return "content"
+
+    def request():
+        barrier.wait()
+        return single_flight.do("key", fetch)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(request()))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["content"] * 8
+    assert len(calls) == 1
+    assert single_flight.get_stats()["shared"] == 7
+
+
+def test_single_flight_reuses_fresh_results():
+    single_flight = SingleFlight(freshness_seconds=60)
+    assert single_flight.do("key", lambda: 1) == 1
+    assert single_flight.do("key", lambda: 2) == 1
+    assert single_flight.do("other", lambda: 3) == 3
+    assert single_flight.get_stats() == {"calls": 2, "shared": 0, "fresh": 1}
+
+
+def test_single_flight_does_not_keep_errors():
+    single_flight = SingleFlight(freshness_seconds=60)
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        single_flight.do("key", fail)
+    assert single_flight.do("key", lambda: "retried") == "retried"
+
+
+def get_loaded_extractor(extractor, target_url="https://example.com/api"):
+    extractor.update_target_url(target_url=target_url)
+    extractor.load_request()
+    return extractor
+
+
+def test_request_key_covers_selectors():
+    twd = get_loaded_extractor(SelectorExtractor(["$.rates.TWD"]))
+    jpy = get_loaded_extractor(SelectorExtractor(["$.rates.JPY"]))
+    same = get_loaded_extractor(SelectorExtractor(["$.rates.TWD"]))
+    assert twd.get_request_key() != jpy.get_request_key()
+    assert twd.get_request_key() == same.get_request_key()
+
+
+def test_request_key_covers_extractor_and_url():
+    basic = get_loaded_extractor(BasicExtractor())
+    selector = get_loaded_extractor(SelectorExtractor(["$.a"]))
+    other_url = get_loaded_extractor(BasicExtractor(), "https://example.org")
+    assert basic.get_request_key() != selector.get_request_key()
+    assert basic.get_request_key() != other_url.get_request_key()
+
+
+def test_shared_parsed_content_is_copied():
+    single_flight = SingleFlight(freshness_seconds=60)
+    parsed = {"$.rates.TWD": [30.5]}
+
+    extractors = []
+    for _ in range(2):
+        extractor = SelectorExtractor(["$.rates.TWD"])
+        extractor.single_flight = single_flight
+        extractor.fetch_content = lambda: (parsed, {}, False)
+        extractors.append(extractor)
+
+    content_0 = extractors[0].main(target_url="https://example.com/api")
+    content_0["$.rates.TWD"].append(0)
+    content_1 = extractors[1].main(target_url="https://example.com/api")
+    assert content_1 == {"$.rates.TWD": [30.5]}
+    assert parsed == {"$.rates.TWD": [30.5]}
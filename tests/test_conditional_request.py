@@ -0,0 +1,66 @@
+from akame import Monitor
+
+TARGET_URL = "https://example.com/page"
+
+
+def test_validators_are_sent_and_304_skips_the_round(
+    make_session, make_response, make_basic_extractor
+):
+    session = make_session([make_response(status_code=304)])
+    extractor = make_basic_extractor(session, conditional_request=True)
+    extractor.load_cached_validators(
+        {"etag": '"v1"', "last_modified": "Sun, 18 Oct 2026 07:00:00 GMT"}
+    )
+
+    assert extractor.main(TARGET_URL) is None
+    assert extractor.not_modified
+    headers = session.requests[0]["headers"]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Sun, 18 Oct 2026 07:00:00 GMT"
+    # kept for the next round, as no content is cached this round
+    assert extractor.validators["etag"] == '"v1"'
+
+
+def test_new_validators_are_picked_up(
+    make_session, make_response, make_basic_extractor
+):
+    session = make_session([make_response(b"new", headers={"ETag": '"v2"'})])
+    extractor = make_basic_extractor(session, conditional_request=True)
+    extractor.load_cached_validators({"etag": '"v1"'})
+
+    assert extractor.main(TARGET_URL) == "new"
+    assert not extractor.not_modified
+    assert extractor.validators == {"etag": '"v2"'}
+
+
+def test_first_round_sends_no_validators(
+    make_session, make_response, make_basic_extractor
+):
+    session = make_session([make_response(b"body")])
+    extractor = make_basic_extractor(session, conditional_request=True)
+    extractor.load_cached_validators(None)
+    extractor.main(TARGET_URL)
+    assert "If-None-Match" not in session.requests[0]["headers"]
+
+
+def test_monitor_caches_the_validators_and_skips_304_rounds(
+    make_session, make_response, make_basic_extractor, make_cache_manager
+):
+    session = make_session(
+        [
+            make_response(b"body", headers={"ETag": '"v1"'}),
+            make_response(status_code=304),
+        ]
+    )
+    monitor = Monitor(
+        TARGET_URL,
+        task_name="task",
+        extractor=make_basic_extractor(session, conditional_request=True),
+        cache_manager=make_cache_manager(),
+    )
+    monitor.run_round()
+    monitor.run_round()
+
+    assert len(monitor.cache_manager.versions) == 1
+    assert monitor.cache_manager.versions[0].validators == {"etag": '"v1"'}
+    assert session.requests[1]["headers"]["If-None-Match"] == '"v1"'
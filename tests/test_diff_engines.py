@@ -0,0 +1,109 @@
+import random
+import time
+
+import pytest
+
+from akame.comparison.delta.engines import (
+    HunkDiffEngine,
+    SequenceMatcherEngine,
+    diff_tokens_myers,
+    get_common_prefix_length,
+    get_common_suffix_length,
+    tokenize,
+)
+
+
+def get_lcs_length(a, b):
+    lengths = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            lengths[i + 1][j + 1] = (
+                lengths[i][j] + 1
+                if x == y
+                else max(lengths[i][j + 1], lengths[i + 1][j])
+            )
+    return lengths[-1][-1]
+
+
+def check_blocks(a, b, blocks):
+    end_a = end_b = 0
+    for i, j, size in blocks:
+        assert i >= end_a and j >= end_b
+        assert a[i : i + size] == b[j : j + size]
+        end_a, end_b = i + size, j + size
+    assert end_a <= len(a) and end_b <= len(b)
+
+
+def test_common_prefix_and_suffix():
+    assert get_common_prefix_length("abcx", "abcy") == 3
+    assert get_common_prefix_length("", "abc") == 0
+    assert get_common_suffix_length("xabc", "yabc", 4) == 3
+    assert get_common_suffix_length("aa", "aa", 1) == 1
+
+
+def test_tokenize_joins_back():
+    text = "line one\nline two\n"
+    assert tokenize(text, max_line_length=200) == ["line one\n", "line two\n"]
+    minified = '{"a": 1, "b": [2, 3]}' * 50
+    tokens = tokenize(minified, max_line_length=200)
+    assert len(tokens) > 1
+    assert "".join(tokens) == minified
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_myers_finds_a_longest_common_subsequence(seed):
+    rng = random.Random(seed)
+    a = [rng.randrange(4) for _ in range(rng.randrange(30))]
+    b = [rng.randrange(4) for _ in range(rng.randrange(30))]
+    blocks = diff_tokens_myers(a, b, max_edits=100, deadline=1e18)
+
+    check_blocks(a, b, blocks)
+    assert sum(size for _, _, size in blocks) == get_lcs_length(a, b)
+
+
+def test_myers_gives_up_beyond_its_budgets():
+    a, b = list(range(50)), list(range(50, 100))
+    assert diff_tokens_myers(a, b, max_edits=10, deadline=1e18) is None
+    deadline = time.monotonic() - 1
+    assert diff_tokens_myers(a, b, max_edits=100, deadline=deadline) is None
+
+
+@pytest.mark.parametrize(
+    "engine", [HunkDiffEngine(), SequenceMatcherEngine()]
+)
+def test_engines_keep_the_boundary_blocks(engine):
+    a = "header\nprice: 100\nfooter\n"
+    b = "new\nheader\nprice: 105\nfooter\n"
+    blocks = engine.get_matching_blocks(a, b)
+
+    check_blocks(a, b, blocks)
+    assert blocks[0] == (0, 0, 0)
+    assert blocks[-1].a + blocks[-1].size == len(a)
+    assert blocks[-1].b + blocks[-1].size == len(b)
+
+
+def test_hunk_engine_refines_changed_lines():
+    a = "".join(f"line {i}\n" for i in range(100))
+    b = a.replace("line 50\n", "line 5O\n")
+    blocks = HunkDiffEngine().get_matching_blocks(a, b)
+
+    check_blocks(a, b, blocks)
+    # only the changed character is left unmatched
+    assert sum(block.size for block in blocks) == len(a) - 1
+
+
+def test_hunk_engine_falls_back_to_a_coarse_delta():
+    a = "".join(f"{i}\n" for i in range(200))
+    b = "".join(f"{i}\n" for i in range(200, 400))
+    engine = HunkDiffEngine(max_edits=10)
+    blocks = engine.get_matching_blocks("x" + a + "y", "x" + b + "y")
+
+    check_blocks("x" + a + "y", "x" + b + "y", blocks)
+    # the common prefix "x" and suffix "99\ny" around one replaced block
+    assert [block.size for block in blocks if block.size] == [1, 4]
+
+
+def test_hunk_engine_skips_strings_beyond_max_chars():
+    engine = HunkDiffEngine(max_chars=10)
+    blocks = engine.get_matching_blocks("ab" * 10 + "c", "ab" * 10 + "d")
+    assert [tuple(block) for block in blocks] == [(0, 0, 20), (21, 21, 0)]
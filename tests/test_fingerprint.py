@@ -0,0 +1,46 @@
+from akame.comparison import BasicComparer
+from akame.utility.caching import CachedMonitoredContent
+from akame.utility.core import MonitoredContent, get_content_fingerprint
+from akame.utility.serialization import get_mc_header
+
+
+def test_fingerprint_tells_content_types_apart():
+    assert get_content_fingerprint(None) is None
+    assert get_content_fingerprint("a") != get_content_fingerprint(b"a")
+    assert get_content_fingerprint("1") != get_content_fingerprint(1)
+    assert get_content_fingerprint("") != get_content_fingerprint(b"")
+
+
+def test_fingerprint_ignores_key_order():
+    assert get_content_fingerprint(
+        {"a": 1, "b": [1, 2]}
+    ) == get_content_fingerprint({"b": [1, 2], "a": 1})
+    assert get_content_fingerprint([1, 2]) != get_content_fingerprint([2, 1])
+
+
+def test_fingerprint_covers_content_json_cannot_encode():
+    assert get_content_fingerprint({1, 2}) == get_content_fingerprint({1, 2})
+    assert get_content_fingerprint(object()) != get_content_fingerprint(
+        object()
+    )
+
+
+def test_fingerprint_is_computed_once():
+    mc = MonitoredContent(content="a")
+    fingerprint = mc.get_fingerprint()
+    mc.content = "b"
+    assert mc.get_fingerprint() == fingerprint
+
+
+def test_equal_fingerprints_spare_loading_the_archived_content():
+    mc_0 = MonitoredContent(content="same")
+
+    def load_content():
+        raise AssertionError("the archived content was loaded")
+
+    comparer = BasicComparer()
+    comparer.main(
+        mc_0=CachedMonitoredContent(get_mc_header(mc_0), load_content),
+        mc_1=MonitoredContent(content="same"),
+    )
+    assert comparer.status_code == 0
@@ -0,0 +1,151 @@
+import random
+
+import pytest
+
+from akame.utility import serialization
+from akame.utility.core import MonitoredContent
+from akame.utility.history import (
+    HistoryCacheManager,
+    apply_delta_ops,
+    get_delta_ops,
+)
+
+
+def get_texts(n_versions, seed=0):
+    rng = random.Random(seed)
+    lines = [f"line {i}: {rng.random()}\n" for i in range(200)]
+    texts = []
+    for _ in range(n_versions):
+        lines[rng.randrange(len(lines))] = f"edited: {rng.random()}\n"
+        texts.append("".join(lines))
+    return texts
+
+
+def get_history(tmp_path, **kwargs):
+    return HistoryCacheManager("task", path_cache_folder=tmp_path, **kwargs)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_delta_ops_rebuild_the_new_version(seed):
+    text_a, text_b = get_texts(2, seed)
+    ops = get_delta_ops(text_a, text_b)
+    assert apply_delta_ops(text_a, ops) == text_b
+    assert sum(len(op) for op in ops if isinstance(op, str)) < len(text_b)
+
+
+def test_every_version_is_rebuilt_after_a_restart(tmp_path):
+    texts = get_texts(20)
+    history = get_history(tmp_path, keyframe_interval=8)
+    for text in texts:
+        history.cache_task_mc(MonitoredContent(content=text))
+
+    kinds = [entry["kind"] for entry in history.manifest["versions"]]
+    assert kinds.count("keyframe") == 3
+    assert kinds[0] == kinds[8] == kinds[16] == "keyframe"
+
+    reopened = get_history(tmp_path, reset_task_cache=False)
+    for version in reversed(range(20)):
+        assert reopened.get_version(version).content == texts[version]
+    assert reopened.get_version(20) is None
+
+
+def test_repeated_content_takes_no_file(tmp_path):
+    history = get_history(tmp_path)
+    for content in ["a" * 100, "a" * 100]:
+        history.cache_task_mc(MonitoredContent(content=content))
+
+    assert [entry["kind"] for entry in history.manifest["versions"]] == [
+        "keyframe",
+        "repeat",
+    ]
+    assert history.manifest["versions"][1]["size"] == 0
+    assert history.get_cache(age=0).content == "a" * 100
+
+
+def test_large_deltas_are_written_as_keyframes(tmp_path):
+    history = get_history(tmp_path)
+    for seed in range(2):
+        content = "".join(get_texts(1, seed))
+        history.cache_task_mc(MonitoredContent(content=content))
+    assert history.get_stats()["keyframes"] == 2
+
+
+def test_structured_content_keeps_its_type(tmp_path):
+    history = get_history(tmp_path)
+    contents = [{"rates": {"TWD": 30 + i / 10}} for i in range(3)]
+    for content in contents:
+        history.cache_task_mc(MonitoredContent(content=content))
+    assert history.get_cache(age=1).content == contents[1]
+
+
+def test_budget_drops_the_oldest_keyframe_groups(tmp_path):
+    texts = get_texts(12)
+    history = get_history(tmp_path, keyframe_interval=4, max_bytes=1)
+    for text in texts:
+        history.cache_task_mc(MonitoredContent(content=text))
+
+    versions = history.manifest["versions"]
+    # the newest keyframe and its deltas are always kept
+    assert [entry["version"] for entry in versions] == [8, 9, 10, 11]
+    assert versions[0]["kind"] == "keyframe"
+    assert history.get_version(7) is None
+    assert history.get_version(8).content == texts[8]
+    n_files = len(list(history.path_cache_folder_th.glob("*.akame*")))
+    assert n_files == 4
+
+
+def test_stats_show_the_savings(tmp_path):
+    history = get_history(tmp_path)
+    for text in get_texts(10):
+        history.cache_task_mc(MonitoredContent(content=text))
+    stats = history.get_stats()
+    assert stats["versions"] == 10
+    assert stats["bytes"] < stats["full_bytes"] / 3
+
+
+def test_index_is_appended_to_and_compacted(tmp_path):
+    texts = get_texts(40)
+    history = get_history(tmp_path, keyframe_interval=4, max_bytes=1)
+    for text in texts[:3]:
+        history.cache_task_mc(MonitoredContent(content=text))
+    assert len(history.path_index.read_text().splitlines()) == 3
+
+    for text in texts[3:]:
+        history.cache_task_mc(MonitoredContent(content=text))
+        n_lines = len(history.path_index.read_text().splitlines())
+        assert n_lines <= 2 * len(history.manifest["versions"])
+
+    reopened = get_history(tmp_path, reset_task_cache=False)
+    assert reopened.manifest == history.manifest
+    assert reopened.get_newest_cache().content == texts[-1]
+
+
+def test_torn_index_line_is_dropped(tmp_path):
+    texts = get_texts(3)
+    history = get_history(tmp_path)
+    for text in texts[:2]:
+        history.cache_task_mc(MonitoredContent(content=text))
+    with open(history.path_index, "a") as f:
+        f.write('{"version": 2, "kind"')
+
+    reopened = get_history(tmp_path, reset_task_cache=False)
+    assert reopened.manifest["head"] == 2
+    reopened.cache_task_mc(MonitoredContent(content=texts[2]))
+    reopened = get_history(tmp_path, reset_task_cache=False)
+    assert reopened.get_version(2).content == texts[2]
+
+
+def test_keyframes_are_encoded_only_when_written(tmp_path, monkeypatch):
+    dumped = []
+
+    def dump_content(content, *args, **kwargs):
+        dumped.append(type(content).__name__)
+        return serialization.dump_content(content, *args, **kwargs)
+
+    monkeypatch.setattr("akame.utility.history.dump_content", dump_content)
+    history = get_history(tmp_path)
+    texts = get_texts(2)
+    for text in [texts[0], texts[0], texts[1]]:
+        history.cache_task_mc(MonitoredContent(content=text))
+
+    assert dumped == ["bytes", "list"]
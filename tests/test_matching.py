@@ -0,0 +1,133 @@
+import random
+
+import pytest
+
+from akame.comparison import BasicComparer
+from akame.comparison.delta.engines import SequenceMatcherEngine
+from akame.comparison.matching import (
+    AhoCorasick,
+    MultiPatternMatcher,
+    check_literal,
+)
+
+
+def find_naively(patterns, text):
+    return {
+        (index, start, start + len(pattern))
+        for index, pattern in enumerate(patterns)
+        for start in range(len(text) - len(pattern) + 1)
+        if text.startswith(pattern, start)
+    }
+
+
+def test_aho_corasick_finds_overlapping_occurrences():
+    patterns = ["he", "she", "his", "hers"]
+    automaton = AhoCorasick(patterns)
+    assert set(automaton.iterate_occurrences("ushers")) == {
+        (1, 1, 4),
+        (0, 2, 4),
+        (3, 2, 6),
+    }
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_aho_corasick_matches_a_naive_search(seed):
+    rng = random.Random(seed)
+    patterns = list(
+        {
+            "".join(rng.choice("ab") for _ in range(rng.randint(1, 4)))
+            for _ in range(6)
+        }
+    )
+    text = "".join(rng.choice("abc") for _ in range(60))
+    automaton = AhoCorasick(patterns)
+    assert set(automaton.iterate_occurrences(text)) == find_naively(
+        patterns, text
+    )
+
+
+def test_aho_corasick_scans_a_window():
+    automaton = AhoCorasick(["ab"])
+    assert list(automaton.iterate_occurrences("abab", 1, 4)) == [(0, 2, 4)]
+
+
+def test_check_literal():
+    assert check_literal("in stock")
+    assert check_literal("加入購物車")
+    assert not check_literal(r"NT\$\s*\d+")
+    assert not check_literal("")
+
+
+def test_matcher_finds_literals_and_regexes():
+    matcher = MultiPatternMatcher(["in stock", r"NT\$\d+", "in stock"])
+    assert matcher.patterns == ["in stock", r"NT\$\d+"]
+    assert matcher.literal_indices == [0]
+    occurrences = matcher.find_occurrences("in stock at NT$120")
+    assert occurrences == {(0, 0, 8), (1, 12, 18)}
+    assert matcher.get_patterns(occurrences) == {"in stock", r"NT\$\d+"}
+
+
+def test_matcher_keeps_flags_and_backreferences():
+    matcher = MultiPatternMatcher(
+        [r"(?i)in stock", r"(\w+) \1", r"NT\$\d+", r"\d+ left"]
+    )
+    assert [index for index, _ in matcher.regexes] == [0, 1, None]
+    assert matcher.find_occurrences("IN STOCK: go go, 3 left, NT$5") == {
+        (0, 0, 8),
+        (1, 10, 15),
+        (3, 17, 23),
+        (2, 25, 29),
+    }
+
+
+@pytest.mark.parametrize("pattern", ["(", "a{2,1}", r"(?P<x>a)(?P<x>b)"])
+def test_matcher_rejects_invalid_patterns(pattern):
+    with pytest.raises(ValueError, match="Invalid watch pattern"):
+        MultiPatternMatcher([pattern])
+
+
+def test_window_edges_are_not_the_end_of_the_text():
+    matcher = MultiPatternMatcher([r"\d+$", r"\bab\b", r"x(?=y)"])
+    assert matcher.find_occurrences("12 34 abc xy", 0, 12) == {(2, 10, 11)}
+    assert matcher.find_occurrences("12 34 abc xy", 0, 9) == set()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_update_occurrences_matches_a_full_scan(seed):
+    rng = random.Random(seed)
+    patterns = ["sold out", "in stock", r"\d+ left", r"\d$", r"(\w+) \1"]
+    matcher = MultiPatternMatcher(patterns + [r"\bin\b"], context_chars=20)
+    words = ["sold", "out", "in", "stock", "3", "left", "item", " "]
+    text_a = " ".join(rng.choice(words) for _ in range(200))
+    text_b = list(text_a)
+    for _ in range(5):
+        position = rng.randrange(len(text_b))
+        text_b[position : position + rng.randrange(10)] = rng.choice(words)
+    text_b = "".join(text_b)
+
+    matches = SequenceMatcherEngine().get_matching_blocks(text_a, text_b)
+    occurrences_b = matcher.update_occurrences(
+        matcher.find_occurrences(text_a), text_b, matches
+    )
+    assert occurrences_b == matcher.find_occurrences(text_b)
+
+
+def test_comparer_reports_patterns_that_appear_and_disappear(compare):
+    comparer = compare(
+        BasicComparer(matches_expression=["in stock", "sold out"]),
+        "item: sold out",
+        "item: in stock",
+    )
+    assert comparer.status_code == 1
+    assert comparer.patterns_appeared == ["in stock"]
+    assert comparer.patterns_disappeared == ["sold out"]
+
+
+def test_comparer_ignores_changes_without_pattern_changes(compare):
+    comparer = compare(
+        BasicComparer(matches_expression="in stock"),
+        "price 100, in stock",
+        "price 105, in stock",
+    )
+    assert comparer.status_code == 0
+    assert comparer.message == "UNCHANGED"
@@ -0,0 +1,83 @@
+from akame.utility.caching import MemoryCache, TaskCacheManager
+from akame.utility.core import MonitoredContent
+
+
+def test_get_checks_the_version():
+    memory_cache = MemoryCache()
+    mc = MonitoredContent(content="a")
+    memory_cache.put("task", 1, mc, 10)
+
+    assert memory_cache.get("task", 1) is mc
+    assert memory_cache.get("task", 0) is None
+    assert memory_cache.get("other", 1) is None
+    assert memory_cache.get_stats() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+        "tasks": 1,
+        "bytes": 10,
+    }
+
+
+def test_least_recently_used_tasks_are_evicted():
+    memory_cache = MemoryCache(max_bytes=25)
+    for key in "abc":
+        memory_cache.put(key, 0, MonitoredContent(content=key), 10)
+        memory_cache.get("a", 0)
+
+    assert memory_cache.get("b", 0) is None
+    assert memory_cache.get("a", 0).content == "a"
+    assert memory_cache.get("c", 0).content == "c"
+    assert memory_cache.get_stats()["evictions"] == 1
+    assert memory_cache.get_stats()["bytes"] == 20
+
+
+def test_newer_versions_replace_older_ones():
+    memory_cache = MemoryCache(max_bytes=25)
+    memory_cache.put("a", 0, MonitoredContent(content="old"), 10)
+    memory_cache.put("a", 1, MonitoredContent(content="new"), 20)
+
+    assert memory_cache.get("a", 0) is None
+    assert memory_cache.get("a", 1).content == "new"
+    assert memory_cache.get_stats()["bytes"] == 20
+
+
+def test_content_beyond_the_budget_is_not_kept():
+    memory_cache = MemoryCache(max_bytes=5)
+    memory_cache.put("a", 0, MonitoredContent(content="a"), 10)
+    assert memory_cache.get("a", 0) is None
+    assert memory_cache.get_stats()["bytes"] == 0
+
+
+def test_discard_and_clear():
+    memory_cache = MemoryCache()
+    for key in "ab":
+        memory_cache.put(key, 0, MonitoredContent(content=key), 10)
+    memory_cache.discard("a")
+    assert memory_cache.get("a", 0) is None
+    memory_cache.clear()
+    assert memory_cache.get_stats()["tasks"] == 0
+
+
+def test_task_cache_manager_serves_the_newest_version_from_memory(tmp_path):
+    memory_cache = MemoryCache()
+    cache_manager = TaskCacheManager(
+        "task",
+        path_cache_folder=tmp_path,
+        memory_cache=memory_cache,
+        blob_store=None,
+    )
+    mc = MonitoredContent(content="a")
+    cache_manager.cache_task_mc(mc)
+
+    assert cache_manager.get_newest_cache() is mc
+    # a restarted manager reads the newest version from disk
+    reopened = TaskCacheManager(
+        "task",
+        path_cache_folder=tmp_path,
+        reset_task_cache=False,
+        memory_cache=MemoryCache(),
+        blob_store=None,
+    )
+    assert reopened.get_newest_cache() is not mc
+    assert reopened.get_newest_cache().content == "a"
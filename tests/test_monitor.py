@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from akame import AsyncMonitor, Monitor
+from akame.notification.core import NotifierBase
+from akame.utility.core import MonitoredContent
+
+
+class FailingNotifier(NotifierBase):
+    def __init__(self):
+        super().__init__()
+        self.status_codes = []
+
+    def notify_condition_met(self):
+        self.status_codes.append(1)
+        raise ConnectionError("notifier is down")
+
+    def notify_condition_notmet(self):
+        self.status_codes.append(0)
+
+
+@pytest.fixture
+def get_monitor(make_extractor, make_cache_manager):
+    def get_monitor(monitor_class, contents):
+        return monitor_class(
+            "https://example.com",
+            task_name="task",
+            loop_seconds=0,
+            loop_max_rounds=1,
+            extractor=make_extractor(contents),
+            notifiers=[FailingNotifier()],
+            cache_manager=make_cache_manager(),
+        )
+
+    return get_monitor
+
+
+def test_round_is_cached_when_a_notifier_fails(get_monitor):
+    monitor = get_monitor(Monitor, ["a", "b", "b"])
+    monitor.run_round()
+    with pytest.raises(ConnectionError):
+        monitor.run_round()
+    monitor.run_round()
+
+    assert [mc.content for mc in monitor.cache_manager.versions] == [
+        "a",
+        "b",
+        "b",
+    ]
+    # the change was reported once, not again the next round
+    assert monitor.notifiers[0].status_codes == [0, 1, 0]
+
+
+def test_async_round_is_cached_when_a_notifier_fails(get_monitor):
+    monitor = get_monitor(AsyncMonitor, ["a"])
+    monitor.cache_manager.cache_task_mc(MonitoredContent(content="b"))
+    with pytest.raises(ConnectionError):
+        asyncio.run(monitor.main_async())
+
+    assert monitor.cache_manager.get_newest_cache().content == "a"
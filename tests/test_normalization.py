@@ -0,0 +1,72 @@
+from akame.comparison.normalization import (
+    CSRF_TOKEN_RULE,
+    TIMESTAMP_RULE,
+    Normalizer,
+)
+from akame.utility.core import MonitoredContent
+
+
+def test_rules_strip_volatile_regions():
+    normalizer = Normalizer(rules=[TIMESTAMP_RULE, CSRF_TOKEN_RULE])
+    content = (
+        '<input name="csrf_token" value="a1b2"> '
+        "updated 2026-10-18T07:39:56+08:00"
+    )
+    assert normalizer.normalize(content) == (
+        '<input name="csrf_token" value=""> updated <timestamp>'
+    )
+
+
+def test_attributes_are_stripped_by_name():
+    normalizer = Normalizer(strip_attributes=["nonce", "data-ad-id"])
+    content = (
+        '<script nonce="x1" src="a.js"></script>'
+        "<div data-ad-id=42 data-ad-idx='keep'>ad</div>"
+    )
+    assert normalizer.normalize(content) == (
+        '<script src="a.js"></script>'
+        "<div data-ad-idx='keep'>ad</div>"
+    )
+
+
+def test_whitespace_is_collapsed_unless_disabled():
+    assert Normalizer().normalize("  a \n\t b  ") == "a b"
+    assert Normalizer(collapse_whitespace=False).normalize(" a ") == " a "
+
+
+def test_content_other_than_strings_is_passed_through():
+    content = {"a": " 1 "}
+    assert Normalizer().normalize(content) is content
+
+
+def get_mc(content):
+    return MonitoredContent(content=content, task_name="task")
+
+
+def test_main_keeps_the_raw_fingerprint():
+    normalizer = Normalizer(rules=[TIMESTAMP_RULE])
+    mc = get_mc("at 2026-10-18 07:39")
+    normalized_mc = normalizer.main(mc)
+
+    assert normalized_mc.content == "at <timestamp>"
+    assert normalized_mc.raw_fingerprint == mc.get_fingerprint()
+    assert normalized_mc.task_name == "task"
+
+
+def test_main_counts_changes_normalized_away():
+    normalizer = Normalizer(rules=[TIMESTAMP_RULE])
+    fingerprints = {
+        normalizer.main(get_mc(content)).get_fingerprint()
+        for content in [
+            "at 2026-10-18 07:39",
+            "at 2026-10-18 07:39",
+            "at 2026-10-18 07:44",
+        ]
+    }
+
+    assert len(fingerprints) == 1
+    assert normalizer.get_stats() == {
+        "rounds": 3,
+        "raw_changes": 1,
+        "noops": 1,
+    }
@@ -0,0 +1,155 @@
+import json
+import random
+
+import pytest
+
+from akame.comparison import NumericThresholdComparer
+from akame.comparison.delta import MISSING
+from akame.comparison.numeric import (
+    align_numeric_fields,
+    apply_baselines,
+    find_crossed_indices,
+    get_kept_baselines,
+    get_numeric_fields,
+)
+from akame.utility.core import MonitoredContent
+from akame.utility.serialization import dump_mc, load_mc
+
+
+def set_backend(monkeypatch, backend):
+    np = pytest.importorskip("numpy") if backend == "numpy" else None
+    monkeypatch.setattr("akame.comparison.numeric.np", np)
+
+
+# every test runs with NumPy and with the pure-Python fallback
+@pytest.fixture(autouse=True, params=["numpy", "python"])
+def backend(request, monkeypatch):
+    set_backend(monkeypatch, request.param)
+    return request.param
+
+
+def test_get_numeric_fields_skips_bools_and_huge_ints():
+    fields = get_numeric_fields(
+        {"a": 1, "b": True, "c": [2.5, "x"], "d": 10 ** 400}
+    )
+    assert fields.key_paths == ("$.a", "$.c[0]")
+    assert list(fields.values) == [1.0, 2.5]
+
+
+def test_align_numeric_fields_reports_unmatched():
+    fields_0 = get_numeric_fields({"a": 1, "b": 2})
+    fields_1 = get_numeric_fields({"b": 3, "c": 4})
+    key_paths, values_0, values_1, unmatched = align_numeric_fields(
+        fields_0, fields_1
+    )
+    assert key_paths == ("$.b",)
+    assert list(values_0) == [2.0] and list(values_1) == [3.0]
+    assert sorted(unmatched) == ["$.a", "$.c"]
+
+
+def test_find_crossed_indices():
+    values_0 = get_numeric_fields([100, 100, -100, 0]).values
+    values_1 = get_numeric_fields([100.5, 102, -102, 0]).values
+    assert find_crossed_indices(values_0, values_1, rel_threshold=0.01) == [
+        1,
+        2,
+    ]
+    assert find_crossed_indices(values_0, values_1, abs_threshold=1) == [1, 2]
+    assert find_crossed_indices(values_0, values_1) == [0, 1, 2]
+
+
+def get_rates(rate):
+    return json.dumps({"rates": {"TWD": rate, "JPY": 150}})
+
+
+def test_slow_drift_crosses_from_last_reported_value():
+    comparer = NumericThresholdComparer(rel_threshold=0.01)
+    mc_0 = MonitoredContent(content=get_rates(100.0))
+    status_codes = []
+    for rate in (100.5, 101.0, 101.5, 102.0):
+        mc_1 = MonitoredContent(content=get_rates(rate))
+        comparer.main(mc_0=mc_0, mc_1=mc_1)
+        status_codes.append(comparer.status_code)
+        # cached between rounds along with the baselines
+        mc_0 = load_mc(dump_mc(mc_1))
+
+    assert status_codes == [0, 0, 1, 0]
+
+
+def test_crossed_fields_report_the_baseline():
+    comparer = NumericThresholdComparer(rel_threshold=0.01)
+    mc_0 = MonitoredContent(content=get_rates(100.0))
+    mc_1 = MonitoredContent(content=get_rates(100.6))
+    comparer.main(mc_0=mc_0, mc_1=mc_1)
+    mc_2 = MonitoredContent(content=get_rates(101.2))
+    comparer.main(mc_0=mc_1, mc_1=mc_2)
+
+    assert comparer.message == "CHANGES DETECTED IN 1 FIELD(S)"
+    assert comparer.crossed_fields == [("$.rates.TWD", 100.0, 101.2)]
+    assert mc_2.get_signatures()[comparer.baseline_kind] == {}
+
+
+def test_unchanged_rounds_keep_the_baselines():
+    comparer = NumericThresholdComparer(rel_threshold=0.01)
+    mc_0 = MonitoredContent(content=get_rates(100.0))
+    mc_1 = MonitoredContent(content=get_rates(100.6))
+    comparer.main(mc_0=mc_0, mc_1=mc_1)
+    mc_2 = MonitoredContent(content=get_rates(100.6))
+    comparer.main(mc_0=mc_1, mc_1=mc_2)
+
+    assert comparer.status_code == 0
+    assert mc_2.get_signatures()[comparer.baseline_kind] == {
+        "$.rates.TWD": 100.0
+    }
+
+
+def test_fields_that_disappear_cross():
+    comparer = NumericThresholdComparer(rel_threshold=0.5)
+    comparer.main(
+        mc_0=MonitoredContent(content='{"a": 1, "b": 2}'),
+        mc_1=MonitoredContent(content='{"a": 1}'),
+    )
+    assert comparer.crossed_fields == [("$.b", 2.0, MISSING)]
+
+
+def test_non_json_content_is_compared_as_text():
+    comparer = NumericThresholdComparer(rel_threshold=0.5)
+    comparer.main(
+        mc_0=MonitoredContent(content="price: 1"),
+        mc_1=MonitoredContent(content="price: 2"),
+    )
+    assert comparer.message == "CHANGES DETECTED"
+
+
+def get_crossed_fields(tree_0, tree_1, baselines):
+    key_paths, values_0, values_1, unmatched = align_numeric_fields(
+        get_numeric_fields(tree_0), get_numeric_fields(tree_1)
+    )
+    values_0 = apply_baselines(key_paths, values_0, baselines)
+    crossed = find_crossed_indices(
+        values_0, values_1, abs_threshold=5, rel_threshold=0.05
+    )
+    return (
+        [key_paths[i] for i in crossed],
+        sorted(unmatched),
+        get_kept_baselines(key_paths, values_0, values_1, crossed),
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_backends_give_the_same_results(monkeypatch, seed):
+    rng = random.Random(seed)
+    tree_0 = {f"k{i}": rng.uniform(-100, 100) for i in range(300)}
+    tree_1 = {
+        key: value + rng.choice([0, 0.5, 3, 8])
+        for key, value in tree_0.items()
+        if rng.random() < 0.95
+    }
+    baselines = {key: tree_0[key] - 1 for key in rng.sample(list(tree_1), 20)}
+
+    results = []
+    for backend in ["numpy", "python"]:
+        set_backend(monkeypatch, backend)
+        results.append(get_crossed_fields(tree_0, tree_1, baselines))
+    assert results[0] == results[1]
+    assert results[0][0] and results[0][1] and results[0][2]
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from akame.extraction.parser import (
+    convert_jsonp_to_object,
+    extract_json_keys,
+    extract_json_keys_from_chunks,
+    find_json_end,
+    strip_jsonp,
+)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        '{"a": [1, {"b": "}]"}], "c": "\\"{"}',
+        '["x", ["y"]]',
+        '"quoted \\" string"',
+        "-12.5e3",
+        "true",
+    ],
+)
+def test_find_json_end(value):
+    text = value + ", tail"
+    assert find_json_end(text, 0) == len(value)
+
+
+def test_find_json_end_reports_incomplete_values():
+    assert find_json_end('{"a": [1, 2', 0) is None
+    assert find_json_end('"open', 0) is None
+
+
+def test_strip_jsonp():
+    text = 'try{jsonp_cb([{"a": "(x)"}]);}catch(e){}'
+    assert strip_jsonp(text) == '[{"a": "(x)"}]'
+    assert strip_jsonp(text, callback="jsonp_cb") == '[{"a": "(x)"}]'
+    assert convert_jsonp_to_object("window.cb( {} );") == {}
+
+
+def test_strip_jsonp_rejects_bad_text():
+    with pytest.raises(ValueError):
+        strip_jsonp("(1)")
+    with pytest.raises(ValueError):
+        strip_jsonp('cb({"a": 1')
+
+
+def test_extract_json_keys_skips_other_values():
+    text = json.dumps({"big": ["x"] * 1000, "rate": 30.5, "base": "USD"})
+    assert extract_json_keys(text, ["rate", "missing"]) == {"rate": 30.5}
+
+
+def test_extract_json_keys_rejects_non_objects():
+    with pytest.raises(ValueError):
+        extract_json_keys("[1, 2]", ["a"])
+    with pytest.raises(ValueError):
+        extract_json_keys('{"a": 1', ["b"])
+
+
+def test_chunks_stop_once_all_keys_are_found():
+    text = json.dumps({"rate": 30.5, "items": list(range(1000))})
+    chunks_read = []
+
+    def get_chunks():
+        for start in range(0, len(text), 7):
+            chunks_read.append(start)
+            yield text[start : start + 7]
+
+    assert extract_json_keys_from_chunks(get_chunks(), ["rate"]) == {
+        "rate": 30.5
+    }
+    assert len(chunks_read) < 5
+
+
+def test_chunks_split_anywhere_give_the_same_keys():
+    text = json.dumps({"a": {"b": 'x}"y'}, "n": -1.5, "c": [1, [2]]})
+    expected = json.loads(text)
+    for size in range(1, 10):
+        chunks = [text[i : i + size] for i in range(0, len(text), size)]
+        assert (
+            extract_json_keys_from_chunks(chunks, ["a", "n", "c"])
+            == expected
+        )
@@ -0,0 +1,171 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from akame.extraction.core import ExtractionError
+from akame.extraction.sets.pchome_24h_cart import (
+    BatchExtractor,
+    BatchFetcher,
+    Extractor,
+    split_batch_response,
+)
+
+PREFIX = "try{jsonp_button("
+SUFFIX = ");}catch(e){if(window.console){console.log(e);}}"
+
+
+def get_item_text(item_id, qty=1):
+    return json.dumps({"Id": item_id, "Qty": qty}, separators=(",", ":"))
+
+
+def get_response_text(item_texts):
+    return PREFIX + "[" + ",".join(item_texts) + "]" + SUFFIX
+
+
+def get_product_ids(url):
+    return url.split("button&id=")[1].split("&")[0].split(",")
+
+
+@pytest.fixture
+def get_fetcher(make_session, make_rate_limiter):
+    def get_fetcher(handler, batch_size=2):
+        session = make_session(
+            lambda url: SimpleNamespace(text=handler(get_product_ids(url)))
+        )
+        fetcher = BatchFetcher(
+            batch_size=batch_size,
+            session_pool=SimpleNamespace(get_session=lambda url: session),
+            rate_limiter=make_rate_limiter(),
+        )
+        return fetcher, session
+
+    return get_fetcher
+
+
+def get_requested_ids(session):
+    return [get_product_ids(request["url"]) for request in session.requests]
+
+
+def respond(product_ids):
+    return get_response_text(
+        get_item_text(f"{product_id}-000") for product_id in product_ids
+    )
+
+
+def test_split_batch_response_groups_specs():
+    text = get_response_text(
+        [get_item_text("A-000"), get_item_text("A-001"), get_item_text("B")]
+    )
+    prefix, items, suffix = split_batch_response(text)
+    assert prefix == PREFIX
+    assert suffix == SUFFIX
+    assert items == {
+        "A": [get_item_text("A-000"), get_item_text("A-001")],
+        "B": [get_item_text("B")],
+    }
+
+
+def test_split_batch_response_rejects_malformed_text():
+    with pytest.raises(ValueError):
+        split_batch_response(PREFIX + '[{"Id": "A"}' + SUFFIX)
+
+
+def test_fetcher_batches_stale_products(get_fetcher):
+    fetcher, session = get_fetcher(respond, batch_size=2)
+    for product_id in "ABC":
+        fetcher.register_product(product_id)
+
+    assert fetcher.get_product("A") == respond(["A"])
+    assert fetcher.get_product("B") == respond(["B"])
+    assert fetcher.get_product("C") == respond(["C"])
+    assert get_requested_ids(session) == [["A", "B"], ["C"]]
+
+
+def test_fetcher_reports_missing_products_as_empty(get_fetcher):
+    fetcher, _ = get_fetcher(lambda product_ids: get_response_text([]))
+    assert fetcher.get_product("A") == get_response_text([])
+
+
+def test_failed_batch_fails_only_its_products(get_fetcher):
+    def handler(product_ids):
+        if "B" in product_ids:
+            return "<html>rate limited</html>"
+        return respond(product_ids)
+
+    fetcher, _ = get_fetcher(handler, batch_size=1)
+    fetcher.register_product("A")
+    fetcher.register_product("B")
+
+    with pytest.raises(ExtractionError):
+        fetcher.get_product("B")
+    assert fetcher.get_product("A") == respond(["A"])
+    assert fetcher.get_stats()["failed_batches"] == 1
+
+
+def test_fetcher_does_not_block_on_other_batches(get_fetcher):
+    release = threading.Event()
+
+    def handler(product_ids):
+        if "SLOW" in product_ids:
+            release.wait(5)
+        return respond(product_ids)
+
+    fetcher, _ = get_fetcher(handler, batch_size=1)
+    fetcher.register_product("SLOW")
+    fetcher.register_product("FAST")
+    slow = threading.Thread(target=fetcher.get_product, args=("SLOW",))
+    slow.start()
+    while "SLOW" not in fetcher.flights:
+        time.sleep(0.001)
+
+    # fetched while the slow batch is still in flight
+    assert fetcher.get_product("FAST") == respond(["FAST"])
+    release.set()
+    slow.join()
+
+
+def test_waiting_extractors_share_the_batch(get_fetcher):
+    release = threading.Event()
+
+    def handler(product_ids):
+        release.wait(5)
+        return respond(product_ids)
+
+    fetcher, session = get_fetcher(handler, batch_size=2)
+    fetcher.register_product("A")
+    fetcher.register_product("B")
+    results = {}
+    threads = [
+        threading.Thread(
+            target=lambda p=p: results.update({p: fetcher.get_product(p)})
+        )
+        for p in "AB"
+    ]
+    threads[0].start()
+    while "B" not in fetcher.flights:
+        time.sleep(0.001)
+    threads[1].start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert get_requested_ids(session) == [["A", "B"]]
+    assert results == {"A": respond(["A"]), "B": respond(["B"])}
+
+
+@pytest.mark.parametrize("structured", [False, True])
+def test_batch_extractor_matches_single_extractor(structured, get_fetcher):
+    fetcher, _ = get_fetcher(respond)
+    single_text = respond(["DYAJ9A-A900B51S8"])
+
+    batch_extractor = BatchExtractor(fetcher, structured=structured)
+    extractor = Extractor(structured=structured)
+    target_url = "https://24h.pchome.com.tw/prod/DYAJ9A-A900B51S8"
+    content = batch_extractor.main(target_url)
+
+    assert content == extractor.get_parsed_content(
+        SimpleNamespace(text=single_text)
+    )
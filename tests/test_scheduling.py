@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from akame.utility.scheduling import ScheduledTask, Scheduler
+
+
+def get_task(policy, seconds=10):
+    return ScheduledTask(
+        lambda: None, seconds, max_rounds=10, task_name="task", policy=policy
+    )
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        get_task("later")
+
+
+def test_deadlines_on_time_are_kept():
+    task = get_task("skip")
+    task.load_next_due(now=5)
+    assert task.due == 10
+    assert task.rounds_missed == 0
+
+
+@pytest.mark.parametrize(
+    "policy, due, rounds_missed",
+    [("skip", 40, 3), ("catch_up", 10, 0), ("coalesce", 30, 2)],
+)
+def test_missed_deadlines_follow_the_policy(policy, due, rounds_missed):
+    task = get_task(policy)
+    # the round due at 0 ran until 35, past the rounds due at 10, 20, 30
+    task.load_next_due(now=35)
+    assert task.due == due
+    assert task.rounds_missed == rounds_missed
+
+
+def test_failed_rounds_are_counted():
+    def fail():
+        raise ValueError("boom")
+
+    task = ScheduledTask(fail, 10, max_rounds=2, task_name="task")
+    task.run()
+    assert task.rounds_run == 1
+    assert task.rounds_failed == 1
+    assert not task.finished
+
+
+def test_scheduler_runs_tasks_to_their_max_rounds():
+    scheduler = Scheduler(max_workers=2)
+    calls = {"a": 0, "b": 0}
+
+    def get_function(name):
+        def function():
+            calls[name] += 1
+
+        return function
+
+    scheduler.add_task(get_function("a"), 0.01, 3, "a")
+    scheduler.add_task(get_function("b"), 0.01, 2, "b", delay_seconds=0.01)
+    scheduler.run()
+
+    assert calls == {"a": 3, "b": 2}
+    metrics = scheduler.get_lag_metrics()
+    assert metrics["rounds_run"] == 5
+    assert metrics["tasks_running"] == 0
+
+
+def test_task_never_overlaps_with_itself():
+    scheduler = Scheduler(max_workers=4)
+    lock = threading.Lock()
+    overlaps = []
+
+    def function():
+        if not lock.acquire(blocking=False):
+            overlaps.append(1)
+            return
+        time.sleep(0.02)
+        lock.release()
+
+    task = scheduler.add_task(function, 0.001, 4, "slow", policy="catch_up")
+    scheduler.run()
+
+    assert task.rounds_run == 4
+    assert overlaps == []
+
+
+def test_stop_ends_a_background_scheduler():
+    scheduler = Scheduler()
+    task = scheduler.add_task(lambda: None, 60, 10, "task")
+    scheduler.start()
+    while not task.rounds_run:
+        time.sleep(0.001)
+    scheduler.stop()
+
+    assert task.rounds_run == 1
+    assert not scheduler.thread.is_alive()
@@ -0,0 +1,125 @@
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from akame.extraction import SelectorExtractor
+from akame.extraction.selectors import (
+    CSSSelector,
+    JSONPathSelector,
+    XPathSelector,
+    compile_selector,
+    parse_jsonpath,
+)
+
+DOCUMENT = {
+    "rates": {"TWD": 30.5, "JPY": 150},
+    "items": [
+        {"name": "a", "price": 1, "tags": {"price": 9}},
+        {"name": "b", "price": 2},
+    ],
+    "odd key": True,
+}
+
+
+def test_parse_jsonpath():
+    assert parse_jsonpath("$.items[0]['odd key']..price.*") == [
+        ("key", "items"),
+        ("index", 0),
+        ("key", "odd key"),
+        ("descend", "price"),
+        ("wildcard", None),
+    ]
+
+
+@pytest.mark.parametrize("expression", ["rates", "$.", "$[0", "$!", "$[x]"])
+def test_parse_jsonpath_rejects_bad_expressions(expression):
+    with pytest.raises(ValueError):
+        parse_jsonpath(expression)
+
+
+@pytest.mark.parametrize(
+    "expression, selected",
+    [
+        ("$.rates.TWD", [30.5]),
+        ("$.items[-1].name", ["b"]),
+        ("$.items[5].name", []),
+        ("$.items[*].price", [1, 2]),
+        ("$..price", [1, 9, 2]),
+        ("$['odd key']", [True]),
+        ("$.rates.*", [30.5, 150]),
+        ("$.missing.key", []),
+    ],
+)
+def test_jsonpath_selects_values(expression, selected):
+    assert JSONPathSelector(expression).select(DOCUMENT) == selected
+
+
+HTML = (
+    "<html><body>"
+    '<div id="item"><h1>Kettle</h1>'
+    '<ul class="prices"><li><b class="price"> NT$ 120 </b></li>'
+    '<li><b class="price">NT$ <i>99</i></b></li></ul>'
+    '<a href="/cart">Add <em>to</em> cart</a></div>'
+    "</body></html>"
+)
+
+
+@pytest.mark.parametrize(
+    "expression, selected",
+    [
+        ('//b[@class="price"]', ["NT$ 120", "NT$ 99"]),
+        ("//div[@id='item']/h1", ["Kettle"]),
+        ("//a/@href", ["/cart"]),
+        ("//a", ["Add to cart"]),
+        ("count(//li)", [2.0]),
+        ('//span[@class="missing"]', []),
+    ],
+)
+def test_xpath_selects_fragments(expression, selected):
+    html = pytest.importorskip("lxml.html")
+    selector = XPathSelector(expression)
+    assert selector.select(html.fromstring(HTML)) == selected
+
+
+def test_xpath_rejects_bad_expressions():
+    etree = pytest.importorskip("lxml.etree")
+    with pytest.raises(etree.XPathSyntaxError):
+        XPathSelector("//b[")
+
+
+@pytest.mark.parametrize("selector_class", [XPathSelector, CSSSelector])
+def test_html_selectors_need_lxml(monkeypatch, selector_class):
+    # None in sys.modules makes the import fail as if lxml were missing
+    for module_name in ["lxml", "lxml.etree", "lxml.cssselect"]:
+        monkeypatch.setitem(sys.modules, module_name, None)
+    with pytest.raises(ImportError, match="lxml is needed"):
+        selector_class("//b")
+
+
+def test_compile_selector_derives_the_type():
+    assert isinstance(compile_selector("$.a"), JSONPathSelector)
+    with pytest.raises(ValueError):
+        compile_selector("$.a", selector_type="regex")
+
+
+def test_selector_extractor_keeps_only_selected_fragments():
+    extractor = SelectorExtractor(["$.rates.TWD", "$..name"])
+    response = SimpleNamespace(text=json.dumps(DOCUMENT))
+    assert extractor.get_parsed_content(response) == {
+        "$.rates.TWD": [30.5],
+        "$..name": ["a", "b"],
+    }
+
+
+def test_html_selectors_share_one_parse():
+    pytest.importorskip("lxml.cssselect")
+    extractor = SelectorExtractor(['//b[@class="price"]', "ul > li > b"])
+    response = SimpleNamespace(
+        text='<ul><li><b class="price"> NT$ 120 </b></li></ul>'
+    )
+    assert extractor.get_parsed_content(response) == {
+        '//b[@class="price"]': ["NT$ 120"],
+        "ul > li > b": ["NT$ 120"],
+    }
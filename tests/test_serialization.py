@@ -0,0 +1,133 @@
+import pickle
+from datetime import datetime
+
+import pytest
+
+from akame.utility.caching import TaskCacheManager, get_task_hash
+from akame.utility.core import MonitoredContent
+from akame.utility.serialization import (
+    check_is_json_compatible,
+    check_is_serialized,
+    decode_content,
+    dump_content,
+    dump_mc,
+    encode_content,
+    load_content,
+    load_mc,
+    migrate_legacy_cache,
+    read_mc_header,
+)
+
+
+def get_legacy_pickle(content):
+    # MonitoredContent as pickled before validators, fingerprints and
+    # signatures existed
+    mc = MonitoredContent.__new__(MonitoredContent)
+    mc.__dict__.update(
+        timestamp=datetime(2026, 10, 18, 7),
+        content=content,
+        task_name="task",
+        target_url="https://example.com",
+    )
+    return pickle.dumps(mc)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [None, "text", b"\x00bytes", {"a": [1, 2.5, None, True]}, [], 10 ** 30],
+)
+@pytest.mark.parametrize("compression", ["none", "zlib"])
+def test_content_round_trips(content, compression):
+    assert load_content(dump_content(content, compression)) == content
+
+
+def test_mc_round_trips_with_header():
+    mc = MonitoredContent(
+        content="x" * 5000, task_name="task", validators={"etag": '"1"'}
+    )
+    mc.get_signatures()["kind"] = {"a": 1}
+    data = dump_mc(mc)
+    assert check_is_serialized(data)
+
+    loaded = load_mc(data)
+    assert loaded.content == mc.content
+    assert loaded.timestamp == mc.timestamp
+    assert loaded.task_name == "task"
+    assert loaded.validators == {"etag": '"1"'}
+    assert loaded.get_fingerprint() == mc.get_fingerprint()
+    assert loaded.get_signatures() == {"kind": {"a": 1}}
+
+
+@pytest.mark.parametrize(
+    "content", [(1, 2), {1: "a"}, {"a": [(1, 2)]}, {"a"}, object()]
+)
+def test_content_that_changes_through_json_is_not_json(content):
+    assert not check_is_json_compatible(content)
+
+
+@pytest.mark.parametrize("content", [(1, 2), {1: "a"}])
+def test_pickle_is_opt_in(content):
+    with pytest.raises(TypeError):
+        encode_content(content)
+
+    content_type, data = encode_content(content, allow_pickle=True)
+    assert content_type == "pickle"
+    with pytest.raises(ValueError):
+        decode_content(content_type, data)
+    assert decode_content(content_type, data, allow_pickle=True) == content
+
+
+def test_legacy_pickles_are_refused_unless_allowed():
+    data = get_legacy_pickle("legacy")
+    with pytest.raises(ValueError):
+        load_mc(data)
+
+    mc = load_mc(data, allow_pickle=True)
+    assert mc.content == "legacy"
+    assert mc.validators == {}
+    assert mc.raw_fingerprint == mc.get_fingerprint()
+    assert mc.get_signatures() == {}
+
+
+def test_migrate_legacy_cache(tmp_path):
+    path = tmp_path / "0.akamecache"
+    path.write_bytes(get_legacy_pickle("legacy"))
+
+    assert migrate_legacy_cache(path)
+    assert read_mc_header(path)["validators"] == {}
+    mc = load_mc(path.read_bytes())
+    assert mc.content == "legacy"
+    assert mc.timestamp == datetime(2026, 10, 18, 7)
+    assert mc.target_url == "https://example.com"
+    assert not migrate_legacy_cache(path)
+
+
+def write_legacy_task_cache(tmp_path, task_name):
+    path_task = tmp_path / get_task_hash(task_name)
+    path_task.mkdir()
+    for slot, content in enumerate(["old", "new"]):
+        (path_task / f"{slot}.akamecache").write_bytes(
+            get_legacy_pickle(content)
+        )
+    return path_task
+
+
+@pytest.mark.parametrize("allow_pickle", [False, True])
+def test_task_cache_manager_loads_legacy_caches(tmp_path, allow_pickle):
+    path_task = write_legacy_task_cache(tmp_path, "task")
+    cache_manager = TaskCacheManager(
+        "task",
+        path_cache_folder=tmp_path,
+        reset_task_cache=False,
+        memory_cache=None,
+        blob_store=None,
+        allow_pickle=allow_pickle,
+    )
+
+    if allow_pickle:
+        assert cache_manager.get_newest_cache().content == "new"
+        assert cache_manager.get_cache(age=1).content == "old"
+        assert read_mc_header(path_task / "1.akamecache") is not None
+    else:
+        assert cache_manager.get_newest_cache().content is None
+        assert read_mc_header(path_task / "1.akamecache") is None
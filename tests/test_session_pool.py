@@ -0,0 +1,100 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+import pytest
+
+from akame.extraction.coalescing import SingleFlight
+from akame.extraction.core import StaticExtractor
+from akame.extraction.session import SessionPool, get_url_host
+from akame.extraction.throttling import HostRateLimiter
+
+
+def test_get_url_host():
+    assert get_url_host("https://Inline.app/booking?x=1") == (
+        "https://inline.app"
+    )
+    assert get_url_host("http://example.com:8080/a") == (
+        "http://example.com:8080"
+    )
+
+
+def test_sessions_are_shared_per_host():
+    pool = SessionPool()
+    session = pool.get_session("https://example.com/a")
+    assert pool.get_session("https://example.com/b") is session
+    assert pool.get_session("http://example.com/a") is not session
+    assert pool.get_stats() == {
+        "hits": 1,
+        "misses": 2,
+        "evictions": 0,
+        "sessions": 2,
+    }
+    pool.close()
+    assert pool.get_stats()["sessions"] == 0
+
+
+def test_sessions_bound_their_connection_pool():
+    pool = SessionPool(max_connections_per_host=3, block_when_full=True)
+    adapter = pool.get_session("https://example.com").get_adapter(
+        "https://example.com"
+    )
+    assert adapter._pool_maxsize == 3
+    assert adapter._pool_block
+
+
+def test_idle_sessions_are_closed(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(
+        "akame.extraction.session.time.monotonic", lambda: now[0]
+    )
+    pool = SessionPool(idle_seconds=60)
+    idle = pool.get_session("https://idle.example.com")
+    pool.get_session("https://busy.example.com")
+
+    now[0] += 45
+    pool.get_session("https://busy.example.com")
+    now[0] += 30
+    pool.get_session("https://busy.example.com")
+
+    assert pool.get_stats()["evictions"] == 1
+    assert pool.get_session("https://idle.example.com") is not idle
+
+
+class CookieHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = (self.headers.get("Cookie") or "no cookie").encode("utf-8")
+        self.send_response(200)
+        if self.path == "/set":
+            self.send_header("Set-Cookie", "session=1; Path=/")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = HTTPServer(("127.0.0.1", 0), CookieHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_cookies_are_not_shared_between_extractors(server_url):
+    pool = SessionPool()
+    extractors = [
+        StaticExtractor(
+            session_pool=pool,
+            rate_limiter=HostRateLimiter(),
+            single_flight=SingleFlight(freshness_seconds=0),
+        )
+        for _ in range(2)
+    ]
+    assert extractors[0].main(f"{server_url}/set") == "no cookie"
+    assert extractors[1].main(f"{server_url}/echo") == "no cookie"
+    assert extractors[0].main(f"{server_url}/echo") == "no cookie"
+    assert pool.get_stats()["hits"] == 2
+    pool.close()
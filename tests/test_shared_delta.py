@@ -0,0 +1,28 @@
+from akame.comparison import BasicComparer
+from akame.notification import BasicNotifier
+
+
+def test_delta_is_computed_once_per_round(compare):
+    comparer = compare(BasicComparer(), "price: 100", "price: 105")
+    delta = comparer.get_delta()
+    assert comparer.get_delta() is delta
+    assert comparer.n_deltas_computed == 1
+
+    compare(comparer, "price: 105", "price: 110")
+    assert comparer.n_deltas_computed == 0
+    assert comparer.get_delta() is not delta
+
+
+def test_notifiers_share_the_delta(compare):
+    comparer = compare(BasicComparer(), "price: 100", "price: 105")
+    for notifier in [BasicNotifier() for _ in range(3)]:
+        notifier.main(comparer)
+    assert comparer.n_deltas_computed == 1
+
+
+def test_unchanged_rounds_compute_no_delta(compare):
+    comparer = compare(BasicComparer(), "same", "same")
+    for notifier in [BasicNotifier() for _ in range(3)]:
+        notifier.main(comparer)
+    assert comparer.status_code == 0
+    assert comparer.n_deltas_computed == 0
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from akame.comparison import SimilarityComparer
+from akame.comparison.similarity import (
+    get_minhash,
+    get_minhash_similarity,
+    get_shingle_hashes,
+    get_simhash,
+    get_simhash_similarity,
+)
+from akame.utility.caching import CachedMonitoredContent
+from akame.utility.core import MonitoredContent
+from akame.utility.serialization import get_mc_header
+
+WORDS = [f"word{i}" for i in range(400)]
+TEXT = " ".join(WORDS)
+TEXT_EDITED = " ".join(WORDS[:-1] + ["edited"])
+
+
+def test_shingle_hashes_are_stable_and_case_insensitive():
+    assert get_shingle_hashes("A b c d") == get_shingle_hashes("a B c d")
+    assert len(get_shingle_hashes("a b c d")) == 2
+    assert len(get_shingle_hashes("a b")) == 1
+    assert get_shingle_hashes("") == set()
+
+
+def test_simhash_similarity_tracks_the_size_of_the_change():
+    simhash = get_simhash(get_shingle_hashes(TEXT))
+    assert get_simhash_similarity(simhash, simhash) == 1
+    similarity_edited = get_simhash_similarity(
+        simhash, get_simhash(get_shingle_hashes(TEXT_EDITED))
+    )
+    similarity_other = get_simhash_similarity(
+        simhash, get_simhash(get_shingle_hashes(TEXT[::-1]))
+    )
+    assert similarity_edited > 0.9 > similarity_other
+
+
+def test_minhash_estimates_jaccard_similarity():
+    rng = random.Random(0)
+    hashes = [rng.getrandbits(64) for _ in range(1500)]
+    hashes_a, hashes_b = set(hashes[:1000]), set(hashes[500:])
+    similarity = get_minhash_similarity(
+        get_minhash(hashes_a, 128), get_minhash(hashes_b, 128)
+    )
+    assert similarity == pytest.approx(1 / 3, abs=0.15)
+    assert get_minhash_similarity([], []) == 1
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        SimilarityComparer(method="cosine")
+
+
+@pytest.mark.parametrize("method", ["simhash", "minhash"])
+def test_minor_changes_are_not_reported(method):
+    comparer = SimilarityComparer(method=method, min_similarity=0.9)
+    comparer.main(
+        mc_0=MonitoredContent(content=TEXT),
+        mc_1=MonitoredContent(content=TEXT_EDITED),
+    )
+    assert comparer.status_code == 0
+    assert comparer.message.startswith("MINOR CHANGES")
+
+    comparer.main(
+        mc_0=MonitoredContent(content=TEXT),
+        mc_1=MonitoredContent(content="something else entirely"),
+    )
+    assert comparer.status_code == 1
+
+
+def test_cached_signatures_spare_loading_the_content():
+    comparer = SimilarityComparer()
+    mc_0 = MonitoredContent(content=TEXT)
+    comparer.main(mc_0=MonitoredContent(), mc_1=mc_0)
+    assert comparer.get_signature_kind() in mc_0.get_signatures()
+
+    def load_content():
+        raise AssertionError("the archived content was loaded")
+
+    cached_mc_0 = CachedMonitoredContent(get_mc_header(mc_0), load_content)
+    comparer.main(mc_0=cached_mc_0, mc_1=MonitoredContent(content=TEXT_EDITED))
+    assert comparer.status_code == 0
@@ -0,0 +1,121 @@
+import sqlite3
+import threading
+from concurrent.futures import Future
+from datetime import timedelta
+
+import pytest
+
+from akame.utility.caching import (
+    CachedMonitoredContent,
+    SQLiteCacheManager,
+    SQLiteCacheStore,
+)
+from akame.utility.core import MonitoredContent
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteCacheStore(tmp_path / "cache.sqlite3")
+    yield store
+    store.close()
+
+
+def get_cache_manager(store, task_name="task", **kwargs):
+    return SQLiteCacheManager(
+        task_name, store=store, memory_cache=None, **kwargs
+    )
+
+
+def test_versions_beyond_n_versions_are_dropped(store):
+    cache_manager = get_cache_manager(store, n_versions=2)
+    for content in "abc":
+        cache_manager.cache_task_mc(MonitoredContent(content=content))
+
+    assert cache_manager.get_cache(age=0).content == "c"
+    assert cache_manager.get_cache(age=1).content == "b"
+    assert cache_manager.get_cache(age=2).content is None
+    with pytest.raises(KeyError):
+        cache_manager.read_content(0)
+
+
+def test_cached_versions_load_their_content_lazily(store):
+    cache_manager = get_cache_manager(store)
+    mc = MonitoredContent(content={"a": [1]}, validators={"etag": '"1"'})
+    cache_manager.cache_task_mc(mc)
+
+    cached_mc = cache_manager.get_newest_cache()
+    assert isinstance(cached_mc, CachedMonitoredContent)
+    assert cached_mc.validators == {"etag": '"1"'}
+    assert not cached_mc.is_loaded
+    assert cached_mc.content == {"a": [1]}
+
+
+def test_tasks_are_kept_apart_and_survive_a_restart(store):
+    task_a = get_cache_manager(store, "a")
+    task_b = get_cache_manager(store, "b")
+    task_a.cache_task_mc(MonitoredContent(content="a"))
+    task_b.cache_task_mc(MonitoredContent(content="b"))
+
+    reopened = get_cache_manager(store, "a", reset_task_cache=False)
+    assert reopened.head == 1
+    assert reopened.get_newest_cache().content == "a"
+    assert get_cache_manager(store, "b").get_newest_cache().content is None
+
+
+def test_get_cache_at_looks_back_in_time(store):
+    cache_manager = get_cache_manager(store)
+    mcs = [MonitoredContent(content=content) for content in "abc"]
+    for i, mc in enumerate(mcs):
+        mc.timestamp = mcs[0].timestamp + timedelta(minutes=i)
+        cache_manager.cache_task_mc(mc)
+
+    timestamp = mcs[1].timestamp + timedelta(seconds=30)
+    assert cache_manager.get_cache_at(timestamp).content == "b"
+    timestamp = mcs[0].timestamp - timedelta(seconds=1)
+    assert cache_manager.get_cache_at(timestamp).content is None
+
+
+def test_concurrent_writes_share_transactions(store):
+    cache_managers = [
+        get_cache_manager(store, f"task {i}") for i in range(8)
+    ]
+    barrier = threading.Barrier(len(cache_managers))
+
+    def cache(cache_manager):
+        barrier.wait()
+        for i in range(10):
+            cache_manager.cache_task_mc(MonitoredContent(content=str(i)))
+
+    threads = [
+        threading.Thread(target=cache, args=(cache_manager,))
+        for cache_manager in cache_managers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for cache_manager in cache_managers:
+        assert cache_manager.get_newest_cache().content == "9"
+    stats = store.get_stats()
+    assert stats["transactions"] <= stats["writes"]
+    assert stats["writes"] == 8 + 80
+
+
+def test_a_failing_write_fails_alone(store):
+    def get_write(task_hash, table="versions"):
+        sql = f"INSERT INTO {table} VALUES (?, 0, '', '{{}}', x'')"
+        return [(sql, (task_hash,))], Future()
+
+    writes = [get_write("a"), get_write("b", "missing"), get_write("c")]
+    # queued before the writer starts, so they are committed as one batch
+    for write in writes:
+        store.queue.put(write)
+    store.start()
+
+    assert writes[0][1].result() is None
+    with pytest.raises(sqlite3.Error):
+        writes[1][1].result()
+    assert writes[2][1].result() is None
+    rows = store.query("SELECT task_hash FROM versions ORDER BY 1", ())
+    assert rows == [("a",), ("c",)]
@@ -0,0 +1,68 @@
+from hashlib import sha1
+
+import pytest
+
+TARGET_URL = "https://example.com/page"
+
+
+@pytest.fixture
+def get_extractor(make_basic_extractor, make_rate_limiter):
+    def get_extractor(session, cached_digest=None, retries=0):
+        extractor = make_basic_extractor(
+            session, make_rate_limiter(retries), stream_digest=True
+        )
+        extractor.load_cached_validators(
+            {"digest": cached_digest} if cached_digest else {}
+        )
+        return extractor
+
+    return get_extractor
+
+
+def get_streams(session):
+    return [request["stream"] for request in session.requests]
+
+
+def test_first_round_reads_the_body_once(
+    make_session, make_response, get_extractor
+):
+    session = make_session([make_response(b"hello")])
+    extractor = get_extractor(session)
+    assert extractor.main(TARGET_URL) == "hello"
+    assert get_streams(session) == [False]
+    assert extractor.validators["digest"] == sha1(b"hello").hexdigest()
+
+
+def test_unchanged_body_is_hashed_without_keeping_it(
+    make_session, make_response, get_extractor
+):
+    response = make_response(b"hello" * 1000)
+    session = make_session([response])
+    extractor = get_extractor(session, sha1(b"hello" * 1000).hexdigest())
+    assert extractor.main(TARGET_URL) is None
+    assert extractor.not_modified
+    assert get_streams(session) == [True]
+    # the body was never loaded into the response
+    assert response._content is False
+
+
+def test_changed_body_is_requested_in_full(
+    make_session, make_response, get_extractor
+):
+    session = make_session(
+        [make_response(b"new body"), make_response(b"new body")]
+    )
+    extractor = get_extractor(session, sha1(b"old body").hexdigest())
+    assert extractor.main(TARGET_URL) == "new body"
+    assert get_streams(session) == [True, False]
+    assert extractor.validators["digest"] == sha1(b"new body").hexdigest()
+
+
+def test_throttled_responses_are_closed_before_retrying(
+    make_session, make_response, get_extractor
+):
+    busy = make_response(b"busy")
+    session = make_session([busy, make_response(b"hello")])
+    extractor = get_extractor(session, sha1(b"hello").hexdigest(), retries=1)
+    assert extractor.main(TARGET_URL) is None
+    assert busy.raw.closed
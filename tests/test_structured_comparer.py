@@ -0,0 +1,65 @@
+from akame.comparison import StructuredComparer
+from akame.comparison.delta import MISSING, JSONDelta, get_key_path
+
+
+def test_get_key_path():
+    assert get_key_path(()) == "$"
+    assert get_key_path(("rates", "TWD")) == "$.rates.TWD"
+    assert get_key_path(("items", 0, "x y")) == "$.items[0]['x y']"
+
+
+def test_json_delta_reports_changed_key_paths():
+    delta = JSONDelta(
+        {"rates": {"TWD": 30.5, "JPY": 150}, "base": "USD"},
+        {"rates": {"TWD": 30.7, "JPY": 150}, "date": "today"},
+    )
+    assert sorted(delta.changes, key=str) == sorted(
+        [
+            ("$.rates.TWD", 30.5, 30.7),
+            ("$.base", "USD", MISSING),
+            ("$.date", MISSING, "today"),
+        ],
+        key=str,
+    )
+
+
+def test_json_delta_survives_hash_collisions():
+    assert hash(-1) == hash(-2)
+    assert JSONDelta({"x": -1}, {"x": -2}).changes == [("$.x", -1, -2)]
+    assert JSONDelta([-1, 5], [-2, 5]).changes == [("$[0]", -1, -2)]
+
+
+def test_json_delta_aligns_list_insertions():
+    delta = JSONDelta([1, 2, 3], [0, 1, 2, 3])
+    assert delta.changes == [("$[0]", MISSING, 0)]
+
+
+def test_json_delta_skips_equal_trees():
+    tree = {"a": [1, {"b": [2, 3]}], "c": None}
+    assert JSONDelta(tree, {"a": [1, {"b": [2, 3]}], "c": None}).changes == []
+
+
+def test_structured_comparer_detects_colliding_values(compare):
+    comparer = compare(StructuredComparer(), '{"rate": -1}', '{"rate": -2}')
+    assert comparer.status_code == 1
+    assert comparer.message == "CHANGES DETECTED AT 1 KEY PATH(S)"
+
+
+def test_structured_comparer_parses_jsonp(compare):
+    comparer = compare(
+        StructuredComparer(), 'cb({"a": 1, "b": 2});', 'cb({"a": 1, "b": 2});'
+    )
+    assert comparer.status_code == 0
+
+
+def test_structured_comparer_ignores_formatting(compare):
+    comparer = compare(StructuredComparer(), '{"a": 1}', '{ "a" : 1 }')
+    assert comparer.status_code == 0
+    assert comparer.get_delta().changes == []
+
+
+def test_structured_comparer_falls_back_to_text(compare):
+    comparer = compare(StructuredComparer(), "<p>a</p>", "<p>b</p>")
+    assert comparer.status_code == 1
+    assert comparer.message == "CHANGES DETECTED"
+    assert comparer.get_delta().return_all_delta_parts()[2] != []
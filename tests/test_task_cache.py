@@ -0,0 +1,84 @@
+from akame.utility.caching import (
+    CachedMonitoredContent,
+    TaskCacheManager,
+    cache_mc,
+    get_task_hash,
+)
+from akame.utility.core import MonitoredContent
+
+
+def get_cache_manager(tmp_path, **kwargs):
+    kwargs = {"memory_cache": None, "blob_store": None, **kwargs}
+    return TaskCacheManager("task", path_cache_folder=tmp_path, **kwargs)
+
+
+def test_caches_stay_under_the_given_folder(tmp_path):
+    cache_manager = get_cache_manager(tmp_path)
+    cache_manager.cache_task_mc(MonitoredContent(content="a"))
+    assert cache_manager.path_cache_folder_th == (
+        tmp_path / get_task_hash("task")
+    )
+    assert (cache_manager.path_cache_folder_th / "0.akamecache").exists()
+
+
+def test_ring_buffer_keeps_n_versions(tmp_path):
+    cache_manager = get_cache_manager(tmp_path, n_versions=3)
+    for content in "abcde":
+        cache_manager.cache_task_mc(MonitoredContent(content=content))
+
+    versions = cache_manager.manifest["versions"]
+    assert [entry["version"] for entry in versions] == [2, 3, 4]
+    assert sorted(entry["slot"] for entry in versions) == [0, 1, 2]
+    path_task = cache_manager.path_cache_folder_th
+    assert len(list(path_task.glob("*.akamecache"))) == 3
+    assert [
+        cache_manager.get_cache(age).content for age in range(3)
+    ] == ["e", "d", "c"]
+    assert cache_manager.get_cache(age=3).content is None
+
+
+def test_cached_versions_load_their_content_lazily(tmp_path):
+    cache_manager = get_cache_manager(tmp_path)
+    mc = MonitoredContent(content="a", validators={"etag": '"1"'})
+    cache_manager.cache_task_mc(mc)
+
+    cached_mc = cache_manager.get_newest_cache()
+    assert isinstance(cached_mc, CachedMonitoredContent)
+    assert cached_mc.validators == {"etag": '"1"'}
+    assert cached_mc.get_fingerprint() == mc.get_fingerprint()
+    assert not cached_mc.is_loaded
+    assert cached_mc.content == "a"
+
+
+def test_manifest_survives_a_restart(tmp_path):
+    cache_manager = get_cache_manager(tmp_path, n_versions=2)
+    for content in "abc":
+        cache_manager.cache_task_mc(MonitoredContent(content=content))
+
+    reopened = get_cache_manager(tmp_path, reset_task_cache=False)
+    assert reopened.manifest == cache_manager.manifest
+    reopened.cache_task_mc(MonitoredContent(content="d"))
+    assert reopened.get_cache(age=1).content == "c"
+
+
+def test_manifest_is_built_from_renamed_caches(tmp_path):
+    path_task = tmp_path / get_task_hash("task")
+    path_task.mkdir()
+    for slot, content in enumerate(["old", "new"]):
+        cache_mc(
+            MonitoredContent(content=content),
+            path_task / f"{slot}.akamecache",
+        )
+
+    cache_manager = get_cache_manager(tmp_path, reset_task_cache=False)
+    assert cache_manager.get_newest_cache().content == "new"
+    assert cache_manager.get_cache(age=1).content == "old"
+
+
+def test_reset_removes_the_task_cache(tmp_path):
+    cache_manager = get_cache_manager(tmp_path)
+    cache_manager.cache_task_mc(MonitoredContent(content="a"))
+
+    reset = get_cache_manager(tmp_path)
+    assert reset.manifest["versions"] == []
+    assert reset.get_newest_cache().content is None
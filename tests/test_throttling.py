@@ -0,0 +1,93 @@
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from akame.extraction.throttling import (
+    HostRateLimiter,
+    TokenBucket,
+    get_url_hostname,
+    parse_retry_after,
+)
+
+
+def get_response(status_code, retry_after=None):
+    response = requests.Response()
+    response.status_code = status_code
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+def test_get_url_hostname():
+    assert get_url_hostname("https://24H.pchome.com.tw/a?b=1") == (
+        "24h.pchome.com.tw"
+    )
+    assert get_url_hostname("not a url") == ""
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=60)
+    assert 50 < parse_retry_after(format_datetime(retry_at)) <= 60
+    past = datetime.now(timezone.utc) - timedelta(seconds=60)
+    assert parse_retry_after(format_datetime(past)) == 0
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    bucket = TokenBucket(rate=2, burst=3)
+    now = bucket.updated
+    assert [bucket.reserve(now) for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve(now) == pytest.approx(0.5)
+    assert bucket.reserve(now) == pytest.approx(1)
+    # refilled after an idle period, up to the burst size
+    assert bucket.reserve(now + 100) == 0
+    assert bucket.tokens == 2
+
+
+def test_token_bucket_holds_until_blocked_time():
+    bucket = TokenBucket(rate=1, burst=5)
+    now = bucket.updated
+    bucket.block_until(now + 30)
+    assert bucket.reserve(now) == pytest.approx(30)
+    assert bucket.reserve(now) == pytest.approx(31)
+
+
+def test_hosts_are_limited_separately(monkeypatch):
+    limiter = HostRateLimiter(rate=1, burst=1)
+    limiter.configure_host("fast.example.com", rate=100, burst=100)
+    slept = []
+    monkeypatch.setattr(
+        "akame.extraction.throttling.time.sleep", slept.append
+    )
+
+    assert limiter.wait("https://slow.example.com/a") == 0
+    assert limiter.wait("https://SLOW.example.com/b") > 0
+    assert limiter.wait("https://fast.example.com/a") == 0
+    assert limiter.wait("https://fast.example.com/b") == 0
+    assert len(slept) == 1
+
+
+@pytest.mark.parametrize(
+    "status_code, retry_after, throttled",
+    [
+        (200, None, False),
+        (503, None, False),
+        (503, "10", True),
+        (429, None, True),
+        (429, "10", True),
+    ],
+)
+def test_handle_response_backs_off(status_code, retry_after, throttled):
+    limiter = HostRateLimiter(backoff_seconds=30)
+    url = "https://example.com"
+    response = get_response(status_code, retry_after)
+    assert limiter.handle_response(url, response) is throttled
+
+    seconds = limiter.get_bucket("example.com").reserve(time.monotonic())
+    assert (seconds > 5) is throttled
@@ -0,0 +1,106 @@
+import threading
+
+from akame.utility.caching import (
+    CacheManagerBase,
+    TaskCacheManager,
+    WriteBehindCacheManager,
+    WriteBehindQueue,
+)
+from akame.utility.core import MonitoredContent
+
+
+class SlowCacheManager(CacheManagerBase):
+    def __init__(self, task_name="task"):
+        super().__init__(task_name)
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.written = []
+
+    def cache_task_mc(self, mc):
+        self.started.set()
+        self.release.wait(5)
+        if mc.content == "fail":
+            raise OSError("disk full")
+        self.written.append(mc.content)
+
+    def get_newest_cache(self):
+        if not self.written:
+            return MonitoredContent()
+        return MonitoredContent(content=self.written[-1])
+
+
+def test_pending_versions_are_served_from_memory():
+    slow = SlowCacheManager()
+    cache_manager = WriteBehindCacheManager(slow, queue=WriteBehindQueue())
+    mc = MonitoredContent(content="a")
+    cache_manager.cache_task_mc(mc)
+
+    assert cache_manager.get_newest_cache() is mc
+    slow.release.set()
+    assert cache_manager.flush(timeout=5)
+    assert slow.written == ["a"]
+    assert cache_manager.get_newest_cache().content == "a"
+
+
+def test_superseded_versions_are_coalesced():
+    queue = WriteBehindQueue()
+    slow = SlowCacheManager()
+    cache_manager = WriteBehindCacheManager(slow, queue=queue)
+    cache_manager.cache_task_mc(MonitoredContent(content="a"))
+    slow.started.wait(5)
+    for content in "bcd":
+        cache_manager.cache_task_mc(MonitoredContent(content=content))
+
+    slow.release.set()
+    assert queue.flush(timeout=5)
+    assert slow.written == ["a", "d"]
+    assert queue.get_stats() == {
+        "submitted": 4,
+        "coalesced": 2,
+        "written": 2,
+        "failed": 0,
+        "pending": 0,
+    }
+
+
+def test_failed_writes_are_counted_and_the_queue_goes_on():
+    queue = WriteBehindQueue()
+    slow = SlowCacheManager()
+    slow.release.set()
+    cache_manager = WriteBehindCacheManager(slow, queue=queue)
+    cache_manager.cache_task_mc(MonitoredContent(content="fail"))
+    assert queue.flush(timeout=5)
+    cache_manager.cache_task_mc(MonitoredContent(content="b"))
+    assert queue.flush(timeout=5)
+
+    assert slow.written == ["b"]
+    assert queue.get_stats()["failed"] == 1
+
+
+def test_flush_times_out_while_a_write_is_stuck():
+    queue = WriteBehindQueue()
+    slow = SlowCacheManager()
+    WriteBehindCacheManager(slow, queue=queue).cache_task_mc(
+        MonitoredContent(content="a")
+    )
+    assert not queue.flush(timeout=0.05)
+    slow.release.set()
+    assert queue.flush(timeout=5)
+
+
+def test_older_versions_are_read_after_a_flush(tmp_path):
+    cache_manager = WriteBehindCacheManager(
+        TaskCacheManager(
+            "task",
+            path_cache_folder=tmp_path,
+            memory_cache=None,
+            blob_store=None,
+        ),
+        queue=WriteBehindQueue(),
+    )
+    cache_manager.cache_task_mc(MonitoredContent(content="a"))
+    cache_manager.flush()
+    cache_manager.cache_task_mc(MonitoredContent(content="b"))
+
+    assert cache_manager.get_cache(age=1).content == "a"
+    assert cache_manager.get_newest_cache().content == "b"